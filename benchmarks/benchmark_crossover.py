@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark dos operadores de crossover (OX, ERX, EAX, GPX)
+
+Mede quantas avaliações (filhos gerados) cada operador precisa para levar
+o melhor indivíduo a até --gap% de uma rota de referência (busca profunda
+por --ref-seg segundos). Usa um AG só de distância, com a mesma seleção,
+elitismo e mutações do AG principal, para isolar o efeito do crossover.
+
+Uso:
+    python benchmarks/benchmark_crossover.py --n 200 --pop 50
+    python benchmarks/benchmark_crossover.py --csv data/coordenadas.csv
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from config import Config
+from data_loader import generate_distance_matrix, load_ceps_stream
+from genetic_algorithm import criar_cromossomo, selecao_torneio, cruzamento, mutacao_multipla
+from local_search import preparar_vizinhos, two_opt_vizinhanca, busca_profunda, distancia_rota
+
+
+def instancia(args):
+    """Coordenadas aleatórias em Curitiba ou lidas de um CSV"""
+    if args.csv:
+        _, coords, idx_base, _, _ = load_ceps_stream(args.csv)
+        return coords.tolist(), idx_base or 0
+
+    rnd = random.Random(args.seed)
+    coords = [(-25.45 + rnd.uniform(-0.1, 0.1), -49.27 + rnd.uniform(-0.1, 0.1))
+              for _ in range(args.n)]
+    return coords, 0
+
+
+def rodar(tipo, dist_matrix, vizinhos, idx_base, alvo, args):
+    """AG de distância até atingir o alvo ou o limite de avaliações"""
+    random.seed(args.seed)
+    n = len(dist_matrix)
+
+    pop = [criar_cromossomo(n, idx_base) for _ in range(args.pop)]
+    if args.ls:
+        for ind in pop:
+            ind["rota"] = two_opt_vizinhanca(ind["rota"], dist_matrix, vizinhos)
+    fitness = [distancia_rota(ind["rota"], dist_matrix) for ind in pop]
+    avaliacoes = len(pop)
+    inicio = time.perf_counter()
+
+    while min(fitness) > alvo and avaliacoes < args.max_aval:
+        ordem = sorted(range(len(pop)), key=lambda i: fitness[i])
+        nova_pop = [pop[i] for i in ordem[:Config.ELITISM_COUNT]]
+        nova_fit = [fitness[i] for i in ordem[:Config.ELITISM_COUNT]]
+
+        while len(nova_pop) < args.pop:
+            p1 = selecao_torneio(pop, fitness, Config.TOURNAMENT_SIZE)
+            p2 = selecao_torneio(pop, fitness, Config.TOURNAMENT_SIZE)
+            for filho in cruzamento(p1, p2, idx_base, tipo, dist_matrix, vizinhos):
+                mutacao_multipla(filho, Config.MUTATION_RATE_SWAP, dist_matrix, vizinhos)
+                nova_pop.append(filho)
+                nova_fit.append(distancia_rota(filho["rota"], dist_matrix))
+                avaliacoes += 1
+
+        pop, fitness = nova_pop[:args.pop], nova_fit[:args.pop]
+
+    return avaliacoes, min(fitness), time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=200, help="Número de pontos aleatórios")
+    parser.add_argument("--csv", default=None, help="CSV de CEPs (em vez de pontos aleatórios)")
+    parser.add_argument("--pop", type=int, default=50, help="Tamanho da população")
+    parser.add_argument("--gap", type=float, default=5.0, help="Alvo: %% acima da referência")
+    parser.add_argument("--ref-seg", type=float, default=5.0, help="Tempo da busca de referência")
+    parser.add_argument("--max-aval", type=int, default=200_000, help="Limite de avaliações")
+    parser.add_argument("--ls", action="store_true", help="Aplica 2-opt na população inicial")
+    parser.add_argument("--ops", default="ox,erx,eax,gpx", help="Operadores, separados por vírgula")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    coords, idx_base = instancia(args)
+    dist_matrix = generate_distance_matrix(coords)
+    vizinhos = preparar_vizinhos(dist_matrix)
+
+    random.seed(args.seed)
+    rota = criar_cromossomo(len(coords), idx_base)["rota"]
+    referencia = distancia_rota(busca_profunda(rota, dist_matrix, vizinhos, args.ref_seg),
+                                dist_matrix)
+    alvo = referencia * (1 + args.gap / 100)
+
+    print(f"n={len(coords)}  pop={args.pop}  referência={referencia:.2f} km  "
+          f"alvo={alvo:.2f} km (+{args.gap:g}%)")
+    print(f"{'Operador':<10}{'Avaliações':>12}{'Melhor (km)':>14}{'Gap (%)':>10}{'Tempo (s)':>12}")
+
+    for tipo in args.ops.split(","):
+        avaliacoes, melhor, tempo = rodar(tipo, dist_matrix, vizinhos, idx_base, alvo, args)
+        gap = (melhor / referencia - 1) * 100
+        marca = "" if melhor <= alvo else "  (não atingiu)"
+        print(f"{tipo.upper():<10}{avaliacoes:>12,}{melhor:>14.2f}{gap:>10.2f}{tempo:>12.2f}{marca}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,7 @@ Componentes:
     - physics: Física do drone (aceleração, vento, consumo)
     - simulation: Simulação de rotas e cálculo de fitness
     - genetic_algorithm: Implementação do AG
+    - local_search: Busca local com listas de vizinhos (2-opt)
     - visualizacao: Geração de gráficos e visualizações
 
 Autores: [PREENCHER COM NOMES E MATRÍCULAS]
@@ -26,9 +27,12 @@ __author__ = "Equipe UNIBRASIL"
 from .config import Config
 from .data_loader import (
     load_ceps_coords,
+    load_ceps_stream,
     generate_distance_matrix,
     build_wind_cache,
-    validar_arquivo_csv
+    validar_arquivo_csv,
+    salvar_instancia,
+    carregar_instancia
 )
 from .simulation import (
     calcular_fitness,
@@ -47,9 +51,12 @@ __all__ = [
     
     # Data Loader
     'load_ceps_coords',
+    'load_ceps_stream',
     'generate_distance_matrix',
     'build_wind_cache',
     'validar_arquivo_csv',
+    'salvar_instancia',
+    'carregar_instancia',
     
     # Simulation
     'calcular_fitness',
@@ -0,0 +1,338 @@
+"""
+FIXAÇÃO DE ARESTAS DO BACKBONE (redução do problema durante a execução)
+
+Depois de algumas centenas de gerações, a maioria das arestas aparece em
+todos os melhores indivíduos, e o AG gasta avaliações com mutações que as
+quebram. Aqui:
+
+  - backbone: arestas presentes nas rotas dos top-K (as que tocam a base
+    ficam livres, para a rota continuar começando nela — isso também
+    impede que o backbone feche um ciclo);
+  - as arestas fixas formam cadeias; cada cadeia vira um super-nó, e o AG
+    (e a busca local) continuam sobre a instância contraída;
+  - distância entre super-nós: a menor entre as pontas das duas cadeias.
+    O comprimento interno das cadeias é constante, então a distância
+    contraída só subestima as ligações quando a mesma ponta serviria de
+    entrada e de saída; na expansão, o sentido de cada cadeia é escolhido
+    por DP (dois estados por cadeia) com as distâncias reais;
+  - velocidades dos trechos internos: as do melhor indivíduo no momento
+    da fixação.
+
+Como em agrupar_ceps, o fitness na instância contraída ignora os trechos
+internos; pousos e tempo são refeitos na rota expandida (velocidades por
+DP e recargas por split). A execução alterna fases (evolve_backbone):
+cada fase contraída refixa a partir dos seus melhores; se a fase estagnar
+(detectar_estagnacao), a próxima roda na instância inteira (relaxamento).
+"""
+
+from typing import Dict, List, Set, Tuple
+import numpy as np
+from config import Config
+from simulation import calcular_fitness
+from genetic_algorithm import evolve_optimized, detectar_estagnacao
+from speed_optimizer import polir_velocidades
+from recharge_split import otimizar_recargas
+from lower_bound import limite_held_karp, calcular_gap
+from local_search import distancia_rota
+
+
+def arestas_backbone(rotas: List[List[int]], idx_base: int) -> Set[Tuple[int, int]]:
+    """Arestas (a < b) presentes em todas as rotas, exceto as que tocam a base"""
+    comuns = None
+    for rota in rotas:
+        r = np.asarray(rota)
+        arestas = set(zip(np.minimum(r[:-1], r[1:]).tolist(), np.maximum(r[:-1], r[1:]).tolist()))
+        comuns = arestas if comuns is None else comuns & arestas
+    return {(a, b) for a, b in (comuns or ()) if idx_base not in (a, b)}
+
+
+def formar_cadeias(arestas: Set[Tuple[int, int]], n: int) -> List[List[int]]:
+    """
+    Cadeias (caminhos) formadas pelas arestas fixas; nós sem aresta fixa
+    viram cadeias de um nó. Ordenadas pelo primeiro nó de cada uma.
+    """
+    adj = [[] for _ in range(n)]
+    for a, b in arestas:
+        adj[a].append(b)
+        adj[b].append(a)
+
+    cadeias = []
+    visto = [False] * n
+    for s in range(n):
+        if visto[s] or len(adj[s]) == 2:
+            continue
+        cadeia = [s]
+        visto[s] = True
+        anterior, atual = -1, s
+        while True:
+            prox = [v for v in adj[atual] if v != anterior]
+            if not prox:
+                break
+            anterior, atual = atual, prox[0]
+            cadeia.append(atual)
+            visto[atual] = True
+        cadeias.append(cadeia)
+    return cadeias
+
+
+def contrair_instancia(ceps: List[str], coords, dist_matrix: List[List[float]], idx_base: int,
+                       cadeias: List[List[int]], referencia: Dict) -> Dict:
+    """
+    Instância contraída (um super-nó por cadeia)
+
+    referencia: cromossomo de onde vêm as velocidades dos trechos internos
+
+    Returns:
+        Dicionário no formato de reduzir_instancia ('ceps', 'coords',
+        'dist_matrix', 'idx_base') com 'cadeias', 'velocidades_internas'
+        (no sentido de cada cadeia) e 'comprimento_interno' (km)
+    """
+    cabecas = np.array([c[0] for c in cadeias])
+    caudas = np.array([c[-1] for c in cadeias])
+    pontas = np.concatenate([cabecas, caudas])
+    m = len(cadeias)
+
+    d = np.asarray([dist_matrix[i] for i in pontas])[:, pontas].reshape(2, m, 2, m)
+    contraida = d.min(axis=(0, 2))
+    np.fill_diagonal(contraida, 0.0)
+
+    rota, vel = referencia["rota"], referencia["velocidades"]
+    vel_aresta = {(min(a, b), max(a, b)): v for a, b, v in zip(rota[:-1], rota[1:], vel)}
+    internas = [[vel_aresta[(min(a, b), max(a, b))] for a, b in zip(c[:-1], c[1:])]
+                for c in cadeias]
+    comprimento = sum(dist_matrix[a][b] for c in cadeias for a, b in zip(c[:-1], c[1:]))
+
+    return {
+        'ceps': [ceps[c[0]] for c in cadeias],
+        'coords': [tuple(coords[c[0]]) for c in cadeias],
+        'dist_matrix': contraida.tolist(),
+        'idx_base': next(j for j, c in enumerate(cadeias) if c[0] == idx_base),
+        'cadeias': cadeias,
+        'velocidades_internas': internas,
+        'comprimento_interno': comprimento,
+    }
+
+
+def contrair_cromossomo(cromossomo: Dict, instancia: Dict) -> Dict:
+    """
+    Projeta uma rota completa na instância contraída
+
+    Cada cadeia entra na posição da sua primeira parada visitada; o trecho
+    até ela usa a velocidade com que a rota chegava a essa parada.
+    """
+    cadeia_de = {}
+    for j, c in enumerate(instancia['cadeias']):
+        for no in c:
+            cadeia_de[no] = j
+
+    rota_r, vel_r, vistas = [], [], set()
+    rota, vel = cromossomo["rota"], cromossomo["velocidades"]
+    for p, no in enumerate(rota[:-1]):
+        j = cadeia_de[no]
+        if j not in vistas:
+            vistas.add(j)
+            rota_r.append(j)
+            if p > 0:
+                vel_r.append(vel[p - 1])
+    rota_r.append(rota_r[0])
+    vel_r.append(vel[-1])
+    return {"rota": rota_r, "velocidades": vel_r}
+
+
+def expandir_cromossomo_cadeias(cromossomo: Dict, instancia: Dict,
+                                dist_matrix: List[List[float]]) -> Dict:
+    """
+    Expande um cromossomo da instância contraída para as paradas originais
+
+    O sentido de cada cadeia (cabeça→cauda ou o inverso) minimiza a soma
+    das ligações reais, por DP sobre a sequência de super-nós (estado:
+    sentido da cadeia atual). A base é uma cadeia de um nó.
+    """
+    cadeias = instancia['cadeias']
+    internas = instancia['velocidades_internas']
+    seq = cromossomo["rota"][:-1]
+
+    def pontas(j, sentido):
+        c = cadeias[j]
+        return (c[0], c[-1]) if sentido == 0 else (c[-1], c[0])
+
+    # custo[s]: melhor custo com a cadeia atual no sentido s; escolha: sentido anterior
+    custo = [0.0, float('inf')]
+    escolhas = []
+    for anterior, j in zip(seq[:-1], seq[1:]):
+        novo, escolha = [0.0, 0.0], [0, 0]
+        for s in (0, 1):
+            entrada = pontas(j, s)[0]
+            opcoes = [custo[t] + dist_matrix[pontas(anterior, t)[1]][entrada] for t in (0, 1)]
+            escolha[s] = 0 if opcoes[0] <= opcoes[1] else 1
+            novo[s] = opcoes[escolha[s]]
+        custo = novo
+        escolhas.append(escolha)
+
+    base = cadeias[seq[0]][0]
+    fim = [custo[s] + dist_matrix[pontas(seq[-1], s)[1]][base] for s in (0, 1)]
+    sentidos = [0 if fim[0] <= fim[1] else 1]
+    for escolha in reversed(escolhas):
+        sentidos.append(escolha[sentidos[-1]])
+    sentidos.reverse()
+
+    rota, velocidades = [], []
+    vel_r = cromossomo["velocidades"]
+    for p, (j, s) in enumerate(zip(seq, sentidos)):
+        nos = cadeias[j] if s == 0 else cadeias[j][::-1]
+        vel_int = internas[j] if s == 0 else internas[j][::-1]
+        if p > 0:
+            velocidades.append(vel_r[p - 1])
+        rota.extend(nos)
+        velocidades.extend(vel_int)
+    rota.append(rota[0])
+    velocidades.append(vel_r[-1])
+    return {"rota": rota, "velocidades": velocidades}
+
+
+def evolve_backbone(ceps: List[str], coords, dist_matrix: List[List[float]], idx_base: int,
+                    wind_cache, pop_size: int, generations: int, geracao_fixacao: int = None,
+                    intervalo: int = None, elite: int = None, relaxar: bool = None,
+                    verbose: bool = True, tempo_busca_profunda: float = None,
+                    velocidades_dp: str = None, recargas_otimas: str = None,
+                    tolerancia_gap: float = None, vizinhos=None, direcoes=None,
+                    **opcoes_ag):
+    """
+    AG em fases com fixação das arestas do backbone
+
+    geracao_fixacao: gerações na instância inteira antes da primeira
+    fixação (default: Config.BACKBONE_GERACAO)
+    intervalo: gerações por fase depois disso (Config.BACKBONE_INTERVALO)
+    elite: top-K usado para o backbone (Config.BACKBONE_ELITE)
+    relaxar: fase estagnada → a próxima volta à instância inteira
+    (Config.BACKBONE_RELAXAR)
+    velocidades_dp, recargas_otimas: como em evolve_optimized, aplicados
+    à rota final expandida ("decoder"/"fitness" valem só nas fases sobre
+    a instância inteira); tempo_busca_profunda: na última fase
+    tolerancia_gap: encerra as fases quando a rota expandida fica a menos
+    disso do limite de Held-Karp da instância inteira (o limite de uma
+    instância contraída não limita a original, então o gap é conferido
+    entre as fases; default: Config.GAP_TOLERANCIA)
+    vizinhos: listas k-NN da instância inteira (fases sem contração)
+    direcoes: matriz de direções dos trechos da instância inteira; nas
+    fases contraídas, cada cadeia vira um nó e a direção sai de bearing()
+    opcoes_ag: repassadas a evolve_optimized (crossover, adaptativo...)
+
+    Returns:
+        (melhor, melhor_fit, historico) como evolve_optimized; nas fases
+        contraídas o histórico soma o comprimento interno das cadeias ao
+        fitness (termo de distância comparável) e historico['fases'] traz
+        (gerações, paradas da instância) de cada fase
+    """
+    if geracao_fixacao is None:
+        geracao_fixacao = Config.BACKBONE_GERACAO
+    if intervalo is None:
+        intervalo = Config.BACKBONE_INTERVALO
+    if elite is None:
+        elite = Config.BACKBONE_ELITE
+    if relaxar is None:
+        relaxar = Config.BACKBONE_RELAXAR
+    if tempo_busca_profunda is None:
+        tempo_busca_profunda = Config.DEEP_SEARCH_TEMPO_SEG
+    if velocidades_dp is None:
+        velocidades_dp = Config.VELOCIDADES_DP
+    if recargas_otimas is None:
+        recargas_otimas = Config.SPLIT_RECARGAS
+    if tolerancia_gap is None:
+        tolerancia_gap = Config.GAP_TOLERANCIA
+    avaliacao_dupla = opcoes_ag.get('avaliacao_dupla')
+    if avaliacao_dupla is None:
+        avaliacao_dupla = Config.AVALIACAO_DUPLA
+    fisica = True if avaliacao_dupla and Config.USE_FAST_FITNESS else None   # etapa final
+
+    n = len(ceps)
+    historico = {chave: [] for chave in ('minimo', 'media', 'mediana', 'maximo', 'desvio',
+                                         'num_validos')}
+    historico['fases'] = []
+    limite = None
+    if (Config.LIMITE_INFERIOR or tolerancia_gap > 0) and n <= Config.LIMITE_INFERIOR_N_MAX:
+        limite, _ = limite_held_karp(dist_matrix, idx_base)
+        historico['limite_inferior'] = limite
+    populacao = None
+    contrair = False
+    restantes = generations
+
+    while restantes > 0:
+        geracoes = min(restantes, intervalo if historico['fases'] else max(geracao_fixacao, 1))
+        restantes -= geracoes
+        ultima = restantes == 0
+
+        instancia = None
+        if contrair:
+            # Top-K rotas distintas (cópias do mesmo indivíduo não são consenso)
+            distintas = list({tuple(ind["rota"]): ind["rota"] for ind in populacao}.values())[:elite]
+            cadeias = formar_cadeias(arestas_backbone(distintas, idx_base), n)
+            if len(distintas) >= 2 and 5 <= len(cadeias) < n:
+                instancia = contrair_instancia(ceps, coords, dist_matrix, idx_base, cadeias,
+                                               populacao[0])
+
+        if instancia is None:
+            fase = (ceps, coords, dist_matrix, idx_base)
+            inicial = populacao
+            dp_fase = "decoder" if velocidades_dp == "decoder" else "off"
+            split_fase = "fitness" if recargas_otimas == "fitness" else "off"
+            deslocamento = 0.0
+        else:
+            fase = (instancia['ceps'], instancia['coords'], instancia['dist_matrix'],
+                    instancia['idx_base'])
+            inicial = [contrair_cromossomo(ind, instancia) for ind in populacao]
+            dp_fase, split_fase = "off", "off"
+            deslocamento = instancia['comprimento_interno'] * Config.MULT_DISTANCIA
+
+        if verbose:
+            print(f"\n🦴 BACKBONE: fase de {geracoes} gerações sobre {len(fase[0])} paradas"
+                  + (f" ({n - len(fase[0])} arestas fixas)" if instancia else ""))
+
+        melhor_fase, _, hist_fase = evolve_optimized(
+            *fase, wind_cache, pop_size, geracoes, verbose=verbose,
+            tempo_busca_profunda=tempo_busca_profunda if ultima else 0.0,
+            velocidades_dp=dp_fase, recargas_otimas=split_fase,
+            populacao_inicial=inicial,
+            tolerancia_gap=tolerancia_gap if instancia is None else 0.0,
+            limite_inferior=limite if instancia is None and limite is not None else False,
+            vizinhos=vizinhos if instancia is None else None,
+            direcoes=direcoes if instancia is None else None, **opcoes_ag)
+
+        for chave in ('minimo', 'media', 'mediana', 'maximo'):
+            historico[chave].extend(v + deslocamento for v in hist_fase[chave])
+        for chave in ('desvio', 'num_validos'):
+            historico[chave].extend(hist_fase[chave])
+        historico['fases'].append((geracoes, len(fase[0])))
+
+        populacao = [melhor_fase] + hist_fase['populacao']
+        if instancia is not None:
+            populacao = [expandir_cromossomo_cadeias(ind, instancia, dist_matrix)
+                         for ind in populacao]
+
+        estagnado, _ = detectar_estagnacao(hist_fase['media'])
+        contrair = not (relaxar and instancia is not None and estagnado)
+
+        if limite is not None:
+            gap = calcular_gap(distancia_rota(populacao[0]["rota"], dist_matrix), limite)
+            if verbose:
+                print(f"\n🦴 BACKBONE: gap da rota expandida {gap:.2%}")
+            if tolerancia_gap > 0 and gap <= tolerancia_gap \
+                    and (restantes > 0 or 'parada_gap' in hist_fase):
+                historico['parada_gap'] = (generations - restantes - geracoes
+                                           + hist_fase.get('parada_gap', geracoes))
+                break
+
+    # Melhor da última fase (incluindo a busca profunda), na instância inteira
+    fits = [calcular_fitness(ind, coords, dist_matrix, wind_cache, fisica, direcoes)
+            for ind in populacao[:elite + 1]]
+    k = int(np.argmin(fits))
+    melhor, melhor_fit = populacao[k], fits[k]
+
+    if velocidades_dp != "off":
+        melhor, melhor_fit = polir_velocidades(melhor, coords, dist_matrix, wind_cache, fisica,
+                                               direcoes=direcoes)
+    if recargas_otimas != "off":
+        melhor, _ = otimizar_recargas(melhor, ceps, coords, dist_matrix, wind_cache, direcoes)
+        melhor_fit = calcular_fitness(melhor, coords, dist_matrix, wind_cache, fisica, direcoes)
+
+    return melhor, melhor_fit, historico
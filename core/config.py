@@ -11,6 +11,16 @@ class Config:
     HORA_CUSTO_EXTRA = 17
     PRAZO_DIAS = 7
     
+    # Faixa esperada das coordenadas (Curitiba aproximadamente)
+    LATITUDE_MIN = -26.0
+    LATITUDE_MAX = -25.0
+    LONGITUDE_MIN = -49.5
+    LONGITUDE_MAX = -49.0
+    
+    # Horários (início de cada janela de 3h) da previsão de ventos
+    SLOTS_VENTO: List[int] = [6, 9, 12, 15, 18]
+    VENTO_INTERPOLADO = False      # Interpola vento entre janelas (tabela por segundo)
+    
     # Drone
     VELOCIDADE_MAXIMA = 96
     VELOCIDADE_MINIMA = 36
@@ -56,9 +66,20 @@ class Config:
     
     # Operadores
     CROSSOVER_RATE = 0.85          # OX mantido
+    CROSSOVER_TIPO = "ox"          # "ox", "erx", "eax" ou "gpx" (ver crossover.py)
+    EAX_FILHOS = 10                # AB-ciclos testados por filho do EAX
+    OPERADORES_ADAPTATIVOS = False # Bandit ajusta as taxas dos operadores (operator_selection.py)
+    ADAPTATIVO_CROSSOVERS = ("ox", "erx", "eax", "gpx")  # Crossovers disputados pelo bandit
+    ADAPTATIVO_TAXA_APRENDIZADO = 0.2  # Peso da geração atual nas médias móveis de ganho e tempo
+    ADAPTATIVO_PROB_MINIMA = 0.05  # Piso de probabilidade de cada operador no seu grupo
     MUTATION_RATE_SWAP = 0.12      # Swap mantido
     MUTATION_RATE_INVERSION = 0.08 # Inversion separado
     MUTATION_RATE_2OPT = 0.05      # 2-opt adicionado
+    MUTATION_RATE_OROPT = 0.05     # Or-opt: realoca 1-3 paradas consecutivas
+    OROPT_MAX_SEGMENTO = 3         # Tamanho máximo do segmento do Or-opt
+    MUTATION_RATE_LNS = 0.02       # Ruína e recriação: remove e reinsere paradas próximas
+    LNS_MIN_REMOVER = 5            # Mínimo de paradas removidas pela ruína
+    LNS_MAX_REMOVER = 50           # Máximo de paradas removidas pela ruína
     
     # Seleção
     ELITISM_COUNT = 5              # Elitismo: 5 indivíduos (conforme doc)
@@ -71,11 +92,44 @@ class Config:
     
     STAGNATION_CHECK = 20          # Verifica a cada 20 gerações
     STAGNATION_THRESHOLD = 0.5     # Melhoria mínima: 0.5%
+    GAP_TOLERANCIA = 0.0           # Para quando o gap de distância ≤ tolerância (0.01 = 1%); 0 = nunca
+    LIMITE_INFERIOR = False        # Calcula o limite de Held-Karp e mostra o gap mesmo sem GAP_TOLERANCIA
+    LIMITE_INFERIOR_ITERACOES = 100  # Passos do subgradiente do limite inferior
+    LIMITE_INFERIOR_N_MAX = 3000   # Acima disso o limite (O(n²) por passo) não é calculado
     
     # Estratégias quando estagna:
     RESTART_PERCENTAGE = 0.30      # Reinicia 30% da população
+    RESTART_CURVA = 0.50           # Dos reiniciados, fração com rota da curva (construction.py)
     HYPERMUTATION_RATE = 0.40      # Taxa de hiper-mutação
+    LNS_TEMPO_SEG = 0.5            # LNS (ruína e recriação) no melhor ao estagnar; 0 = desligado
     LOCAL_SEARCH_ELITE = 5         # Aplica 2-opt nos 5 melhores
+    KNN_VIZINHOS = 10              # Tamanho das listas de vizinhos mais próximos
+    LOCAL_SEARCH_EVERY = 1         # Busca local nos elites a cada N gerações
+    LOCAL_SEARCH_FIRST_IMPROVEMENT = True  # Primeira melhoria (False = melhor)
+    LOCAL_SEARCH_OROPT = True      # Aplica Or-opt após o 2-opt nos elites
+    DEEP_SEARCH_TEMPO_SEG = 0.0    # Busca profunda (LK + Or-opt) no elite final; 0 = desligada
+    DEEP_SEARCH_PROFUNDIDADE = 5   # Movimentos 2-opt encadeados por passo do LK
+    VELOCIDADES_DP = "off"         # Velocidades ótimas por DP: "off", "final" (polimento) ou "decoder"
+    DP_BATERIA_PASSO_SEG = 5.0     # Discretização da bateria na DP (segundos)
+    SPLIT_RECARGAS = "off"         # Recargas ótimas por split: "off", "final" ou "fitness"
+    EXATO_AUTOMATICO = True        # Instâncias pequenas: Held-Karp exato em vez do AG
+    EXATO_N_MAX = 18               # Maior n (com a base) resolvido pelo solver exato
+    
+    # Decomposição geográfica (decomposition.py): AG por cluster em paralelo + costura
+    DECOMPOSICAO_TAMANHO_CLUSTER = 150   # CEPs por cluster (define o número de clusters)
+    DECOMPOSICAO_METODO = "kmeans"       # Partição: "kmeans" ou "grade"
+    DECOMPOSICAO_PROCESSOS = 0           # Processos em paralelo; 0 = todos os núcleos
+    
+    # Fixação de arestas do backbone (backbone.py): AG em fases sobre a instância contraída
+    BACKBONE_GERACAO = 0           # Gerações antes da primeira fixação; 0 = desligada
+    BACKBONE_INTERVALO = 50        # Gerações por fase depois da fixação (refixa a cada fase)
+    BACKBONE_ELITE = 10            # Top-K cujas arestas comuns são fixadas
+    BACKBONE_RELAXAR = True        # Fase contraída estagnada → próxima na instância inteira
+    
+    # Motor de estado estacionário (steady_state.py): filhos disputam vagas um a um
+    ESTADO_ESTAVEL = False         # Usa evolve_steady_state em vez do laço geracional
+    ESTADO_ESTAVEL_SUBSTITUICAO = "pior"  # Vaga disputada: "pior" ou "semelhante" (crowding)
+    ESTADO_ESTAVEL_FILHOS = 2      # Filhos por passo (1 ou 2)
     
     # ===========================
     # DIVERSIDADE INICIAL
@@ -88,6 +142,15 @@ class Config:
     INIT_VELOCIDADE_ALTA = 0.30    # 30% velocidades altas (80-96)
     INIT_VELOCIDADE_RANDOM = 0.10  # 10% completamente aleatório
     
+    # Rotas construtivas (construction.py) em parte da população; as faixas
+    # de velocidade acima são mantidas, só a rota é trocada
+    INIT_CONSTRUTIVA = 0.20        # Fração da população; 0 = só rotas aleatórias
+    INIT_CONSTRUTIVA_METODOS = ("vizinho", "arestas", "insercao_barata",
+                                "insercao_distante", "curva")
+    INIT_CONSTRUTIVA_CHUTES = 3    # Double-bridge nas cópias de cada heurística
+    INIT_CONSTRUTIVA_N_MATRIZ = 5000  # Acima disso, só a curva (as outras são O(n²))
+    CURVA_TIPO = "hilbert"         # Curva da construção sem matriz: "hilbert" ou "morton"
+    
     # ===========================
     # SIMULAÇÃO EM DUAS CAMADAS
     # ===========================
@@ -96,10 +159,25 @@ class Config:
     
     USE_FAST_FITNESS = True        # Usa estimativa rápida no AG
     VALIDATE_DETAILED_FINAL = True # Simula detalhado apenas no melhor
+    AVALIACAO_DUPLA = False        # Modelo rápido para todos + física (com cache) nos candidatos à elite
+    AVALIACAO_DUPLA_ELITE = 10     # Melhores pelo modelo rápido reavaliados com a física
+    AVALIACAO_DUPLA_MARGEM = 0.01  # Também reavalia quem está até 1% acima do corte da elite
+    AVALIACAO_DUPLA_CACHE = 65536  # Avaliações com física guardadas (rota, velocidades)
     
     # Velocidades válidas
     VELOCIDADES_VALIDAS: List[int] = list(range(VELOCIDADE_MINIMA, VELOCIDADE_MAXIMA + 1, MULTIPLO_VELOCIDADE))
     
+    # ===========================
+    # PRÉ-PROCESSAMENTO DA INSTÂNCIA
+    # ===========================
+    # CEPs no mesmo prédio/quadra viram um único super-nó no AG
+    
+    RAIO_AGRUPAMENTO_M = 0.0       # Raio de agrupamento em metros (0 = desligado)
+    
+    # Projeção planar local: distâncias/direções por aritmética simples
+    USE_PROJECAO_PLANAR = False    # Substitui Haversine pela projeção equirretangular
+    PROJECAO_ERRO_MAX_REL = 0.005  # Erro relativo máximo aceitável (0,5%)
+    
     # ===========================
     # MONITORAMENTO (20 GERAÇÕES)
     # ===========================
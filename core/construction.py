@@ -0,0 +1,333 @@
+"""
+HEURÍSTICAS CONSTRUTIVAS PARA A POPULAÇÃO INICIAL
+
+Rotas de boa qualidade em uma passada, para semear parte da população em
+vez de partir só de permutações aleatórias:
+
+  - vizinho mais próximo (a partir de uma parada sorteada);
+  - arestas gulosas (menores arestas das listas de vizinhos sem formar
+    ciclo nem grau 3; os fragmentos são ligados por vizinho mais próximo);
+  - inserção mais barata e inserção mais distante;
+  - ordem de uma curva de Hilbert (ou Morton) sobre as coordenadas (plano
+    girado por um ângulo sorteado, para cada rota seguir um percurso
+    diferente). É a única que dispensa a matriz de distâncias: O(n log n).
+
+As rotas seguem o formato do AG: [base, ..., base]. Cópias de uma mesma
+heurística recebem chutes double-bridge (perturbar) para diversidade.
+"""
+
+import math
+import random
+import numpy as np
+from typing import List, Sequence, Tuple
+from config import Config
+from data_loader import projetar_coords
+
+
+def _fechar(ciclo: Sequence[int], idx_base: int) -> List[int]:
+    """Gira o ciclo para começar na base e fecha a rota"""
+    ciclo = list(ciclo)
+    p = ciclo.index(idx_base)
+    return ciclo[p:] + ciclo[:p] + [idx_base]
+
+
+def vizinho_mais_proximo(dist: np.ndarray, idx_base: int, inicio: int = None) -> List[int]:
+    """Vizinho mais próximo a partir de `inicio` (default: parada sorteada)"""
+    n = len(dist)
+    if inicio is None:
+        inicio = random.randrange(n)
+    visitado = np.zeros(n, dtype=bool)
+    ciclo = [inicio]
+    visitado[inicio] = True
+    atual = inicio
+    for _ in range(n - 1):
+        atual = int(np.argmin(np.where(visitado, np.inf, dist[atual])))
+        visitado[atual] = True
+        ciclo.append(atual)
+    return _fechar(ciclo, idx_base)
+
+
+def arestas_gulosas(dist: np.ndarray, idx_base: int, vizinhos: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Arestas gulosas restritas às listas de vizinhos
+
+    Aceita as arestas candidatas em ordem crescente de custo se as duas
+    pontas têm grau < 2 e estão em fragmentos diferentes (union-find).
+    Os fragmentos restantes são encadeados pelo extremo mais próximo.
+    """
+    n = len(dist)
+    if n < 3:
+        return _fechar(range(n), idx_base)
+
+    candidatas = sorted({(min(i, j), max(i, j)) for i in range(n) for j in vizinhos[i]},
+                        key=lambda e: dist[e[0], e[1]])
+    pai = list(range(n))
+
+    def raiz(x):
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    grau = [0] * n
+    adj = [[] for _ in range(n)]
+    for i, j in candidatas:
+        if grau[i] < 2 and grau[j] < 2:
+            ri, rj = raiz(i), raiz(j)
+            if ri != rj:
+                pai[ri] = rj
+                grau[i] += 1
+                grau[j] += 1
+                adj[i].append(j)
+                adj[j].append(i)
+
+    # Fragmentos (caminhos; pontos isolados são caminhos de um nó)
+    fragmentos = []
+    visto = [False] * n
+    for s in range(n):
+        if visto[s] or grau[s] == 2:
+            continue
+        caminho = [s]
+        visto[s] = True
+        anterior, atual = -1, s
+        while True:
+            prox = [v for v in adj[atual] if v != anterior]
+            if not prox:
+                break
+            anterior, atual = atual, prox[0]
+            caminho.append(atual)
+            visto[atual] = True
+        fragmentos.append(caminho)
+
+    # Encadeia: do extremo atual para o extremo livre mais próximo
+    ciclo = fragmentos.pop(0)
+    while fragmentos:
+        fim = ciclo[-1]
+        inicios = np.array([f[0] for f in fragmentos])
+        fins = np.array([f[-1] for f in fragmentos])
+        d_ini, d_fim = dist[fim, inicios], dist[fim, fins]
+        k_ini, k_fim = int(np.argmin(d_ini)), int(np.argmin(d_fim))
+        if d_ini[k_ini] <= d_fim[k_fim]:
+            ciclo.extend(fragmentos.pop(k_ini))
+        else:
+            ciclo.extend(reversed(fragmentos.pop(k_fim)))
+    return _fechar(ciclo, idx_base)
+
+
+def insercao(dist: np.ndarray, idx_base: int, criterio: str = "mais_barata",
+             inicio: int = None) -> List[int]:
+    """
+    Inserção mais barata ou mais distante (ciclo inicial: base e `inicio`)
+
+    O ciclo é uma lista ligada (suc). Na inserção mais barata, cada parada
+    fora do ciclo guarda a melhor aresta para entrar; ao inserir k na
+    aresta (a, b), só as paradas cuja melhor aresta era (a, b) são
+    recalculadas sobre o ciclo; as demais só comparam (a, k) e (k, b).
+    """
+    n = len(dist)
+    if n < 3:
+        return _fechar(range(n), idx_base)
+    if inicio is None or inicio == idx_base:
+        inicio = random.choice([i for i in range(n) if i != idx_base])
+
+    suc = np.empty(n, dtype=np.int64)
+    suc[idx_base], suc[inicio] = inicio, idx_base
+    no_ciclo = [idx_base, inicio]
+    fora = np.ones(n, dtype=bool)
+    fora[[idx_base, inicio]] = False
+
+    # Distância ao ciclo (mais distante) e melhor aresta de entrada (mais barata)
+    d_ciclo = np.minimum(dist[idx_base], dist[inicio])
+    custo = dist[idx_base] + dist[inicio] - dist[idx_base, inicio]
+    aresta = np.full(n, idx_base, dtype=np.int64)
+
+    for _ in range(n - 2):
+        livres = np.flatnonzero(fora)
+        if criterio == "mais_distante":
+            k = int(livres[np.argmax(d_ciclo[livres])])
+            t = np.asarray(no_ciclo)
+            s = suc[t]
+            a = int(t[np.argmin(dist[t, k] + dist[k, s] - dist[t, s])])
+        else:
+            k = int(livres[np.argmin(custo[livres])])
+            a = int(aresta[k])
+        b = int(suc[a])
+        suc[a], suc[k] = k, b
+        no_ciclo.append(k)
+        fora[k] = False
+        d_ciclo = np.minimum(d_ciclo, dist[k])
+
+        if criterio != "mais_distante":
+            livres = np.flatnonzero(fora)
+            c1 = dist[a, livres] + dist[livres, k] - dist[a, k]
+            c2 = dist[k, livres] + dist[livres, b] - dist[k, b]
+            velhos = aresta[livres] == a
+
+            melhor1 = ~velhos & (c1 < custo[livres])
+            custo[livres[melhor1]] = c1[melhor1]
+            aresta[livres[melhor1]] = a
+            melhor2 = ~velhos & (c2 < custo[livres])
+            custo[livres[melhor2]] = c2[melhor2]
+            aresta[livres[melhor2]] = k
+
+            # Perderam a aresta (a, b): recalcula sobre o ciclo inteiro
+            recalcular = livres[velhos]
+            if len(recalcular):
+                t = np.asarray(no_ciclo)
+                s = suc[t]
+                custos = dist[np.ix_(recalcular, t)] + dist[np.ix_(recalcular, s)] - dist[t, s]
+                melhor = np.argmin(custos, axis=1)
+                custo[recalcular] = custos[np.arange(len(recalcular)), melhor]
+                aresta[recalcular] = t[melhor]
+
+    ciclo = [idx_base]
+    while len(ciclo) < n:
+        ciclo.append(int(suc[ciclo[-1]]))
+    return ciclo + [idx_base]
+
+
+def _grade(xy: np.ndarray, ordem: int) -> np.ndarray:
+    """Pontos levados a inteiros de uma grade 2^ordem x 2^ordem (mesma escala nos eixos)"""
+    lado = 1 << ordem
+    minimo = xy.min(axis=0)
+    escala = max(float((xy.max(axis=0) - minimo).max()), 1e-12)
+    return np.minimum(((xy - minimo) / escala * (lado - 1)).astype(np.int64), lado - 1)
+
+
+def indices_hilbert(xy: np.ndarray, ordem: int = 16) -> np.ndarray:
+    """
+    Posição de cada ponto ao longo de uma curva de Hilbert
+
+    O laço percorre os bits da grade (vetorizado sobre os pontos).
+    """
+    lado = 1 << ordem
+    grade = _grade(xy, ordem)
+    x, y = grade[:, 0].copy(), grade[:, 1].copy()
+
+    d = np.zeros(len(xy), dtype=np.int64)
+    s = lado >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotaciona o quadrante
+        inverte = ~ry & rx
+        x[inverte] = lado - 1 - x[inverte]
+        y[inverte] = lado - 1 - y[inverte]
+        troca = ~ry
+        x[troca], y[troca] = y[troca], x[troca].copy()
+        s >>= 1
+    return d
+
+
+def indices_morton(xy: np.ndarray, ordem: int = 16) -> np.ndarray:
+    """Posição de cada ponto na ordem Z (Morton): bits de x e y intercalados"""
+    grade = _grade(xy, ordem)
+
+    def espalhar(v):
+        v = (v | (v << 8)) & 0x00FF00FF
+        v = (v | (v << 4)) & 0x0F0F0F0F
+        v = (v | (v << 2)) & 0x33333333
+        return (v | (v << 1)) & 0x55555555
+
+    return espalhar(grade[:, 0]) | (espalhar(grade[:, 1]) << 1)
+
+
+def construtor_curva(coords: Sequence[Tuple[float, float]], curva: str = None):
+    """
+    Construtor de rotas pela ordem de uma curva que preenche o plano
+
+    Não usa a matriz de distâncias: projeta as coordenadas uma vez e, a
+    cada rota, gira o plano por um ângulo sorteado e ordena os pontos pelo
+    índice na curva — O(n log n), viável para dezenas de milhares de CEPs.
+    Ângulos diferentes dão percursos diferentes, então as rotas servem
+    também para injetar diversidade (restart).
+
+    curva: "hilbert" ou "morton" (default: Config.CURVA_TIPO)
+
+    Returns:
+        Função (idx_base, angulo=None) -> rota [base, ..., base]
+    """
+    if curva is None:
+        curva = Config.CURVA_TIPO
+    indices = indices_morton if curva == "morton" else indices_hilbert
+    xy = projetar_coords(coords)
+    xy = xy - xy.mean(axis=0)
+
+    def construir(idx_base: int, angulo: float = None) -> List[int]:
+        if angulo is None:
+            angulo = random.uniform(0, 2 * math.pi)
+        c, s = math.cos(angulo), math.sin(angulo)
+        ordem = np.argsort(indices(xy @ np.array([[c, s], [-s, c]])), kind='stable')
+        return _fechar(ordem.tolist(), idx_base)
+
+    return construir
+
+
+def rota_curva(coords: Sequence[Tuple[float, float]], idx_base: int,
+               angulo: float = None, curva: str = None) -> List[int]:
+    """Rota na ordem da curva, com o plano girado por `angulo` (rad; default: sorteado)"""
+    return construtor_curva(coords, curva)(idx_base, angulo)
+
+
+def perturbar(rota: List[int], chutes: int = 1) -> List[int]:
+    """Chutes double-bridge aleatórios (A B C D → A C B D) nas paradas intermediárias"""
+    meio = rota[1:-1]
+    if len(meio) < 8:
+        return rota[:]
+    for _ in range(chutes):
+        p1, p2, p3 = sorted(random.sample(range(1, len(meio)), 3))
+        meio = meio[:p1] + meio[p2:p3] + meio[p1:p2] + meio[p3:]
+    return [rota[0]] + meio + [rota[-1]]
+
+
+def rotas_construtivas(m: int, dist_matrix, idx_base: int,
+                       coords: Sequence[Tuple[float, float]] = None,
+                       vizinhos: Sequence[Sequence[int]] = None,
+                       metodos: Sequence[str] = None, chutes: int = None) -> List[List[int]]:
+    """
+    `m` rotas das heurísticas construtivas, alternando os métodos
+
+    metodos: subconjunto de Config.INIT_CONSTRUTIVA_METODOS ("vizinho",
+    "arestas", "insercao_barata", "insercao_distante", "curva"); "curva"
+    exige coords e "arestas", vizinhos (senão são ignorados).
+    A primeira rota de cada método é intacta; as seguintes recebem
+    `chutes` double-bridge (default: Config.INIT_CONSTRUTIVA_CHUTES).
+    Acima de Config.INIT_CONSTRUTIVA_N_MATRIZ paradas, só a curva é usada
+    (as demais heurísticas são O(n²) sobre a matriz).
+    """
+    if metodos is None:
+        metodos = Config.INIT_CONSTRUTIVA_METODOS
+    if chutes is None:
+        chutes = Config.INIT_CONSTRUTIVA_CHUTES
+    n = len(dist_matrix)
+    if n > Config.INIT_CONSTRUTIVA_N_MATRIZ:
+        metodos = [mt for mt in metodos if mt == "curva"]
+    metodos = [mt for mt in metodos
+               if (mt != "curva" or coords is not None) and (mt != "arestas" or vizinhos is not None)]
+    if m <= 0 or not metodos:
+        return []
+
+    dist = np.asarray(dist_matrix, dtype=np.float64) if metodos != ["curva"] else None
+    curva = construtor_curva(coords) if "curva" in metodos else None
+    construtores = {
+        "vizinho": lambda: vizinho_mais_proximo(dist, idx_base),
+        "arestas": lambda: arestas_gulosas(dist, idx_base, vizinhos),
+        "insercao_barata": lambda: insercao(dist, idx_base, "mais_barata"),
+        "insercao_distante": lambda: insercao(dist, idx_base, "mais_distante"),
+        "curva": lambda: curva(idx_base),
+    }
+
+    # Arestas gulosas é determinística: constrói uma vez e só perturba
+    fixas = {}
+    rotas = []
+    for i in range(m):
+        metodo = metodos[i % len(metodos)]
+        if metodo == "arestas":
+            if metodo not in fixas:
+                fixas[metodo] = construtores[metodo]()
+            rota = fixas[metodo]
+        else:
+            rota = construtores[metodo]()
+        rotas.append(rota[:] if i < len(metodos) else perturbar(rota, chutes))
+    return rotas
@@ -0,0 +1,342 @@
+# crossover.py - CRUZAMENTOS BASEADOS EM ARESTAS
+"""
+Operadores de cruzamento que preservam arestas dos pais (TSP fechado).
+
+Trabalham sobre rotas fechadas [base, ..., base] e, internamente, sobre a
+representação por adjacência: adj[cidade] = [vizinho1, vizinho2] no ciclo.
+  - ERX: edge recombination (herda arestas da união dos pais);
+  - EAX: edge assembly (AB-ciclos + fusão gulosa de subciclos);
+  - GPX: generalized partition crossover (escolhe, por componente da
+    diferença entre os pais, o pai mais curto).
+"""
+import random
+from typing import List, Optional, Tuple
+
+
+def _adjacencias(rota: List[int], n_total: int) -> List[List[int]]:
+    """Adjacência do ciclo (rota fechada); -1 para cidades fora da rota"""
+    adj = [[-1, -1] for _ in range(n_total)]
+    tour = rota[:-1]
+    n = len(tour)
+    for i, c in enumerate(tour):
+        adj[c][0] = tour[i - 1]
+        adj[c][1] = tour[(i + 1) % n]
+    return adj
+
+
+def _rota_de_adjacencias(adj: List[List[int]], base: int) -> List[int]:
+    """Percorre o ciclo a partir da base e fecha a rota"""
+    rota = [base]
+    anterior, atual = base, adj[base][1]
+    while atual != base:
+        rota.append(atual)
+        a, b = adj[atual]
+        anterior, atual = atual, (b if a == anterior else a)
+    rota.append(base)
+    return rota
+
+
+def _custo_adj(adj: List[List[int]], cidades, d: List[List[float]]) -> float:
+    """Soma das arestas incidentes às cidades (arestas internas contam em dobro)"""
+    return sum(d[c][adj[c][0]] + d[c][adj[c][1]] for c in cidades)
+
+
+# ===========================
+# ERX - EDGE RECOMBINATION
+# ===========================
+def erx(r1: List[int], r2: List[int]) -> List[int]:
+    """
+    EDGE RECOMBINATION CROSSOVER
+
+    Parte da base e, a cada passo, segue para o vizinho (na união das
+    arestas dos pais) com menos vizinhos restantes; empates são sorteados.
+    Se a cidade atual não tiver vizinhos não visitados, sorteia uma
+    cidade restante.
+    """
+    base = r1[0]
+    tour = r1[:-1]
+    n_total = max(tour) + 1
+    a1 = _adjacencias(r1, n_total)
+    a2 = _adjacencias(r2, n_total)
+
+    arestas = {c: set(a1[c]) | set(a2[c]) for c in tour}
+    restantes = set(tour)
+    filho = [base]
+    atual = base
+
+    while True:
+        restantes.discard(atual)
+        for v in arestas[atual]:
+            arestas[v].discard(atual)
+        if not restantes:
+            break
+
+        candidatos = arestas[atual]
+        if candidatos:
+            menor = min(len(arestas[v]) for v in candidatos)
+            atual = random.choice([v for v in candidatos if len(arestas[v]) == menor])
+        else:
+            atual = random.choice(tuple(restantes))
+        filho.append(atual)
+
+    filho.append(base)
+    return filho
+
+
+# ===========================
+# EAX - EDGE ASSEMBLY
+# ===========================
+def _ab_ciclos(adj_a: List[List[int]], adj_b: List[List[int]], tour: List[int]) -> List[List[int]]:
+    """
+    AB-ciclos: ciclos que alternam arestas de A e de B (sem as comuns)
+
+    Cada ciclo é devolvido como [v0, v1, ..., v0], com a aresta (v0, v1)
+    de A, (v1, v2) de B, e assim por diante.
+    """
+    resto = ({}, {})
+    for c in tour:
+        ea = [v for v in adj_a[c] if v not in adj_b[c]]
+        eb = [v for v in adj_b[c] if v not in adj_a[c]]
+        if ea:
+            resto[0][c] = ea
+            resto[1][c] = eb
+
+    ciclos = []
+    inicios = list(resto[0].keys())
+    random.shuffle(inicios)
+
+    for v0 in inicios:
+        while resto[0].get(v0):
+            caminho = [v0]
+            ocorrencias = {v0: [0]}
+
+            while len(caminho) > 1 or resto[0].get(v0):
+                tipo = (len(caminho) - 1) % 2
+                v = caminho[-1]
+                opcoes = resto[tipo][v]
+                w = opcoes[random.randrange(len(opcoes))] if len(opcoes) > 1 else opcoes[0]
+                opcoes.remove(w)
+                resto[tipo][w].remove(v)
+
+                caminho.append(w)
+                chegada = len(caminho) - 2
+                anteriores = ocorrencias.setdefault(w, [])
+
+                fechou = None
+                for i in reversed(anteriores):
+                    if (chegada - i) % 2 == 1:
+                        fechou = i
+                        break
+
+                if fechou is None:
+                    anteriores.append(len(caminho) - 1)
+                    continue
+
+                # Garante que o ciclo comece com aresta de A
+                ciclo = caminho[fechou:]
+                if fechou % 2 == 1:
+                    ciclo = ciclo[1:] + [ciclo[1]]
+                ciclos.append(ciclo)
+
+                for k in range(len(caminho) - 2, fechou, -1):
+                    ocorrencias[caminho[k]].pop()
+                del caminho[fechou + 1:]
+
+    return ciclos
+
+
+def _aplicar_ab_ciclo(adj: List[List[int]], ciclo: List[int]) -> None:
+    """Troca, em adj, as arestas de A do AB-ciclo pelas de B"""
+    for k in range(len(ciclo) - 1):
+        u, v = ciclo[k], ciclo[k + 1]
+        if k % 2 == 0:
+            adj[u][adj[u].index(v)] = -1
+            adj[v][adj[v].index(u)] = -1
+    for k in range(1, len(ciclo) - 1, 2):
+        u, v = ciclo[k], ciclo[k + 1]
+        adj[u][adj[u].index(-1)] = v
+        adj[v][adj[v].index(-1)] = u
+
+
+def _subciclos(adj: List[List[int]], tour: List[int]) -> Tuple[List[int], List[List[int]]]:
+    """Rótulo do subciclo de cada cidade e a lista de cidades de cada subciclo"""
+    rotulo = [-1] * len(adj)
+    grupos = []
+    for c in tour:
+        if rotulo[c] >= 0:
+            continue
+        grupo = []
+        anterior, atual = -1, c
+        while rotulo[atual] < 0:
+            rotulo[atual] = len(grupos)
+            grupo.append(atual)
+            a, b = adj[atual]
+            proximo = b if a == anterior else a
+            anterior, atual = atual, proximo
+        grupos.append(grupo)
+    return rotulo, grupos
+
+
+def _fundir_subciclos(adj: List[List[int]], tour: List[int], d: List[List[float]],
+                      vizinhos: List[List[int]]) -> float:
+    """
+    Une os subciclos em um único ciclo (guloso, pelo menor subciclo).
+
+    Para u no menor subciclo U e v em outro subciclo, troca (u, u') e
+    (v, v') por (u, v) e (u', v'), com v entre os vizinhos de u (ou, se
+    nenhum vizinho estiver fora de U, entre todas as cidades).
+
+    Returns:
+        Custo adicional das fusões (km)
+    """
+    rotulo, grupos = _subciclos(adj, tour)
+    ativos = set(range(len(grupos)))
+    custo = 0.0
+
+    while len(ativos) > 1:
+        g = min(ativos, key=lambda i: len(grupos[i]))
+        melhor = None
+        melhor_delta = float('inf')
+
+        for busca_completa in (False, True):
+            for u in grupos[g]:
+                fora = tour if busca_completa else vizinhos[u]
+                for u2 in adj[u]:
+                    d_uu2 = d[u][u2]
+                    for v in fora:
+                        if rotulo[v] == g:
+                            continue
+                        for v2 in adj[v]:
+                            delta = d[u][v] + d[u2][v2] - d_uu2 - d[v][v2]
+                            if delta < melhor_delta:
+                                melhor_delta = delta
+                                melhor = (u, u2, v, v2)
+            if melhor is not None:
+                break
+
+        u, u2, v, v2 = melhor
+        adj[u][adj[u].index(u2)] = v
+        adj[u2][adj[u2].index(u)] = v2
+        adj[v][adj[v].index(v2)] = u
+        adj[v2][adj[v2].index(v)] = u2
+
+        destino = rotulo[v]
+        for c in grupos[g]:
+            rotulo[c] = destino
+        grupos[destino].extend(grupos[g])
+        ativos.discard(g)
+        custo += melhor_delta
+
+    return custo
+
+
+def eax(r1: List[int], r2: List[int], d: List[List[float]],
+        vizinhos: List[List[int]], n_filhos: int = 10,
+        ciclos: Optional[List[List[int]]] = None) -> List[int]:
+    """
+    EDGE ASSEMBLY CROSSOVER (estratégia de um AB-ciclo)
+
+    Decompõe a diferença entre A (r1) e B (r2) em AB-ciclos; cada filho é
+    A com as arestas de A de um AB-ciclo trocadas pelas de B, seguido da
+    fusão gulosa dos subciclos resultantes. Gera até `n_filhos` filhos
+    (um por AB-ciclo sorteado) e retorna o mais curto, avaliado pela
+    variação das arestas, sem percorrer o tour inteiro.
+
+    Returns:
+        Rota fechada do melhor filho (cópia de r1 se os pais forem iguais)
+    """
+    base = r1[0]
+    tour = r1[:-1]
+    n_total = len(d)
+    adj_a = _adjacencias(r1, n_total)
+
+    if ciclos is None:
+        ciclos = _ab_ciclos(adj_a, _adjacencias(r2, n_total), tour)
+    if not ciclos:
+        return r1[:]
+
+    melhor = None
+    melhor_delta = float('inf')
+
+    for ciclo in random.sample(ciclos, min(n_filhos, len(ciclos))):
+        adj = [a[:] for a in adj_a]
+        delta = sum(d[ciclo[k]][ciclo[k + 1]] * (1 if k % 2 else -1)
+                    for k in range(len(ciclo) - 1))
+        _aplicar_ab_ciclo(adj, ciclo)
+        delta += _fundir_subciclos(adj, tour, d, vizinhos)
+
+        if delta < melhor_delta:
+            melhor_delta = delta
+            melhor = adj
+
+    return _rota_de_adjacencias(melhor, base)
+
+
+def eax_par(r1: List[int], r2: List[int], d: List[List[float]],
+            vizinhos: List[List[int]], n_filhos: int = 10) -> Tuple[List[int], List[int]]:
+    """EAX nos dois sentidos (A=r1 e A=r2), reaproveitando os AB-ciclos"""
+    n_total = len(d)
+    ciclos = _ab_ciclos(_adjacencias(r1, n_total), _adjacencias(r2, n_total), r1[:-1])
+    # Os mesmos ciclos, lidos a partir da segunda aresta, começam com aresta de B
+    invertidos = [c[1:] + [c[1]] for c in ciclos]
+    return (eax(r1, r2, d, vizinhos, n_filhos, ciclos),
+            eax(r2, r1, d, vizinhos, n_filhos, invertidos))
+
+
+# ===========================
+# GPX - PARTITION CROSSOVER
+# ===========================
+def gpx(r1: List[int], r2: List[int], d: List[List[float]]) -> Tuple[List[int], List[int]]:
+    """
+    GENERALIZED PARTITION CROSSOVER
+
+    Remove as arestas comuns da união dos pais e separa o restante em
+    componentes conexas. Uma componente cortada por exatamente duas
+    arestas (comuns) é percorrida pelos dois pais como um único trecho
+    com as mesmas pontas, então o trecho de qualquer pai pode ser usado.
+    Nessas componentes escolhe-se o pai mais curto; as demais vêm todas
+    do mesmo pai (r1 no primeiro filho, r2 no segundo).
+
+    Returns:
+        (filho1, filho2); cópias dos pais se não houver partição
+    """
+    base = r1[0]
+    tour = r1[:-1]
+    n_total = len(d)
+    adj1 = _adjacencias(r1, n_total)
+    adj2 = _adjacencias(r2, n_total)
+
+    # Componentes do grafo de arestas não comuns
+    componente = [-1] * n_total
+    grupos = []
+    for c in tour:
+        if componente[c] >= 0 or set(adj1[c]) == set(adj2[c]):
+            continue
+        pilha = [c]
+        componente[c] = len(grupos)
+        grupo = []
+        while pilha:
+            u = pilha.pop()
+            grupo.append(u)
+            for v in adj1[u] + adj2[u]:
+                if componente[v] < 0 and (v not in adj1[u] or v not in adj2[u]):
+                    componente[v] = len(grupos)
+                    pilha.append(v)
+        grupos.append(grupo)
+
+    filhos = []
+    for adj_pai in (adj1, adj2):
+        adj = [a[:] for a in adj_pai]
+        for i, grupo in enumerate(grupos):
+            cortes = sum(1 for u in grupo for v in adj1[u] if componente[v] != i)
+            if cortes != 2:
+                continue
+            if _custo_adj(adj2, grupo, d) < _custo_adj(adj1, grupo, d):
+                origem = adj2
+            else:
+                origem = adj1
+            for u in grupo:
+                adj[u] = origem[u][:]
+        filhos.append(_rota_de_adjacencias(adj, base))
+
+    return filhos[0], filhos[1]
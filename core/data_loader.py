@@ -1,9 +1,21 @@
 # data_loader.py
 import csv
 import math
+import numpy as np
 from typing import List, Tuple, Dict, Optional
 from config import Config
 
+COLUNAS_CSV = ['cep', 'latitude', 'longitude']
+
+SEGUNDOS_DIA = 86400
+
+# Índice da janela de vento (em Config.SLOTS_VENTO) para cada hora do dia;
+# horas antes da primeira janela usam a primeira
+HORA_PARA_SLOT = np.array(
+    [max(0, sum(1 for s in Config.SLOTS_VENTO if h >= s) - 1) for h in range(24)],
+    dtype=np.int64
+)
+
 def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calcula a distância entre dois pontos usando a fórmula de Haversine.
@@ -38,6 +50,141 @@ def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     
     return distancia
 
+def load_ceps_stream(filepath: str, chunk_size: int = 65536,
+                     validar_faixas: bool = True,
+                     validar_cep: bool = True,
+                     max_erros: int = 1000) -> Tuple[List[str], np.ndarray, Optional[int], int, List[str]]:
+    """
+    Carrega e valida o CSV de CEPs em UMA única leitura.
+    
+    As linhas são lidas com csv.reader (sem criar um dict por linha) e
+    gravadas em blocos pré-alocados de `chunk_size` linhas. A validação do
+    formato do CEP é feita linha a linha; a das faixas de coordenadas é
+    vetorizada por bloco. Todos os erros citam o número da linha no arquivo.
+    
+    Args:
+        filepath: Caminho do arquivo CSV
+        chunk_size: Número de linhas por bloco pré-alocado
+        validar_faixas: Se True, verifica as faixas de latitude/longitude
+                        definidas em Config
+        validar_cep: Se True, exige CEP com exatamente 8 dígitos
+        max_erros: Número máximo de mensagens de erro guardadas
+    
+    Returns:
+        (lista_ceps, coords, indice_unibrasil, num_linhas, erros)
+        coords é um np.ndarray (n, 2) float64 com (latitude, longitude);
+        linhas com coordenadas inválidas ficam com NaN.
+        indice_unibrasil é None se o CEP da Unibrasil não estiver no arquivo.
+    
+    Raises:
+        FileNotFoundError: Se arquivo não existir
+        ValueError: Se o cabeçalho não contiver as colunas necessárias
+    """
+    ceps = []
+    blocos = []
+    erros = []
+    total_erros = 0
+    idx_unibrasil = None
+    
+    bloco = np.empty((chunk_size, 2), dtype=np.float64)
+    linhas_bloco = np.empty(chunk_size, dtype=np.int64)
+    pos = 0
+    n = 0
+    
+    def registrar(msg: str):
+        nonlocal total_erros
+        total_erros += 1
+        if len(erros) < max_erros:
+            erros.append(msg)
+    
+    def fechar_bloco(bloco: np.ndarray, linhas: np.ndarray):
+        # Texto ilegível, 'nan' ou 'inf': NaN comparado passa nas faixas
+        invalidas = ~np.isfinite(bloco).all(axis=1)
+        for k in np.flatnonzero(invalidas):
+            registrar(f"Linha {linhas[k]}: Coordenadas inválidas")
+        bloco[invalidas] = np.nan
+        
+        if validar_faixas:
+            lat = bloco[:, 0]
+            lon = bloco[:, 1]
+            with np.errstate(invalid='ignore'):
+                lat_fora = (lat < Config.LATITUDE_MIN) | (lat > Config.LATITUDE_MAX)
+                lon_fora = (lon < Config.LONGITUDE_MIN) | (lon > Config.LONGITUDE_MAX)
+            for k in np.flatnonzero(lat_fora | lon_fora):
+                if lat_fora[k]:
+                    registrar(f"Linha {linhas[k]}: Latitude fora do range esperado: {lat[k]}")
+                if lon_fora[k]:
+                    registrar(f"Linha {linhas[k]}: Longitude fora do range esperado: {lon[k]}")
+        blocos.append(bloco)
+    
+    try:
+        f = open(filepath, 'r', encoding='utf-8', newline='')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Arquivo não encontrado: {filepath}")
+    
+    with f:
+        reader = csv.reader(f)
+        cabecalho = next(reader, None)
+        
+        if cabecalho is None:
+            raise ValueError("Arquivo CSV está vazio (sem cabeçalho)")
+        
+        cabecalho = [col.strip() for col in cabecalho]
+        colunas_faltando = [col for col in COLUNAS_CSV if col not in cabecalho]
+        if colunas_faltando:
+            raise ValueError(f"Colunas faltando: {', '.join(colunas_faltando)}. "
+                             f"Encontrado: {cabecalho}")
+        
+        i_cep, i_lat, i_lon = (cabecalho.index(col) for col in COLUNAS_CSV)
+        largura = max(i_cep, i_lat, i_lon) + 1
+        cep_base = Config.CEP_UNIBRASIL
+        
+        for row in reader:
+            if not row:
+                continue
+            
+            linha = reader.line_num
+            
+            if len(row) < largura:
+                registrar(f"Linha {linha}: Número de colunas insuficiente")
+                row = row + [''] * (largura - len(row))
+            
+            cep = row[i_cep].strip()
+            if validar_cep and (len(cep) != 8 or not cep.isdigit()):
+                registrar(f"Linha {linha}: CEP inválido '{cep}'")
+            
+            if cep == cep_base and idx_unibrasil is None:
+                idx_unibrasil = n
+            
+            try:
+                bloco[pos, 0] = float(row[i_lat])
+                bloco[pos, 1] = float(row[i_lon])
+            except ValueError:
+                bloco[pos] = np.nan    # relatado em fechar_bloco
+            
+            ceps.append(cep)
+            linhas_bloco[pos] = linha
+            pos += 1
+            n += 1
+            
+            if pos == chunk_size:
+                fechar_bloco(bloco, linhas_bloco)
+                bloco = np.empty((chunk_size, 2), dtype=np.float64)
+                pos = 0
+        
+        if pos > 0:
+            fechar_bloco(bloco[:pos], linhas_bloco[:pos])
+    
+    if total_erros > len(erros):
+        erros.append(f"... e mais {total_erros - len(erros)} erros")
+    
+    if blocos:
+        coords = blocos[0] if len(blocos) == 1 else np.concatenate(blocos)
+    else:
+        coords = np.empty((0, 2), dtype=np.float64)
+    
+    return ceps, coords, idx_unibrasil, n, erros
+
 def load_ceps_coords(filepath: str) -> Tuple[List[str], List[Tuple[float, float]], int]:
     """
     Carrega CEPs e coordenadas do arquivo CSV.
@@ -57,34 +204,13 @@ def load_ceps_coords(filepath: str) -> Tuple[List[str], List[Tuple[float, float]
         FileNotFoundError: Se arquivo não existir
         ValueError: Se CEP da Unibrasil não for encontrado
     """
-    ceps = []
-    coords = []
-    idx_unibrasil = None
-    
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            
-            # Verifica se as colunas necessárias existem
-            if not all(col in reader.fieldnames for col in ['cep', 'latitude', 'longitude']):
-                raise ValueError(f"CSV deve conter colunas: cep, latitude, longitude. "
-                               f"Encontrado: {reader.fieldnames}")
-            
-            for idx, row in enumerate(reader):
-                try:
-                    cep = row['cep'].strip()
-                    lat = float(row['latitude'])
-                    lon = float(row['longitude'])
-                    
-                    ceps.append(cep)
-                    coords.append((lat, lon))
-                    
-                    # Identifica índice da Unibrasil
-                    if cep == Config.CEP_UNIBRASIL:
-                        idx_unibrasil = idx
-                        
-                except (ValueError, KeyError) as e:
-                    raise ValueError(f"Erro ao processar linha {idx+2}: {row}. Erro: {e}")
+        ceps, coords, idx_unibrasil, _, erros = load_ceps_stream(
+            filepath, validar_faixas=False, validar_cep=False
+        )
+        
+        if erros:
+            raise ValueError(f"Erro ao processar {erros[0]}")
         
         if not ceps:
             raise ValueError("Arquivo CSV está vazio ou não contém dados válidos")
@@ -92,33 +218,214 @@ def load_ceps_coords(filepath: str) -> Tuple[List[str], List[Tuple[float, float]
         if idx_unibrasil is None:
             raise ValueError(f"CEP da Unibrasil ({Config.CEP_UNIBRASIL}) não encontrado no arquivo!")
         
-        return ceps, coords, idx_unibrasil
+        return ceps, [tuple(c) for c in coords.tolist()], idx_unibrasil
         
     except FileNotFoundError:
-        raise FileNotFoundError(f"Arquivo não encontrado: {filepath}")
+        raise
     except Exception as e:
         raise Exception(f"Erro ao carregar arquivo {filepath}: {e}")
 
-def generate_distance_matrix(coords: List[Tuple[float, float]]) -> List[List[float]]:
+def _haversine_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Haversine vetorizada (entradas em radianos, com broadcasting), em km"""
+    R = 6371.0
+    a = (np.sin((lat2 - lat1) / 2)**2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2)
+    return 2 * R * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+def _bearing_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Bearing vetorizado (entradas em radianos, com broadcasting), em graus 0-360"""
+    dlon = lon2 - lon1
+    x = np.sin(dlon) * np.cos(lat2)
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return (np.degrees(np.arctan2(x, y)) + 360) % 360
+
+def _haversine_matrix(coords) -> np.ndarray:
+    """
+    Matriz de distâncias Haversine vetorizada (mesma fórmula de haversine).
+    
+    Args:
+        coords: Sequência ou array (n, 2) de (latitude, longitude)
+    
+    Returns:
+        np.ndarray (n, n) com distâncias em km
+    """
+    pts = np.radians(np.asarray(coords, dtype=np.float64).reshape(-1, 2))
+    lat = pts[:, 0]
+    lon = pts[:, 1]
+    
+    matrix = _haversine_np(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    np.fill_diagonal(matrix, 0.0)
+    
+    # Garante simetria exata (matrix[i][j] == matrix[j][i])
+    return np.triu(matrix) + np.triu(matrix, 1).T
+
+# ===========================
+# PROJEÇÃO PLANAR LOCAL
+# ===========================
+
+def projetar_coords(coords, origem: Optional[Tuple[float, float]] = None) -> np.ndarray:
+    """
+    Projeta coordenadas em um plano local equirretangular (km).
+    
+    Para pontos a algumas dezenas de km da origem (caso de Curitiba), o
+    erro em relação à Haversine fica bem abaixo de 0,1%.
+    
+    Args:
+        coords: Coordenadas (n, 2) de (latitude, longitude)
+        origem: (lat, lon) da origem do plano (default: centro dos pontos)
+    
+    Returns:
+        np.ndarray (n, 2) com (x, y) em km; x para Leste, y para Norte
+    """
+    R = 6371.0
+    pts = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    
+    if origem is None:
+        lat0 = float(pts[:, 0].mean()) if len(pts) else 0.0
+        lon0 = float(pts[:, 1].mean()) if len(pts) else 0.0
+    else:
+        lat0, lon0 = origem
+    
+    xy = np.empty_like(pts)
+    xy[:, 0] = np.radians(pts[:, 1] - lon0) * R * math.cos(math.radians(lat0))
+    xy[:, 1] = np.radians(pts[:, 0] - lat0) * R
+    
+    return xy
+
+def _planar_matrix(xy: np.ndarray) -> np.ndarray:
+    """Matriz de distâncias euclidianas (km) entre pontos projetados"""
+    dx = xy[None, :, 0] - xy[:, None, 0]
+    dy = xy[None, :, 1] - xy[:, None, 1]
+    return np.hypot(dx, dy)
+
+def _planar_bearing_matrix(xy: np.ndarray) -> np.ndarray:
+    """Matriz de direções (graus 0-360, 0=Norte) entre pontos projetados"""
+    dx = xy[None, :, 0] - xy[:, None, 0]
+    dy = xy[None, :, 1] - xy[:, None, 1]
+    return (np.degrees(np.arctan2(dx, dy)) + 360) % 360
+
+def avaliar_erro_projecao(coords, max_pares: int = 200_000, seed: int = 0) -> Dict[str, float]:
+    """
+    Mede o erro da projeção planar contra haversine e bearing.
+    
+    Para instâncias grandes, avalia uma amostra aleatória de `max_pares` pares.
+    O erro de direção só considera pares a mais de 100 m, onde o bearing
+    é bem definido.
+    
+    Args:
+        coords: Coordenadas (n, 2) de (latitude, longitude)
+        max_pares: Número máximo de pares avaliados
+        seed: Seed da amostragem
+    
+    Returns:
+        Dicionário com:
+        {
+            'pares': número de pares avaliados,
+            'dist_max_km': maior erro absoluto de distância,
+            'dist_max_rel': maior erro relativo de distância,
+            'bearing_max_graus': maior erro de direção
+        }
+    """
+    pts = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    n = len(pts)
+    
+    if n * (n - 1) // 2 <= max_pares:
+        i, j = np.triu_indices(n, 1)
+    else:
+        rng = np.random.default_rng(seed)
+        i = rng.integers(0, n, max_pares)
+        j = rng.integers(0, n, max_pares)
+        mantem = i != j
+        i, j = i[mantem], j[mantem]
+    
+    xy = projetar_coords(pts)
+    rad = np.radians(pts)
+    
+    d_ref = _haversine_np(rad[i, 0], rad[i, 1], rad[j, 0], rad[j, 1])
+    b_ref = _bearing_np(rad[i, 0], rad[i, 1], rad[j, 0], rad[j, 1])
+    
+    dx = xy[j, 0] - xy[i, 0]
+    dy = xy[j, 1] - xy[i, 1]
+    d_plan = np.hypot(dx, dy)
+    b_plan = (np.degrees(np.arctan2(dx, dy)) + 360) % 360
+    
+    erro_d = np.abs(d_plan - d_ref)
+    erro_b = np.abs(b_plan - b_ref)
+    erro_b = np.minimum(erro_b, 360 - erro_b)
+    validos = d_ref > 0.1
+    
+    return {
+        'pares': int(len(i)),
+        'dist_max_km': float(erro_d.max()) if len(i) else 0.0,
+        'dist_max_rel': float((erro_d[d_ref > 0] / d_ref[d_ref > 0]).max()) if (d_ref > 0).any() else 0.0,
+        'bearing_max_graus': float(erro_b[validos].max()) if validos.any() else 0.0,
+    }
+
+def generate_distance_matrix(coords: List[Tuple[float, float]],
+                             planar: bool = False) -> List[List[float]]:
     """
     Gera matriz de distâncias entre todos os pontos usando Haversine.
     
     Args:
-        coords: Lista de tuplas (latitude, longitude)
+        coords: Lista de tuplas (latitude, longitude) ou array (n, 2)
+        planar: Se True, usa a projeção planar local (ver projetar_coords)
     
     Returns:
         Matriz NxN onde matrix[i][j] = distância entre ponto i e j em km
     """
-    n = len(coords)
-    matrix = [[0.0 for _ in range(n)] for _ in range(n)]
+    if planar:
+        return _planar_matrix(projetar_coords(coords)).tolist()
+    return _haversine_matrix(coords).tolist()
+
+def generate_bearing_matrix(coords, planar: bool = False) -> np.ndarray:
+    """
+    Gera matriz de direções (bearing) entre todos os pontos.
     
-    for i in range(n):
-        for j in range(i + 1, n):
-            dist = haversine(coords[i][0], coords[i][1], coords[j][0], coords[j][1])
-            matrix[i][j] = dist
-            matrix[j][i] = dist  # Matriz simétrica
+    Mesma fórmula de physics.bearing, vetorizada.
+    
+    Args:
+        coords: Lista de tuplas (latitude, longitude) ou array (n, 2)
+        planar: Se True, usa a projeção planar local (ver projetar_coords)
+    
+    Returns:
+        np.ndarray (n, n) onde matrix[i][j] = direção de i para j em graus (0-360)
+    """
+    if planar:
+        return _planar_bearing_matrix(projetar_coords(coords))
     
-    return matrix
+    pts = np.radians(np.asarray(coords, dtype=np.float64).reshape(-1, 2))
+    lat = pts[:, 0]
+    lon = pts[:, 1]
+    
+    return _bearing_np(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+def build_knn_lists(dist_matrix, k: int = None) -> np.ndarray:
+    """
+    Listas de k vizinhos mais próximos de cada ponto.
+    
+    Args:
+        dist_matrix: Matriz de distâncias NxN (lista ou array)
+        k: Número de vizinhos (default: Config.KNN_VIZINHOS)
+    
+    Returns:
+        np.ndarray (n, k) int32; linha i contém os vizinhos de i ordenados
+        por distância crescente (sem o próprio i)
+    """
+    if k is None:
+        k = Config.KNN_VIZINHOS
+    
+    dist = np.array(dist_matrix, dtype=np.float64)
+    n = len(dist)
+    k = max(0, min(k, n - 1))
+    
+    if k == 0:
+        return np.empty((n, 0), dtype=np.int32)
+    
+    np.fill_diagonal(dist, np.inf)
+    candidatos = np.argpartition(dist, k - 1, axis=1)[:, :k]
+    ordem = np.argsort(np.take_along_axis(dist, candidatos, axis=1), axis=1, kind='stable')
+    
+    return np.take_along_axis(candidatos, ordem, axis=1).astype(np.int32)
 
 def build_wind_cache(wind_schedule: Optional[Dict] = None) -> Dict[Tuple[int, int], Tuple[float, float]]:
     """
@@ -148,8 +455,8 @@ def build_wind_cache(wind_schedule: Optional[Dict] = None) -> Dict[Tuple[int, in
     
     if wind_schedule is None:
         # Sem vento (simplificação para testes)
-        for dia in range(1, 8):  # 7 dias
-            for hora in [6, 9, 12, 15, 18]:
+        for dia in range(1, Config.PRAZO_DIAS + 1):  # 7 dias
+            for hora in Config.SLOTS_VENTO:
                 cache[(dia, hora)] = (0.0, 0.0)
         return cache
     
@@ -170,16 +477,81 @@ def build_wind_cache(wind_schedule: Optional[Dict] = None) -> Dict[Tuple[int, in
         print(f"   Usando vento zero para todas as horas.")
         
         # Fallback: sem vento
-        for dia in range(1, 8):
-            for hora in [6, 9, 12, 15, 18]:
+        for dia in range(1, Config.PRAZO_DIAS + 1):
+            for hora in Config.SLOTS_VENTO:
                 cache[(dia, hora)] = (0.0, 0.0)
     
     return cache
 
+def build_wind_tensor(wind_schedule: Optional[Dict] = None) -> np.ndarray:
+    """
+    Constrói a previsão de ventos como array (7, 5, 2).
+    
+    Eixos: dia (0 = dia 1) × janela de Config.SLOTS_VENTO × (velocidade_kmh, direcao_graus).
+    Entradas ausentes ficam com vento zero.
+    
+    Args:
+        wind_schedule: Dicionário com previsão de ventos (opcional)
+    
+    Returns:
+        np.ndarray (7, 5, 2) float64
+    """
+    tensor = np.zeros((Config.PRAZO_DIAS, len(Config.SLOTS_VENTO), 2), dtype=np.float64)
+    
+    for (dia, hora), (velocidade, direcao) in build_wind_cache(wind_schedule).items():
+        if 1 <= dia <= Config.PRAZO_DIAS and hora in Config.SLOTS_VENTO:
+            tensor[dia - 1, Config.SLOTS_VENTO.index(hora)] = (velocidade, direcao)
+    
+    return tensor
+
+def build_wind_table_interpolada(tensor: np.ndarray) -> np.ndarray:
+    """
+    Tabela de ventos por segundo do dia, interpolada entre as janelas.
+    
+    A velocidade é interpolada linearmente entre os horários de início das
+    janelas (Config.SLOTS_VENTO) e a direção pelo menor arco. Antes da
+    primeira e depois da última janela o valor é mantido constante.
+    
+    Args:
+        tensor: Array (7, 5, 2) de build_wind_tensor
+    
+    Returns:
+        np.ndarray (7, 86400, 2) float64 indexado por [dia - 1, segundo do dia]
+    """
+    horas_seg = np.array(Config.SLOTS_VENTO, dtype=np.float64) * 3600
+    segundos = np.arange(SEGUNDOS_DIA, dtype=np.float64)
+    tabela = np.empty((tensor.shape[0], SEGUNDOS_DIA, 2), dtype=np.float64)
+    
+    for dia in range(tensor.shape[0]):
+        direcoes = np.degrees(np.unwrap(np.radians(tensor[dia, :, 1])))
+        tabela[dia, :, 0] = np.interp(segundos, horas_seg, tensor[dia, :, 0])
+        tabela[dia, :, 1] = np.interp(segundos, horas_seg, direcoes) % 360
+    
+    return tabela
+
+def wind_tensor_to_schedule(tensor: np.ndarray) -> Dict:
+    """
+    Converte o array de ventos de volta ao formato do ventos.json.
+    
+    Usado para os gráficos quando a instância vem de um pacote binário.
+    """
+    return {
+        str(dia + 1): {
+            str(hora): {
+                'velocidade_kmh': float(tensor[dia, s, 0]),
+                'direcao_graus': float(tensor[dia, s, 1])
+            }
+            for s, hora in enumerate(Config.SLOTS_VENTO)
+        }
+        for dia in range(tensor.shape[0])
+    }
+
 def validar_arquivo_csv(filepath: str) -> Dict[str, any]:
     """
     Valida o arquivo CSV antes de processar.
     
+    Usa a mesma leitura única de load_ceps_stream.
+    
     Args:
         filepath: Caminho do arquivo
     
@@ -200,65 +572,268 @@ def validar_arquivo_csv(filepath: str) -> Dict[str, any]:
     }
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            
-            # Valida cabeçalho
-            colunas_necessarias = ['cep', 'latitude', 'longitude']
-            colunas_faltando = [col for col in colunas_necessarias if col not in reader.fieldnames]
-            
-            if colunas_faltando:
-                resultado['valido'] = False
-                resultado['erros'].append(f"Colunas faltando: {', '.join(colunas_faltando)}")
-                return resultado
-            
-            # Valida linhas
-            for idx, row in enumerate(reader):
-                resultado['num_linhas'] += 1
-                
-                # Valida CEP
-                cep = row['cep'].strip()
-                if not cep or not cep.isdigit() or len(cep) != 8:
-                    resultado['erros'].append(f"Linha {idx+2}: CEP inválido '{cep}'")
-                
-                if cep == Config.CEP_UNIBRASIL:
-                    resultado['tem_unibrasil'] = True
-                
-                # Valida coordenadas
-                try:
-                    lat = float(row['latitude'])
-                    lon = float(row['longitude'])
-                    
-                    # Valida range (Curitiba aproximadamente)
-                    if not (-26.0 <= lat <= -25.0):
-                        resultado['erros'].append(f"Linha {idx+2}: Latitude fora do range esperado: {lat}")
-                    
-                    if not (-49.5 <= lon <= -49.0):
-                        resultado['erros'].append(f"Linha {idx+2}: Longitude fora do range esperado: {lon}")
-                        
-                except ValueError:
-                    resultado['erros'].append(f"Linha {idx+2}: Coordenadas inválidas")
-            
-            if resultado['num_linhas'] == 0:
-                resultado['valido'] = False
-                resultado['erros'].append("Arquivo vazio (sem dados)")
-            
-            if not resultado['tem_unibrasil']:
-                resultado['valido'] = False
-                resultado['erros'].append(f"CEP da Unibrasil ({Config.CEP_UNIBRASIL}) não encontrado")
-            
-            if len(resultado['erros']) > 0:
-                resultado['valido'] = False
+        _, _, idx_unibrasil, num_linhas, erros = load_ceps_stream(filepath)
+        
+        resultado['num_linhas'] = num_linhas
+        resultado['tem_unibrasil'] = idx_unibrasil is not None
+        resultado['erros'].extend(erros)
+        
+        if num_linhas == 0:
+            resultado['erros'].append("Arquivo vazio (sem dados)")
+        
+        if not resultado['tem_unibrasil']:
+            resultado['erros'].append(f"CEP da Unibrasil ({Config.CEP_UNIBRASIL}) não encontrado")
+        
+        if len(resultado['erros']) > 0:
+            resultado['valido'] = False
     
     except FileNotFoundError:
         resultado['valido'] = False
         resultado['erros'].append(f"Arquivo não encontrado: {filepath}")
+    except ValueError as e:
+        resultado['valido'] = False
+        resultado['erros'].append(str(e))
     except Exception as e:
         resultado['valido'] = False
         resultado['erros'].append(f"Erro ao ler arquivo: {e}")
     
     return resultado
 
+# ===========================
+# AGRUPAMENTO DE CEPs PRÓXIMOS
+# ===========================
+
+def agrupar_ceps_proximos(coords, idx_base: int, raio_m: float) -> Tuple[List[List[int]], int]:
+    """
+    Agrupa CEPs coincidentes ou quase coincidentes em super-nós.
+    
+    Agrupamento guloso por líder: percorre os pontos (base primeiro) e cada
+    ponto ainda livre vira líder de um grupo com todos os pontos livres a
+    até `raio_m` metros dele. A busca usa uma grade de células de lado
+    `raio_m` sobre a projeção equirretangular local, então custa O(n).
+    
+    Args:
+        coords: Coordenadas (n, 2) de (latitude, longitude)
+        idx_base: Índice da Unibrasil (sempre líder do próprio grupo)
+        raio_m: Raio de agrupamento em metros
+    
+    Returns:
+        (grupos, grupo_base)
+        grupos[g] lista os índices originais do grupo g; o primeiro é o
+        líder e os demais seguem a ordem de visita (vizinho mais próximo).
+        grupo_base é o índice do grupo que contém a base.
+    """
+    pts = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    n = len(pts)
+    
+    if raio_m <= 0 or n == 0:
+        grupos = [[i] for i in range(n)]
+        return grupos, idx_base
+    
+    # Projeção local em metros
+    lat0 = math.radians(float(pts[:, 0].mean()))
+    y = pts[:, 0] * 111_320.0
+    x = pts[:, 1] * 111_320.0 * math.cos(lat0)
+    
+    celulas = {}
+    cx = np.floor(x / raio_m).astype(np.int64)
+    cy = np.floor(y / raio_m).astype(np.int64)
+    for i in range(n):
+        celulas.setdefault((cx[i], cy[i]), []).append(i)
+    
+    raio2 = raio_m * raio_m
+    grupo_de = np.full(n, -1, dtype=np.int64)
+    grupos = []
+    
+    ordem = [idx_base] + [i for i in range(n) if i != idx_base]
+    for lider in ordem:
+        if grupo_de[lider] >= 0:
+            continue
+        
+        g = len(grupos)
+        grupo_de[lider] = g
+        membros = []
+        
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in celulas.get((cx[lider] + dx, cy[lider] + dy), ()):
+                    if grupo_de[j] < 0 and (x[j] - x[lider])**2 + (y[j] - y[lider])**2 <= raio2:
+                        grupo_de[j] = g
+                        membros.append(j)
+        
+        # Ordem de visita dentro do grupo: vizinho mais próximo a partir do líder
+        grupo = [lider]
+        while membros:
+            atual = grupo[-1]
+            k = min(range(len(membros)),
+                    key=lambda m: (x[membros[m]] - x[atual])**2 + (y[membros[m]] - y[atual])**2)
+            grupo.append(membros.pop(k))
+        
+        grupos.append(grupo)
+    
+    return grupos, int(grupo_de[idx_base])
+
+def reduzir_instancia(ceps: List[str], coords, dist_matrix: List[List[float]],
+                      idx_base: int, raio_m: float) -> Dict:
+    """
+    Gera a instância reduzida (um nó por grupo de CEPs próximos).
+    
+    Cada super-nó usa o CEP e as coordenadas do líder do grupo, e a matriz
+    reduzida é a submatriz de `dist_matrix` entre os líderes.
+    
+    Returns:
+        Dicionário com:
+        - 'ceps', 'coords', 'dist_matrix', 'idx_base': instância reduzida
+        - 'grupos': grupos de índices originais (ver agrupar_ceps_proximos)
+    """
+    grupos, grupo_base = agrupar_ceps_proximos(coords, idx_base, raio_m)
+    lideres = [g[0] for g in grupos]
+    
+    return {
+        'ceps': [ceps[i] for i in lideres],
+        'coords': [tuple(coords[i]) for i in lideres],
+        'dist_matrix': [[dist_matrix[i][j] for j in lideres] for i in lideres],
+        'idx_base': grupo_base,
+        'grupos': grupos,
+    }
+
+def expandir_cromossomo(cromossomo: Dict, grupos: List[List[int]]) -> Dict:
+    """
+    Expande um cromossomo da instância reduzida para os CEPs originais.
+    
+    Cada super-nó é substituído pelos seus CEPs na ordem do grupo, com um
+    trecho (e uma parada de Config.TEMPO_PARADA_SEG na simulação) por CEP.
+    Os trechos internos do grupo usam a velocidade do trecho de chegada.
+    Os demais CEPs do grupo da base são visitados logo após a partida.
+    
+    Args:
+        cromossomo: {"rota": [...], "velocidades": [...]} na instância reduzida
+        grupos: Grupos retornados por agrupar_ceps_proximos
+    
+    Returns:
+        Cromossomo equivalente sobre os índices originais
+    """
+    rota_r = cromossomo["rota"]
+    vel_r = cromossomo["velocidades"]
+    
+    grupo_base = grupos[rota_r[0]]
+    rota = [grupo_base[0]]
+    velocidades = []
+    
+    for membro in grupo_base[1:]:
+        rota.append(membro)
+        velocidades.append(vel_r[0])
+    
+    for k in range(1, len(rota_r) - 1):
+        for membro in grupos[rota_r[k]]:
+            rota.append(membro)
+            velocidades.append(vel_r[k - 1])
+    
+    rota.append(grupo_base[0])
+    velocidades.append(vel_r[-1])
+    
+    return {"rota": rota, "velocidades": velocidades}
+
+# ===========================
+# PACOTE BINÁRIO DA INSTÂNCIA
+# ===========================
+
+def salvar_instancia(filepath: str, ceps: List[str], coords, idx_unibrasil: int,
+                     wind_schedule: Optional[Dict] = None, dist_matrix=None,
+                     k: int = None, planar: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Grava a instância pré-processada em um único arquivo .npz.
+    
+    Conteúdo: CEPs, coordenadas, índice da base, matrizes de distância e
+    direção, listas k-NN, o array de ventos (7, 5, 2) e se a instância é
+    planar. O arquivo não é
+    comprimido, para que cada array seja lido direto do disco.
+    
+    Args:
+        filepath: Caminho do arquivo de saída (.npz)
+        ceps: Lista de CEPs
+        coords: Coordenadas (n, 2)
+        idx_unibrasil: Índice da base
+        wind_schedule: Previsão de ventos (opcional)
+        dist_matrix: Matriz de distâncias já calculada (opcional)
+        k: Número de vizinhos nas listas k-NN (default: Config.KNN_VIZINHOS)
+        planar: Se True, distâncias e direções vêm da projeção planar local
+    
+    Returns:
+        Dicionário com os arrays gravados
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    
+    if dist_matrix is None:
+        dist = _planar_matrix(projetar_coords(coords)) if planar else _haversine_matrix(coords)
+    else:
+        dist = np.asarray(dist_matrix, dtype=np.float64)
+    
+    dados = {
+        'ceps': np.asarray(ceps, dtype=str),
+        'coords': coords,
+        'idx_unibrasil': np.int64(idx_unibrasil),
+        'dist_matrix': dist,
+        'bearing_matrix': generate_bearing_matrix(coords, planar),
+        'knn': build_knn_lists(dist, k),
+        'wind_tensor': build_wind_tensor(wind_schedule),
+        'tem_vento': np.bool_(wind_schedule is not None),
+        'planar': np.bool_(planar),
+    }
+    
+    with open(filepath, 'wb') as f:
+        np.savez(f, **dados)
+    
+    return dados
+
+def carregar_instancia(filepath: str) -> Dict:
+    """
+    Lê um pacote gerado por salvar_instancia.
+    
+    Args:
+        filepath: Caminho do arquivo .npz
+    
+    Returns:
+        Dicionário com:
+        - 'ceps': List[str]
+        - 'coords', 'dist_matrix', 'bearing_matrix', 'knn', 'wind_tensor': np.ndarray
+        - 'idx_unibrasil': int
+        - 'planar': bool, se distâncias e direções são da projeção planar
+        - 'wind_schedule': Dict no formato do ventos.json, ou None sem vento
+        - 'wind_cache': cache {(dia, hora): (velocidade, direcao)}
+    
+    Raises:
+        FileNotFoundError: Se arquivo não existir
+        ValueError: Se faltar algum array no pacote
+    """
+    chaves = ['ceps', 'coords', 'idx_unibrasil', 'dist_matrix',
+              'bearing_matrix', 'knn', 'wind_tensor', 'tem_vento', 'planar']
+    
+    try:
+        pacote = np.load(filepath, allow_pickle=False)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Arquivo não encontrado: {filepath}")
+    
+    with pacote:
+        faltando = [c for c in chaves if c not in pacote.files]
+        if faltando:
+            raise ValueError(f"Pacote de instância incompleto, faltando: {', '.join(faltando)}")
+        
+        dados = {c: pacote[c] for c in chaves}
+    
+    dados['ceps'] = dados['ceps'].tolist()
+    dados['idx_unibrasil'] = int(dados['idx_unibrasil'])
+    dados['planar'] = bool(dados['planar'])
+    
+    wind_schedule = None
+    if bool(dados.pop('tem_vento')):
+        wind_schedule = wind_tensor_to_schedule(dados['wind_tensor'])
+    
+    dados['wind_schedule'] = wind_schedule
+    dados['wind_cache'] = build_wind_cache(wind_schedule)
+    
+    return dados
+
 # ===========================
 # FUNÇÕES AUXILIARES
 # ===========================
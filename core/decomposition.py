@@ -0,0 +1,337 @@
+"""
+DECOMPOSIÇÃO GEOGRÁFICA: RESOLVER POR CLUSTER E COSTURAR
+
+Para instâncias de milhares de CEPs, um AG sobre todas as paradas escala
+mal (espaço de permutações e custo de cada avaliação crescem com n).
+Aqui a instância é dividida em clusters geográficos e:
+
+  1. cada cluster vira um subproblema resolvido por evolve_optimized
+     (em paralelo, um processo por cluster);
+  2. a ordem de visita dos clusters é um TSP pequeno sobre os centroides
+     (inserção mais distante + 2-opt);
+  3. cada sub-tour (um ciclo) é aberto na aresta que melhor liga o
+     cluster anterior ao seguinte, e os caminhos são concatenados;
+  4. as emendas são reparadas com 2-opt e Or-opt por listas de vizinhos
+     na instância inteira.
+
+As velocidades de cada parada vêm do seu subproblema (trecho de saída);
+velocidades por DP e recargas por split são refeitas na rota costurada.
+"""
+
+import io
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from typing import Dict, List, Tuple
+import numpy as np
+from config import Config
+from data_loader import projetar_coords
+from simulation import calcular_fitness
+from local_search import (preparar_vizinhos, two_opt_vizinhanca, or_opt_vizinhanca, distancia_rota,
+                          busca_profunda)
+from construction import insercao
+from genetic_algorithm import evolve_optimized
+from speed_optimizer import otimizar_velocidades, polir_velocidades
+from recharge_split import otimizar_recargas
+
+
+def particionar(coords: List[Tuple[float, float]], k: int, metodo: str = None,
+                iteracoes: int = 25) -> List[np.ndarray]:
+    """
+    Divide as paradas em até `k` clusters geográficos
+
+    metodo: "kmeans" (Lloyd com sementes k-means++, sobre a projeção
+    planar) ou "grade" (faixas em x com o mesmo número de pontos, cada uma
+    cortada em y em células do mesmo tamanho); default:
+    Config.DECOMPOSICAO_METODO
+
+    Returns:
+        Lista de arrays com os índices de cada cluster (sem clusters vazios)
+    """
+    if metodo is None:
+        metodo = Config.DECOMPOSICAO_METODO
+    xy = projetar_coords(coords)
+    n = len(xy)
+    k = max(1, min(k, n))
+
+    if metodo == "grade":
+        faixas = math.ceil(math.sqrt(k))
+        por_faixa = math.ceil(k / faixas)
+        clusters = []
+        for faixa in np.array_split(np.argsort(xy[:, 0], kind='stable'), faixas):
+            ordem = faixa[np.argsort(xy[faixa, 1], kind='stable')]
+            clusters.extend(c for c in np.array_split(ordem, por_faixa) if len(c))
+        return clusters
+
+    # k-means++: cada semente sorteada com probabilidade ∝ d² à mais próxima
+    rng = np.random.default_rng(random.getrandbits(64))
+    centros = [xy[rng.integers(n)]]
+    d2 = ((xy - centros[0]) ** 2).sum(axis=1)
+    for _ in range(k - 1):
+        total = d2.sum()
+        i = rng.choice(n, p=d2 / total) if total > 0 else rng.integers(n)
+        centros.append(xy[i])
+        d2 = np.minimum(d2, ((xy - xy[i]) ** 2).sum(axis=1))
+    centros = np.array(centros)
+
+    rotulo = None
+    for _ in range(iteracoes):
+        novo = np.argmin(((xy[:, None, :] - centros[None, :, :]) ** 2).sum(axis=2), axis=1)
+        if rotulo is not None and np.array_equal(novo, rotulo):
+            break
+        rotulo = novo
+        contagem = np.bincount(rotulo, minlength=k)
+        soma = np.zeros_like(centros)
+        np.add.at(soma, rotulo, xy)
+        ocupados = contagem > 0
+        centros[ocupados] = soma[ocupados] / contagem[ocupados, None]
+
+    return [c for c in (np.flatnonzero(rotulo == j) for j in range(k)) if len(c)]
+
+
+def ordenar_clusters(centros: np.ndarray, cluster_base: int) -> List[int]:
+    """Ordem de visita dos clusters: TSP sobre os centroides, começando no da base"""
+    k = len(centros)
+    if k <= 2:
+        return [cluster_base] + [c for c in range(k) if c != cluster_base]
+    dist = np.sqrt(((centros[:, None, :] - centros[None, :, :]) ** 2).sum(axis=2))
+    rota = insercao(dist, cluster_base, "mais_distante")
+    lista = dist.tolist()
+    vizinhos = preparar_vizinhos(lista, k=min(10, k - 1))
+    rota = or_opt_vizinhanca(two_opt_vizinhanca(rota, lista, vizinhos), lista, vizinhos)
+    return rota[:-1]
+
+
+def _resolver_cluster(membros: List[int], ceps: List[str], coords: List[Tuple[float, float]],
+                      dist_sub: List[List[float]], base_local: int, wind_cache,
+                      pop_size: int, generations: int, semente: int,
+                      opcoes_ag: Dict) -> Tuple[List[int], List[int], Dict]:
+    """
+    Resolve o subproblema de um cluster (executado nos processos auxiliares)
+
+    opcoes_ag: argumentos extras de evolve_optimized (crossover, adaptativo...)
+
+    Returns:
+        (ciclo em índices globais, velocidade de saída de cada parada do
+        ciclo, histórico do AG ou None para clusters triviais)
+    """
+    random.seed(semente)
+    np.random.seed(semente % 2**32)
+
+    m = len(membros)
+    if m <= 3:
+        # Qualquer ordem é ótima: só as velocidades
+        rota = list(range(m)) + [0]
+        return membros, otimizar_velocidades(rota, dist_sub), None
+
+    with redirect_stdout(io.StringIO()):
+        melhor, _, historico = evolve_optimized(
+            ceps, coords, dist_sub, base_local, wind_cache, pop_size, generations,
+            verbose=False, tempo_busca_profunda=0.0, velocidades_dp="off",
+            recargas_otimas="off", **opcoes_ag)
+    rota, velocidades = melhor["rota"], melhor["velocidades"]
+    return [membros[i] for i in rota[:-1]], velocidades, historico
+
+
+def _abrir_ciclo(ciclo: List[int], dist_matrix: List[List[float]], xy: np.ndarray,
+                 entrada_ref, saida_ref) -> List[int]:
+    """
+    Abre o ciclo de um cluster em um caminho
+
+    Escolhe a aresta cortada e o sentido minimizando
+        custo(entrada) - d(aresta cortada) + custo(saída)
+    onde entrada_ref/saida_ref são um índice de parada (distância real)
+    ou um ponto (x, y) projetado (distância euclidiana, em km).
+    """
+    c = np.asarray(ciclo)
+    if len(c) == 1:
+        return list(ciclo)
+    anterior, seguinte = np.roll(c, 1), np.roll(c, -1)
+
+    def custo_ref(ref, nos):
+        if isinstance(ref, (int, np.integer)):
+            return np.asarray(dist_matrix[ref])[nos]
+        return np.sqrt(((xy[nos] - ref) ** 2).sum(axis=1))
+
+    corte_ant = np.array([dist_matrix[a][b] for a, b in zip(anterior, c)])
+    corte_seg = np.array([dist_matrix[a][b] for a, b in zip(c, seguinte)])
+    entrada = custo_ref(entrada_ref, c)
+    adiante = entrada - corte_ant + custo_ref(saida_ref, anterior)
+    atras = entrada - corte_seg + custo_ref(saida_ref, seguinte)
+
+    i = int(np.argmin(np.minimum(adiante, atras)))
+    lista = list(ciclo)
+    if adiante[i] <= atras[i]:
+        return lista[i:] + lista[:i]
+    return lista[i::-1] + lista[:i:-1]
+
+
+def costurar(ciclos: List[List[int]], ordem: List[int], dist_matrix: List[List[float]],
+             xy: np.ndarray, centros: np.ndarray) -> List[int]:
+    """
+    Concatena os sub-tours na ordem dos clusters, abrindo cada ciclo
+
+    O primeiro cluster usa os centroides vizinhos como referência nas
+    duas pontas; os seguintes entram pela última parada já costurada e
+    miram o centroide do próximo; o último mira a entrada do primeiro.
+
+    Returns:
+        Tour (sem repetir a primeira parada no fim)
+    """
+    k = len(ordem)
+    if k == 1:
+        return list(ciclos[ordem[0]])
+    tour = _abrir_ciclo(ciclos[ordem[0]], dist_matrix, xy, centros[ordem[-1]], centros[ordem[1]])
+    for p in range(1, k):
+        saida = centros[ordem[p + 1]] if p + 1 < k else tour[0]
+        tour.extend(_abrir_ciclo(ciclos[ordem[p]], dist_matrix, xy, tour[-1], saida))
+    return tour
+
+
+def resolver_decomposto(ceps: List[str], coords: List[Tuple[float, float]],
+                        dist_matrix: List[List[float]], idx_base: int, wind_cache,
+                        pop_size: int, generations: int, tamanho_cluster: int = None,
+                        metodo: str = None, processos: int = None, verbose: bool = True,
+                        velocidades_dp: str = None, recargas_otimas: str = None,
+                        tempo_busca_profunda: float = None, vizinhos=None, direcoes=None,
+                        **opcoes_ag):
+    """
+    Resolve a instância por clusters em paralelo e costura as soluções
+
+    tamanho_cluster: CEPs por cluster (define k = ceil(n / tamanho));
+    default: Config.DECOMPOSICAO_TAMANHO_CLUSTER
+    metodo: partição ("kmeans" ou "grade"; ver particionar)
+    processos: processos em paralelo; 1 = no processo atual; default:
+    Config.DECOMPOSICAO_PROCESSOS (0 = todos os núcleos)
+    velocidades_dp, recargas_otimas: como em evolve_optimized, aplicados
+    à rota costurada ("decoder"/"fitness" valem como "final")
+    tempo_busca_profunda: LK + Or-opt na rota costurada, depois do reparo
+    (default: Config.DEEP_SEARCH_TEMPO_SEG; os clusters não usam)
+    vizinhos: listas k-NN da instância inteira, para o reparo das emendas
+    (default: calculadas da matriz)
+    direcoes: matriz de direções dos trechos (cada cluster recebe a sua
+    submatriz; ver simulation.simular_rapido)
+    opcoes_ag: repassadas a evolve_optimized em cada subproblema
+    (crossover, adaptativo, fracao_construtiva; com tolerancia_gap, cada
+    cluster para pelo gap do próprio subproblema)
+
+    Returns:
+        (melhor, melhor_fit, historico) como evolve_optimized; o histórico
+        soma as estatísticas dos subproblemas por geração e traz
+        historico['clusters'] (tamanho e fitness de cada cluster)
+    """
+    if tamanho_cluster is None:
+        tamanho_cluster = Config.DECOMPOSICAO_TAMANHO_CLUSTER
+    if processos is None:
+        processos = Config.DECOMPOSICAO_PROCESSOS
+    if processos <= 0:
+        processos = os.cpu_count() or 1
+    if velocidades_dp is None:
+        velocidades_dp = Config.VELOCIDADES_DP
+    if recargas_otimas is None:
+        recargas_otimas = Config.SPLIT_RECARGAS
+    if tempo_busca_profunda is None:
+        tempo_busca_profunda = Config.DEEP_SEARCH_TEMPO_SEG
+    avaliacao_dupla = opcoes_ag.get('avaliacao_dupla')
+    if avaliacao_dupla is None:
+        avaliacao_dupla = Config.AVALIACAO_DUPLA
+    fisica = True if avaliacao_dupla and Config.USE_FAST_FITNESS else None   # etapa final
+
+    n = len(ceps)
+    xy = projetar_coords(coords)
+    clusters = particionar(coords, math.ceil(n / tamanho_cluster), metodo)
+    centros = np.array([xy[c].mean(axis=0) for c in clusters])
+    cluster_base = next(j for j, c in enumerate(clusters) if idx_base in c)
+
+    if verbose:
+        tamanhos = [len(c) for c in clusters]
+        print(f"\n🧩 DECOMPOSIÇÃO: {len(clusters)} clusters "
+              f"({min(tamanhos)}-{max(tamanhos)} CEPs), {min(processos, len(clusters))} processo(s)")
+
+    # Subproblemas: a base local é a própria base ou a parada mais central
+    tarefas = []
+    for j, membros in enumerate(clusters):
+        membros = membros.tolist()
+        if j == cluster_base:
+            base_local = membros.index(idx_base)
+        else:
+            base_local = int(np.argmin(((xy[membros] - centros[j]) ** 2).sum(axis=1)))
+        sub = np.asarray([dist_matrix[i] for i in membros])[:, membros].tolist()
+        sub_direcoes = (None if direcoes is None
+                        else np.asarray([direcoes[i] for i in membros])[:, membros].tolist())
+        tarefas.append((membros, [ceps[i] for i in membros], [tuple(coords[i]) for i in membros],
+                        sub, base_local, wind_cache, pop_size, generations,
+                        random.getrandbits(63), dict(opcoes_ag, direcoes=sub_direcoes)))
+
+    resultados = [None] * len(clusters)
+    # Maiores primeiro: equilibra a carga entre os processos
+    ordem_execucao = sorted(range(len(tarefas)), key=lambda j: -len(tarefas[j][0]))
+    if processos == 1:
+        for feitos, j in enumerate(ordem_execucao, 1):
+            resultados[j] = _resolver_cluster(*tarefas[j])
+            if verbose:
+                print(f"   ✓ Cluster {feitos}/{len(clusters)} ({len(clusters[j])} CEPs)")
+    else:
+        with ProcessPoolExecutor(max_workers=min(processos, len(clusters))) as executor:
+            futuros = {executor.submit(_resolver_cluster, *tarefas[j]): j for j in ordem_execucao}
+            for feitos, futuro in enumerate(as_completed(futuros), 1):
+                j = futuros[futuro]
+                resultados[j] = futuro.result()
+                if verbose:
+                    print(f"   ✓ Cluster {feitos}/{len(clusters)} ({len(clusters[j])} CEPs)")
+
+    # Costura na ordem dos clusters e gira para começar na base
+    ordem = ordenar_clusters(centros, cluster_base)
+    tour = costurar([r[0] for r in resultados], ordem, dist_matrix, xy, centros)
+    p = tour.index(idx_base)
+    rota = tour[p:] + tour[:p] + [idx_base]
+
+    # Reparo das emendas (listas de vizinhos na instância inteira)
+    comprimento_costura = distancia_rota(rota, dist_matrix)
+    vizinhos = preparar_vizinhos(dist_matrix, vizinhos)
+    rota = or_opt_vizinhanca(two_opt_vizinhanca(rota, dist_matrix, vizinhos), dist_matrix, vizinhos)
+    if verbose:
+        print(f"   ✓ Costura: {comprimento_costura:.2f} km → reparo 2-opt/Or-opt: "
+              f"{distancia_rota(rota, dist_matrix):.2f} km")
+
+    # BUSCA PROFUNDA na rota costurada (a ordem só muda se encurtar)
+    if tempo_busca_profunda > 0:
+        comprimento_reparo = distancia_rota(rota, dist_matrix)
+        rota = busca_profunda(rota, dist_matrix, vizinhos, tempo_busca_profunda,
+                              Config.DEEP_SEARCH_PROFUNDIDADE, Config.OROPT_MAX_SEGMENTO)
+        if verbose:
+            print(f"   ✓ Busca profunda ({tempo_busca_profunda:g}s): {comprimento_reparo:.2f} km → "
+                  f"{distancia_rota(rota, dist_matrix):.2f} km")
+
+    # Velocidade de cada trecho: a de saída da parada no seu subproblema
+    vel_saida = {}
+    for ciclo, velocidades, _ in resultados:
+        vel_saida.update(zip(ciclo, velocidades))
+    melhor = {"rota": rota, "velocidades": [vel_saida[i] for i in rota[:-1]]}
+    melhor_fit = calcular_fitness(melhor, coords, dist_matrix, wind_cache, fisica, direcoes)
+
+    if velocidades_dp != "off":
+        melhor, melhor_fit = polir_velocidades(melhor, coords, dist_matrix, wind_cache, fisica,
+                                               direcoes=direcoes)
+    if recargas_otimas != "off":
+        melhor, _ = otimizar_recargas(melhor, ceps, coords, dist_matrix, wind_cache, direcoes)
+        melhor_fit = calcular_fitness(melhor, coords, dist_matrix, wind_cache, fisica, direcoes)
+
+    # Histórico: soma das estatísticas dos subproblemas por geração (um
+    # cluster que parou pelo gap fica com os valores da última geração)
+    historicos = [r[2] for r in resultados if r[2] is not None and not r[2].get('exato')]
+    geracoes = max((len(h['media']) for h in historicos), default=0)
+
+    def serie(h: Dict, chave: str) -> List[float]:
+        return h[chave] + h[chave][-1:] * (geracoes - len(h[chave]))
+
+    historico = {chave: [sum(v) for v in zip(*(serie(h, chave) for h in historicos))]
+                 for chave in ('minimo', 'media', 'mediana', 'maximo', 'num_validos')}
+    historico['desvio'] = [math.sqrt(sum(v * v for v in linha))
+                           for linha in zip(*(serie(h, 'desvio') for h in historicos))]
+    historico['clusters'] = [{"tamanho": len(c), "fitness": (h['minimo'][-1] if h else None)}
+                             for c, (_, _, h) in zip(clusters, resultados)]
+
+    return melhor, melhor_fit, historico
@@ -0,0 +1,112 @@
+"""
+SOLVER EXATO (HELD-KARP) PARA INSTÂNCIAS PEQUENAS
+
+Para replanejamentos pequenos (n ≤ Config.EXATO_N_MAX, por exemplo
+revoar alguns CEPs que falharam), a DP de Held-Karp dá a rota de menor
+distância — o termo dominante do fitness lexicográfico — em O(2^m · m²)
+com m = n - 1 paradas além da base, sem precisar do AG.
+
+C[S, j] = menor caminho que sai da base, visita o conjunto S (máscara de
+bits) e termina em j ∈ S. A DP anda por camadas de |S|: para cada j, as
+máscaras da camada que contêm j são tratadas de uma vez (NumPy), com o
+mínimo sobre o penúltimo nó i ∈ S \\ {j}.
+
+Depois da rota, as velocidades vêm da DP de speed_optimizer e as
+recargas do split (recharge_split), como no fim do AG.
+"""
+
+from typing import List, Tuple
+import numpy as np
+from config import Config
+from simulation import calcular_fitness
+from speed_optimizer import otimizar_velocidades, polir_velocidades
+from recharge_split import otimizar_recargas
+
+
+def held_karp(dist_matrix: List[List[float]], idx_base: int) -> List[int]:
+    """
+    Rota de menor distância (DP de Held-Karp sobre subconjuntos)
+
+    Returns:
+        Rota fechada [base, ..., base]
+    """
+    n = len(dist_matrix)
+    nos = np.array([i for i in range(n) if i != idx_base], dtype=np.int64)
+    m = len(nos)
+    if m <= 2:
+        return [idx_base] + nos.tolist() + [idx_base]
+
+    d = np.asarray(dist_matrix, dtype=np.float64)
+    d_nos = d[np.ix_(nos, nos)]
+    total = 1 << m
+
+    custo = np.full((total, m), np.inf)
+    anterior = np.zeros((total, m), dtype=np.int8)
+    bits = 1 << np.arange(m)
+    custo[bits, np.arange(m)] = d[idx_base, nos]
+
+    mascaras = np.arange(total)
+    tamanho = np.zeros(total, dtype=np.int8)
+    for b in range(m):
+        tamanho += (mascaras >> b) & 1
+
+    for k in range(2, m + 1):
+        camada = mascaras[tamanho == k]
+        for j in range(m):
+            com_j = camada[(camada >> j) & 1 == 1]
+            cand = custo[com_j ^ bits[j]] + d_nos[:, j]
+            melhor = np.argmin(cand, axis=1)
+            custo[com_j, j] = cand[np.arange(len(com_j)), melhor]
+            anterior[com_j, j] = melhor
+
+    # Fecha o ciclo e reconstrói de trás para frente
+    cheia = total - 1
+    j = int(np.argmin(custo[cheia] + d[nos, idx_base]))
+    mascara = cheia
+    caminho = []
+    while mascara:
+        caminho.append(int(nos[j]))
+        j, mascara = int(anterior[mascara, j]), mascara ^ (1 << j)
+    return [idx_base] + caminho[::-1] + [idx_base]
+
+
+def resolver_exato(ceps: List[str], coords: List[Tuple[float, float]],
+                   dist_matrix: List[List[float]], idx_base: int, wind_cache,
+                   velocidades_dp: str = None, recargas_otimas: str = None,
+                   verbose: bool = True, direcoes=None):
+    """
+    Rota exata (Held-Karp) + velocidades (DP) + recargas (split)
+
+    velocidades_dp: "off" mantém as velocidades da DP sem o polimento
+    pelo fitness real (que inclui a penalidade de pousos em excesso)
+    recargas_otimas: "off" mantém a regra gulosa de recarga
+    direcoes: matriz de direções dos trechos (ver simulation.simular_rapido)
+
+    Returns:
+        (melhor, melhor_fit, historico) no formato de evolve_optimized,
+        com uma entrada por estatística e historico['exato'] = True
+    """
+    if velocidades_dp is None:
+        velocidades_dp = Config.VELOCIDADES_DP
+    if recargas_otimas is None:
+        recargas_otimas = Config.SPLIT_RECARGAS
+
+    rota = held_karp(dist_matrix, idx_base)
+    melhor = {"rota": rota, "velocidades": otimizar_velocidades(rota, dist_matrix)}
+    melhor_fit = calcular_fitness(melhor, coords, dist_matrix, wind_cache, direcoes=direcoes)
+    if velocidades_dp != "off":
+        melhor, melhor_fit = polir_velocidades(melhor, coords, dist_matrix, wind_cache,
+                                               direcoes=direcoes)
+    if recargas_otimas != "off":
+        melhor, _ = otimizar_recargas(melhor, ceps, coords, dist_matrix, wind_cache, direcoes)
+        melhor_fit = calcular_fitness(melhor, coords, dist_matrix, wind_cache, direcoes=direcoes)
+
+    if verbose:
+        distancia = sum(dist_matrix[a][b] for a, b in zip(rota[:-1], rota[1:]))
+        print(f"\n🎯 SOLVER EXATO (Held-Karp, {len(ceps)} paradas): "
+              f"rota ótima de {distancia:.2f} km — fitness {melhor_fit:,.0f}")
+
+    historico = {chave: [melhor_fit] for chave in ('minimo', 'media', 'mediana', 'maximo')}
+    historico.update(desvio=[0.0], num_validos=[1], exato=True,
+                     populacao=[{"rota": melhor["rota"], "velocidades": melhor["velocidades"]}])
+    return melhor, melhor_fit, historico
@@ -1,17 +1,38 @@
 # genetic_algorithm.py - REFORMULADO COM ANTI-ESTAGNAÇÃO
 import random
+import time
 import numpy as np
+from functools import lru_cache
 from typing import List, Tuple, Dict
 from config import Config
 from simulation import calcular_fitness
+from local_search import (preparar_vizinhos, two_opt_vizinhanca, or_opt_vizinhanca,
+                          mutacao_or_opt, busca_profunda, mutacao_ruina_recriacao, lns,
+                          distancia_rota)
+from crossover import erx, eax, eax_par, gpx
+from operator_selection import SeletorOperadores, imprimir_estatisticas
+from speed_optimizer import polir_velocidades, decodificador_velocidades
+from recharge_split import split_recargas, otimizar_recargas
+from construction import rotas_construtivas, construtor_curva
+from exact_solver import resolver_exato
+from lower_bound import limite_held_karp, calcular_gap
 
 # ===========================
 # POPULAÇÃO INICIAL DIVERSIFICADA
 # ===========================
-def populacao_inicial_balanceada(pop_size: int, n: int, idx_base: int) -> List[Dict]:
+def populacao_inicial_balanceada(pop_size: int, n: int, idx_base: int,
+                                 dist_matrix: List[List[float]] = None,
+                                 coords: List[Tuple[float, float]] = None,
+                                 vizinhos: List[List[int]] = None,
+                                 fracao_construtiva: float = None) -> List[Dict]:
     """
     PROBLEMA: 80% com mesmas velocidades → convergência prematura
     SOLUÇÃO: Distribuição equilibrada (30%/30%/30%/10%)
+    
+    Com dist_matrix, uma fração (default: Config.INIT_CONSTRUTIVA) recebe
+    rotas das heurísticas construtivas (construction.py). Os indivíduos
+    trocados são espaçados na população, então todas as faixas de
+    velocidade recebem rotas construtivas.
     """
     pop = []
     
@@ -43,15 +64,31 @@ def populacao_inicial_balanceada(pop_size: int, n: int, idx_base: int) -> List[D
     while len(pop) < pop_size:
         pop.append(criar_cromossomo(n, idx_base))
     
+    # Rotas construtivas em indivíduos espaçados (velocidades mantidas)
+    if fracao_construtiva is None:
+        fracao_construtiva = Config.INIT_CONSTRUTIVA
+    if dist_matrix is not None and fracao_construtiva > 0:
+        m = min(pop_size, int(round(pop_size * fracao_construtiva)))
+        rotas = rotas_construtivas(m, dist_matrix, idx_base, coords, vizinhos)
+        for k, rota in enumerate(rotas):
+            pop[k * pop_size // len(rotas)]['rota'] = rota
+    
     return pop
 
 
-def criar_cromossomo(n: int, idx_base: int) -> Dict:
-    """Cria cromossomo garantindo rota completa"""
-    intermediarios = [i for i in range(n) if i != idx_base]
-    random.shuffle(intermediarios)
+def criar_cromossomo(n: int, idx_base: int, construtor=None) -> Dict:
+    """
+    Cria cromossomo garantindo rota completa
     
-    rota = [idx_base] + intermediarios + [idx_base]
+    construtor: função idx_base -> rota (ex.: construction.construtor_curva);
+    sem ele, a rota é uma permutação aleatória
+    """
+    if construtor is not None:
+        rota = construtor(idx_base)
+    else:
+        intermediarios = [i for i in range(n) if i != idx_base]
+        random.shuffle(intermediarios)
+        rota = [idx_base] + intermediarios + [idx_base]
     n_trechos = len(rota) - 1
     
     velocidades = [random.choice(Config.VELOCIDADES_VALIDAS) 
@@ -71,124 +108,409 @@ def selecao_torneio(pop: List[Dict], fitness: List[float], k: int) -> Dict:
             "velocidades": pop[vencedor]["velocidades"][:]}
 
 
-def crossover_ox(p1: Dict, p2: Dict, idx_base: int) -> Tuple[Dict, Dict]:
-    """Order Crossover preservando ordem"""
-    r1 = p1["rota"][1:-1]
-    r2 = p2["rota"][1:-1]
-    n = len(r1)
+def selecao_torneio_lote(fitness: np.ndarray, n_pais: int, k: int,
+                         rng: np.random.Generator) -> np.ndarray:
+    """
+    SELEÇÃO POR TORNEIO EM LOTE
     
-    if n <= 1:
-        return {"rota": p1["rota"][:], "velocidades": p1["velocidades"][:]}, \
-               {"rota": p2["rota"][:], "velocidades": p2["velocidades"][:]}
+    Sorteia todos os torneios de uma vez, como uma matriz (n_pais, k) de
+    índices, e escolhe o vencedor de cada linha com argmin sobre o vetor de
+    fitness. Os competidores são sorteados com reposição.
     
-    a, b = sorted(random.sample(range(n), 2))
+    Returns:
+        Índices (na população) dos n_pais selecionados
+    """
+    competidores = rng.integers(0, len(fitness), size=(n_pais, k))
+    vencedores = np.argmin(fitness[competidores], axis=1)
+    return competidores[np.arange(n_pais), vencedores]
+
+
+def indices_elite(fitness: np.ndarray, k: int) -> np.ndarray:
+    """Índices dos k melhores, em ordem de fitness (argpartition + sort dos k)"""
+    k = min(k, len(fitness))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(fitness):
+        elite = np.argpartition(fitness, k - 1)[:k]
+    else:
+        elite = np.arange(len(fitness))
+    return elite[np.argsort(fitness[elite], kind='stable')]
+
+
+def ox_filho(ra, rb, a: int, b: int):
+    """
+    Filho do Order Crossover em O(n)
     
-    def ox_route(ra, rb):
-        filho = [None] * n
-        filho[a:b+1] = ra[a:b+1]
+    Copia ra[a..b] e preenche as demais posições, a partir de b+1 (circular),
+    com os genes de rb na ordem em que aparecem a partir de b+1, pulando os
+    já copiados. A pertinência ao trecho copiado é um vetor booleano indexado
+    pela cidade, em vez de buscas `in` na lista.
+    
+    Aceita listas ou np.ndarray (rotas sem a base); retorna o mesmo tipo.
+    """
+    n = len(ra)
+    
+    if isinstance(ra, np.ndarray):
+        no_trecho = np.zeros(int(max(ra.max(), rb.max())) + 1, dtype=bool)
+        no_trecho[ra[a:b+1]] = True
+        ordem = np.roll(rb, -((b + 1) % n))
+        resto = ordem[~no_trecho[ordem]]
         
-        idx_filho = (b + 1) % n
-        idx_rb = (b + 1) % n
+        filho = np.empty_like(ra)
+        filho[a:b+1] = ra[a:b+1]
+        filho[(b + 1 + np.arange(len(resto))) % n] = resto
+        return filho
+    
+    no_trecho = [False] * (max(max(ra), max(rb)) + 1)
+    for cidade in ra[a:b+1]:
+        no_trecho[cidade] = True
+    
+    inicio = (b + 1) % n
+    resto = [c for c in rb[inicio:] + rb[:inicio] if not no_trecho[c]]
+    
+    # Posições a preencher: b+1 .. n-1 e depois 0 .. a-1
+    k = n - 1 - b
+    return resto[k:] + ra[a:b+1] + resto[:k]
+
+
+def _rng_padrao() -> np.random.Generator:
+    """Gerador NumPy derivado do estado de `random` (respeita random.seed)"""
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def cruzar_rotas(r1: List[int], r2: List[int], idx_base: int, tipo: str = None,
+                 dist_matrix: List[List[float]] = None,
+                 vizinhos: List[List[int]] = None) -> Tuple[List[int], List[int]]:
+    """
+    Crossover só das rotas (default: Config.CROSSOVER_TIPO)
+    
+    tipo: "ox" (order crossover), "erx" (edge recombination), "eax"
+    (edge assembly) ou "gpx" (partition crossover). EAX e GPX usam
+    dist_matrix; EAX também as listas de vizinhos (ver crossover.py).
+    """
+    tipo = (tipo or Config.CROSSOVER_TIPO).lower()
+    
+    if tipo == "ox":
+        n = len(r1) - 2
+        if n <= 1:
+            return r1[:], r2[:]
         
-        while None in filho:
-            if rb[idx_rb] not in filho:
-                filho[idx_filho] = rb[idx_rb]
-                idx_filho = (idx_filho + 1) % n
-            idx_rb = (idx_rb + 1) % n
+        a, b = sorted(random.sample(range(n), 2))
+        m1 = r1[1:-1]
+        m2 = r2[1:-1]
+        return [idx_base] + ox_filho(m1, m2, a, b) + [idx_base], \
+               [idx_base] + ox_filho(m2, m1, a, b) + [idx_base]
+    
+    if len(r1) <= 5:
+        return r1[:], r2[:]
+    
+    if tipo == "erx":
+        return erx(r1, r2), erx(r2, r1)
+    if tipo == "eax":
+        vizinhos = preparar_vizinhos(dist_matrix, vizinhos)
+        return eax_par(r1, r2, dist_matrix, vizinhos, Config.EAX_FILHOS)
+    if tipo == "gpx":
+        return gpx(r1, r2, dist_matrix)
+    
+    raise ValueError(f"Crossover desconhecido: {tipo}")
+
+
+def cruzar_rota(r1: List[int], r2: List[int], idx_base: int, tipo: str = None,
+                dist_matrix: List[List[float]] = None,
+                vizinhos: List[List[int]] = None) -> List[int]:
+    """
+    Crossover de um único filho (o primeiro de cruzar_rotas), sem montar o outro
+    
+    O GPX escolhe a partição para os dois filhos de uma vez, então
+    devolve o primeiro deles.
+    """
+    tipo = (tipo or Config.CROSSOVER_TIPO).lower()
+    
+    if tipo == "ox":
+        n = len(r1) - 2
+        if n <= 1:
+            return r1[:]
         
-        return [idx_base] + filho + [idx_base]
-    
-    c1_rota = ox_route(r1, r2)
-    c2_rota = ox_route(r2, r1)
-    
-    # Crossover de velocidades
-    c1_vel = []
-    c2_vel = []
-    for v1, v2 in zip(p1["velocidades"], p2["velocidades"]):
-        if random.random() < 0.5:
-            c1_vel.append(v1)
-            c2_vel.append(v2)
-        else:
-            c1_vel.append(v2)
-            c2_vel.append(v1)
+        a, b = sorted(random.sample(range(n), 2))
+        return [idx_base] + ox_filho(r1[1:-1], r2[1:-1], a, b) + [idx_base]
+    
+    if len(r1) <= 5:
+        return r1[:]
+    
+    if tipo == "erx":
+        return erx(r1, r2)
+    if tipo == "eax":
+        vizinhos = preparar_vizinhos(dist_matrix, vizinhos)
+        return eax(r1, r2, dist_matrix, vizinhos, Config.EAX_FILHOS)
+    if tipo == "gpx":
+        return gpx(r1, r2, dist_matrix)[0]
+    
+    raise ValueError(f"Crossover desconhecido: {tipo}")
+
+
+def crossover_velocidades_lote(vel: np.ndarray, pais1: np.ndarray, pais2: np.ndarray,
+                               cruza: np.ndarray, rng: np.random.Generator,
+                               out: np.ndarray = None) -> np.ndarray:
+    """
+    CROSSOVER UNIFORME DAS VELOCIDADES EM LOTE
+    
+    vel: velocidades da população, shape (indivíduos, trechos)
+    pais1, pais2: índices (em vel) dos pais de cada par
+    cruza: máscara (pares,); pares sem crossover copiam os pais
+    out: destino (2*pares, trechos); se omitido, é alocado
+    
+    Os pais são copiados direto para `out` e só os genes sorteados são
+    trocados entre os dois filhos.
+    
+    Returns:
+        `out`, com os filhos intercalados (filho 1 do par 0, filho 2 do
+        par 0, filho 1 do par 1, ...)
+    """
+    if out is None:
+        out = np.empty((2 * len(pais1), vel.shape[1]), dtype=vel.dtype)
+    
+    f1 = out[0::2]
+    f2 = out[1::2]
+    np.take(vel, pais1, axis=0, out=f1, mode='clip')
+    np.take(vel, pais2, axis=0, out=f2, mode='clip')
+    
+    troca = rng.random(f1.shape) < 0.5
+    troca[~cruza] = False
+    genes = f1[troca]
+    f1[troca] = f2[troca]
+    f2[troca] = genes
+    return out
+
+
+def crossover_velocidades(p1: Dict, p2: Dict) -> Tuple[List[int], List[int]]:
+    """Crossover uniforme das velocidades (por trecho)"""
+    filhos = crossover_velocidades_lote(np.array([p1["velocidades"], p2["velocidades"]]),
+                                        np.array([0]), np.array([1]),
+                                        np.ones(1, dtype=bool), _rng_padrao())
+    return filhos[0].tolist(), filhos[1].tolist()
+
+
+def crossover_ox(p1: Dict, p2: Dict, idx_base: int) -> Tuple[Dict, Dict]:
+    """Order Crossover preservando ordem"""
+    c1_rota, c2_rota = cruzar_rotas(p1["rota"], p2["rota"], idx_base, "ox")
+    c1_vel, c2_vel = crossover_velocidades(p1, p2)
     
     return {"rota": c1_rota, "velocidades": c1_vel}, \
            {"rota": c2_rota, "velocidades": c2_vel}
 
 
-def mutacao_multipla(cromossomo: Dict, taxa_base: float) -> None:
+def cruzamento(p1: Dict, p2: Dict, idx_base: int, tipo: str = None,
+               dist_matrix: List[List[float]] = None,
+               vizinhos: List[List[int]] = None) -> Tuple[Dict, Dict]:
+    """Aplica o crossover escolhido (rotas) e o uniforme (velocidades)"""
+    c1_rota, c2_rota = cruzar_rotas(p1["rota"], p2["rota"], idx_base, tipo,
+                                    dist_matrix, vizinhos)
+    c1_vel, c2_vel = crossover_velocidades(p1, p2)
+    
+    return {"rota": c1_rota, "velocidades": c1_vel}, \
+           {"rota": c2_rota, "velocidades": c2_vel}
+
+
+def _par_distinto(u1: float, u2: float, inicio: int, fim: int) -> Tuple[int, int]:
+    """Dois índices distintos em [inicio, fim) a partir de dois uniformes"""
+    tamanho = fim - inicio
+    i = int(u1 * tamanho)
+    j = int(u2 * (tamanho - 1))
+    if j >= i:
+        j += 1
+    return inicio + i, inicio + j
+
+
+def mutacao_rotas_lote(rotas: List[List[int]], taxa_base: float,
+                       rng: np.random.Generator,
+                       dist_matrix: List[List[float]] = None,
+                       vizinhos: List[List[int]] = None,
+                       compartilhadas: List[bool] = None,
+                       taxas: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
     """
-    MUTAÇÃO MÚLTIPLA: Swap + Inversion + 2-opt
-    Conforme documento: "swap + inversion (2-opt style)"
+    MUTAÇÃO DAS ROTAS EM LOTE (in-place)
+    
+    Sorteia de uma vez, para todas as rotas, quais operadores se aplicam
+    (swap, inversion, 2-opt, Or-opt, ruína e recriação) e os índices
+    usados por swap, inversion e 2-opt. O Or-opt e a ruína e recriação só
+    se aplicam quando dist_matrix e vizinhos são informados.
+    
+    compartilhadas: rotas ainda referenciadas por outros indivíduos; são
+    copiadas (em `rotas[k]`) só se alguma mutação for aplicada a elas.
+    taxas: taxas dos 5 operadores (default: taxa_base e as da Config),
+    usadas pela seleção adaptativa de operadores.
+    
+    Returns:
+        (aplica, tempos): operadores aplicados a cada rota, shape (m, 5),
+        e segundos gastos em cada operador
     """
+    m = len(rotas)
+    tempos = np.zeros(5)
+    if taxas is None:
+        taxas = np.array([taxa_base, Config.MUTATION_RATE_INVERSION, Config.MUTATION_RATE_2OPT,
+                          Config.MUTATION_RATE_OROPT, Config.MUTATION_RATE_LNS])
+    aplica = rng.random((m, len(taxas))) < taxas
+    if vizinhos is None:
+        aplica[:, 3:] = False
     
-    # 1. SWAP (trocar 2 posições)
-    if random.random() < taxa_base:
-        rota = cromossomo["rota"]
-        if len(rota) > 3:
-            i, j = random.sample(range(1, len(rota)-1), 2)
+    for k in np.flatnonzero(aplica.any(axis=1)):
+        if compartilhadas is not None and compartilhadas[k]:
+            rotas[k] = rotas[k][:]
+        rota = rotas[k]
+        L = len(rota)
+        swap, inversao, dois_opt, or_opt, ruina = aplica[k]
+        u = rng.random(6)
+        
+        t0 = time.perf_counter()
+        
+        # 1. SWAP (trocar 2 posições)
+        if swap and L > 3:
+            i, j = _par_distinto(u[0], u[1], 1, L - 1)
             rota[i], rota[j] = rota[j], rota[i]
+            t1 = time.perf_counter()
+            tempos[0] += t1 - t0
+            t0 = t1
+        
+        # 2. INVERSION (inverter segmento)
+        if inversao and L > 3:
+            i, j = sorted(_par_distinto(u[2], u[3], 1, L - 1))
+            rota[i:j+1] = rota[i:j+1][::-1]
+            t1 = time.perf_counter()
+            tempos[1] += t1 - t0
+            t0 = t1
+        
+        # 3. 2-OPT (inversão de trecho)
+        if dois_opt and L > 4:
+            i = 1 + int(u[4] * (L - 3))
+            j = i + 2 + int(u[5] * (L - i - 2))
+            rota[i:j] = rota[i:j][::-1]
+            t1 = time.perf_counter()
+            tempos[2] += t1 - t0
+            t0 = t1
+        
+        # 4. OR-OPT (realocar segmento curto)
+        if or_opt:
+            mutacao_or_opt(rota, dist_matrix, vizinhos, Config.OROPT_MAX_SEGMENTO)
+            t1 = time.perf_counter()
+            tempos[3] += t1 - t0
+            t0 = t1
+        
+        # 5. RUÍNA E RECRIAÇÃO (LNS)
+        if ruina:
+            mutacao_ruina_recriacao(rota, dist_matrix, vizinhos,
+                                    Config.LNS_MIN_REMOVER, Config.LNS_MAX_REMOVER)
+            tempos[4] += time.perf_counter() - t0
     
-    # 2. INVERSION (inverter segmento)
-    if random.random() < Config.MUTATION_RATE_INVERSION:
-        rota = cromossomo["rota"]
-        if len(rota) > 3:
-            i, j = sorted(random.sample(range(1, len(rota)-1), 2))
-            rota[i:j+1] = list(reversed(rota[i:j+1]))
-    
-    # 3. 2-OPT (melhoria local)
-    if random.random() < Config.MUTATION_RATE_2OPT:
-        rota = cromossomo["rota"]
-        if len(rota) > 4:
-            i = random.randint(1, len(rota)-3)
-            j = random.randint(i+2, len(rota)-1)
-            rota[i:j] = reversed(rota[i:j])
-    
-    # 4. MUTAÇÃO DE VELOCIDADES
-    velocidades = cromossomo["velocidades"]
-    for i in range(len(velocidades)):
-        if random.random() < taxa_base:
-            # 70%: mudança gradual (±4 ou ±8 km/h)
-            if random.random() < 0.7:
-                delta = random.choice([-8, -4, 4, 8])
-                nova_vel = velocidades[i] + delta
-                nova_vel = max(36, min(96, nova_vel))
-                nova_vel = (nova_vel // 4) * 4
-                velocidades[i] = nova_vel
-            else:
-                # 30%: mudança radical
-                velocidades[i] = random.choice(Config.VELOCIDADES_VALIDAS)
+    return aplica, tempos
+
+
+def mutacao_velocidades_lote(velocidades: np.ndarray, taxa_base: float,
+                             rng: np.random.Generator,
+                             fracao_gradual: float = 0.7) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MUTAÇÃO DAS VELOCIDADES EM LOTE (in-place), shape (indivíduos, trechos)
+    
+    Cada gene muta com probabilidade taxa_base:
+      - 70% (fracao_gradual): mudança gradual (±4 ou ±8 km/h), limitada à
+             faixa válida e arredondada para múltiplo de 4;
+      - 30%: mudança radical (velocidade válida sorteada).
+    Só os genes sorteados para mutar recebem as demais amostras.
+    
+    Returns:
+        Genes com mudança gradual e radical em cada indivíduo
+    """
+    m, L = velocidades.shape
+    idx = np.flatnonzero(rng.random(velocidades.size) < taxa_base)
+    if len(idx) == 0:
+        return np.zeros(m, dtype=np.int64), np.zeros(m, dtype=np.int64)
+    
+    planas = velocidades.reshape(-1)
+    gradual = rng.random(len(idx)) < fracao_gradual
+    delta = rng.choice(np.array([-8, -4, 4, 8]), size=len(idx))
+    radical = rng.choice(np.asarray(Config.VELOCIDADES_VALIDAS), size=len(idx))
+    
+    passo = np.clip(planas[idx] + delta, Config.VELOCIDADE_MINIMA, Config.VELOCIDADE_MAXIMA)
+    passo = (passo // Config.MULTIPLO_VELOCIDADE) * Config.MULTIPLO_VELOCIDADE
+    planas[idx] = np.where(gradual, passo, radical)
+    
+    linhas = idx // L
+    return (np.bincount(linhas[gradual], minlength=m),
+            np.bincount(linhas[~gradual], minlength=m))
+
+
+def mutacao_lote(cromossomos: List[Dict], taxa_base: float, rng: np.random.Generator,
+                 dist_matrix: List[List[float]] = None,
+                 vizinhos: List[List[int]] = None) -> None:
+    """MUTAÇÃO MÚLTIPLA em lote: rotas (mutacao_rotas_lote) + velocidades"""
+    if not cromossomos:
+        return
+    
+    mutacao_rotas_lote([c["rota"] for c in cromossomos], taxa_base, rng, dist_matrix, vizinhos)
+    
+    velocidades = np.array([c["velocidades"] for c in cromossomos])
+    mutacao_velocidades_lote(velocidades, taxa_base, rng)
+    for c, v in zip(cromossomos, velocidades.tolist()):
+        c["velocidades"] = v
+
+
+def mutacao_multipla(cromossomo: Dict, taxa_base: float,
+                     dist_matrix: List[List[float]] = None,
+                     vizinhos: List[List[int]] = None) -> None:
+    """
+    MUTAÇÃO MÚLTIPLA: Swap + Inversion + 2-opt (+ Or-opt + Ruína e recriação)
+    Conforme documento: "swap + inversion (2-opt style)"
+    
+    Versão de um cromossomo de mutacao_lote. O Or-opt (realocação de 1-3
+    paradas para a melhor posição entre os vizinhos) e a ruína e recriação
+    (remoção de um grupo de paradas próximas e reinserção pela inserção
+    mais barata/regret) só são aplicados quando dist_matrix e vizinhos
+    são informados.
+    """
+    mutacao_lote([cromossomo], taxa_base, _rng_padrao(), dist_matrix, vizinhos)
 
 
-def local_search_2opt(cromossomo: Dict, dist_matrix: List[List[float]]) -> Dict:
+def local_search_2opt(cromossomo: Dict, dist_matrix: List[List[float]],
+                     vizinhos: List[List[int]] = None) -> Dict:
     """
     2-OPT LOCAL SEARCH
     Conforme documento: "2-opt local search aplicado aos 5-10 melhores filhos"
+    
+    Usa listas de k vizinhos e don't-look bits (ver local_search.py);
+    passe `vizinhos` pré-calculado para não recalcular as listas a cada chamada.
     """
-    rota = cromossomo["rota"][:]
-    melhorou = True
+    vizinhos = preparar_vizinhos(dist_matrix, vizinhos)
+    rota = two_opt_vizinhanca(cromossomo["rota"], dist_matrix, vizinhos,
+                              Config.LOCAL_SEARCH_FIRST_IMPROVEMENT)
     
-    while melhorou:
-        melhorou = False
-        
-        for i in range(1, len(rota) - 2):
-            for j in range(i + 2, len(rota) - 1):
-                # Calcula distância atual
-                dist_antes = (dist_matrix[rota[i-1]][rota[i]] +
-                             dist_matrix[rota[j]][rota[j+1]])
-                
-                # Calcula distância se inverter
-                dist_depois = (dist_matrix[rota[i-1]][rota[j]] +
-                              dist_matrix[rota[i]][rota[j+1]])
-                
-                # Se melhorou, aplica
-                if dist_depois < dist_antes:
-                    rota[i:j+1] = reversed(rota[i:j+1])
-                    melhorou = True
-                    break
-            
-            if melhorou:
-                break
+    return {"rota": rota, "velocidades": cromossomo["velocidades"][:]}
+
+
+def local_search_oropt(cromossomo: Dict, dist_matrix: List[List[float]],
+                      vizinhos: List[List[int]] = None) -> Dict:
+    """
+    OR-OPT LOCAL SEARCH
+    
+    Realoca segmentos de 1 a Config.OROPT_MAX_SEGMENTO paradas até não
+    haver melhoria (ver local_search.or_opt_vizinhanca).
+    """
+    vizinhos = preparar_vizinhos(dist_matrix, vizinhos)
+    rota = or_opt_vizinhanca(cromossomo["rota"], dist_matrix, vizinhos,
+                             Config.OROPT_MAX_SEGMENTO)
+    
+    return {"rota": rota, "velocidades": cromossomo["velocidades"][:]}
+
+
+def local_search_profunda(cromossomo: Dict, dist_matrix: List[List[float]],
+                          tempo_limite_seg: float, vizinhos: List[List[int]] = None) -> Dict:
+    """
+    BUSCA PROFUNDA (LK + OR-OPT ITERADOS)
+    
+    Aplicada só ao elite final, com limite de tempo de parede
+    (ver local_search.busca_profunda).
+    """
+    vizinhos = preparar_vizinhos(dist_matrix, vizinhos)
+    rota = busca_profunda(cromossomo["rota"], dist_matrix, vizinhos, tempo_limite_seg,
+                          Config.DEEP_SEARCH_PROFUNDIDADE, Config.OROPT_MAX_SEGMENTO)
     
     return {"rota": rota, "velocidades": cromossomo["velocidades"][:]}
 
@@ -254,34 +576,268 @@ def detectar_estagnacao(historico_media: List[float], geracoes_check: int = 20)
 # ===========================
 # ESTRATÉGIAS ANTI-ESTAGNAÇÃO
 # ===========================
-def restart_parcial(pop: List[Dict], fitness: List[float], n: int, idx_base: int) -> List[Dict]:
+def restart_parcial(pop: List[Dict], fitness: List[float], n: int, idx_base: int,
+                    construtor=None) -> List[Dict]:
     """
     RESTART PARCIAL
     Conforme documento: "reinicializar 20-40% da população"
-    """
-    # Ordena por fitness
-    sorted_idx = sorted(range(len(pop)), key=lambda i: fitness[i])
     
-    # Mantém os melhores
+    construtor: se informado, Config.RESTART_CURVA dos novos indivíduos
+    recebem rotas dele (ver criar_cromossomo) em vez de permutações aleatórias
+    """
+    # Mantém os melhores (em ordem de fitness)
     num_manter = int(len(pop) * (1 - Config.RESTART_PERCENTAGE))
     nova_pop = [{"rota": pop[i]["rota"][:], "velocidades": pop[i]["velocidades"][:]} 
-                for i in sorted_idx[:num_manter]]
+                for i in indices_elite(np.asarray(fitness, dtype=np.float64), num_manter)]
     
-    # Gera novos aleatórios
-    while len(nova_pop) < len(pop):
-        nova_pop.append(criar_cromossomo(n, idx_base))
+    # Gera novos (parte pela curva, se houver construtor)
+    for i in range(len(pop) - len(nova_pop)):
+        nova_pop.append(criar_cromossomo(n, idx_base, _construtor_restart(construtor, i)))
     
     return nova_pop
 
 
+def _construtor_restart(construtor, i: int):
+    """Construtor do i-ésimo reiniciado: intercala curva e aleatório na proporção RESTART_CURVA"""
+    if construtor is None:
+        return None
+    return construtor if int((i + 1) * Config.RESTART_CURVA) > int(i * Config.RESTART_CURVA) else None
+
+
 def hypermutation(cromossomo: Dict) -> None:
     """
     HIPER-MUTAÇÃO
     Conforme documento: "mutação pesada após estagnação"
     """
-    # Múltiplas mutações fortes
+    hypermutation_lote([cromossomo], _rng_padrao())
+
+
+def hypermutation_lote(cromossomos: List[Dict], rng: np.random.Generator) -> None:
+    """Hiper-mutação em lote: três rodadas de mutação forte"""
     for _ in range(3):
-        mutacao_multipla(cromossomo, Config.HYPERMUTATION_RATE)
+        mutacao_lote(cromossomos, Config.HYPERMUTATION_RATE, rng)
+
+
+# ===========================
+# REPRODUÇÃO SEM CÓPIAS (BUFFER DUPLO)
+# ===========================
+def reproduzir(rotas: List[List[int]], vel: np.ndarray, fitness: np.ndarray,
+               destino: np.ndarray, rng: np.random.Generator, idx_base: int,
+               crossover: str = None, dist_matrix: List[List[float]] = None,
+               vizinhos: List[List[int]] = None, seletor=None) -> List[List[int]]:
+    """
+    GERA A PRÓXIMA GERAÇÃO (elitismo + torneio + crossover + mutação)
+    
+    As rotas são tratadas como imutáveis e compartilhadas por referência:
+    elites e filhos sem crossover apontam para a lista do pai, e a cópia só
+    acontece se uma mutação tocar a rota (mutacao_rotas_lote). As
+    velocidades dos filhos são escritas direto em `destino`, o buffer da
+    próxima geração (pré-alocado com ao menos len(rotas) + 1 linhas).
+    
+    seletor: SeletorOperadores (operator_selection.py). Se informado, o
+    tipo de crossover de cada par e as taxas de mutação vêm do bandit, e
+    os operadores aplicados a cada filho (com seus tempos) são registrados
+    para o crédito após a avaliação (seletor.creditar).
+    
+    Returns:
+        Rotas da próxima geração (velocidades em destino[:len(rotas)])
+    """
+    pop_size = len(rotas)
+    n_elite = min(Config.ELITISM_COUNT, pop_size)
+    
+    # ELITISMO (argpartition: só os k melhores são ordenados)
+    elite = indices_elite(fitness, n_elite)
+    novas = [rotas[i] for i in elite]
+    np.take(vel, elite, axis=0, out=destino[:n_elite], mode='clip')
+    
+    n_pares = (pop_size - n_elite + 1) // 2
+    if n_pares == 0:
+        return novas
+    
+    # SELEÇÃO (todos os torneios da geração de uma vez)
+    pais = selecao_torneio_lote(fitness, 2 * n_pares, Config.TOURNAMENT_SIZE, rng)
+    pais1, pais2 = pais[:n_pares], pais[n_pares:]
+    
+    # CROSSOVER
+    cruza = rng.random(n_pares) < Config.CROSSOVER_RATE
+    if seletor is not None:
+        tipos = seletor.crossovers
+        escolha = rng.choice(len(tipos), size=n_pares, p=seletor.probs_crossover())
+        tempos_cx = np.zeros(len(tipos))
+    filhos = []
+    compartilhadas = []
+    for k in range(n_pares):
+        r1 = rotas[pais1[k]]
+        r2 = rotas[pais2[k]]
+        if cruza[k]:
+            if seletor is None:
+                filhos.extend(cruzar_rotas(r1, r2, idx_base, crossover, dist_matrix, vizinhos))
+            else:
+                t0 = time.perf_counter()
+                filhos.extend(cruzar_rotas(r1, r2, idx_base, tipos[escolha[k]],
+                                           dist_matrix, vizinhos))
+                tempos_cx[escolha[k]] += time.perf_counter() - t0
+            compartilhadas.extend((False, False))
+        else:
+            filhos.extend((r1, r2))
+            compartilhadas.extend((True, True))
+    
+    vel_filhos = destino[n_elite:n_elite + 2 * n_pares]
+    crossover_velocidades_lote(vel, pais1, pais2, cruza, rng, out=vel_filhos)
+    
+    # MUTAÇÃO (cópia da rota só quando mutada)
+    if seletor is None:
+        mutacao_rotas_lote(filhos, Config.MUTATION_RATE_SWAP, rng, dist_matrix, vizinhos,
+                           compartilhadas)
+        mutacao_velocidades_lote(vel_filhos, Config.MUTATION_RATE_SWAP, rng)
+    else:
+        aplica, tempos_rota = mutacao_rotas_lote(filhos, Config.MUTATION_RATE_SWAP, rng,
+                                                 dist_matrix, vizinhos, compartilhadas,
+                                                 seletor.taxas_mutacao())
+        t0 = time.perf_counter()
+        gradual, radical = mutacao_velocidades_lote(vel_filhos, Config.MUTATION_RATE_SWAP, rng,
+                                                    seletor.fracao_gradual())
+        tempo_vel = time.perf_counter() - t0
+        n_genes = max(gradual.sum() + radical.sum(), 1)
+        tempos_vel = tempo_vel * np.array([gradual.sum(), radical.sum()]) / n_genes
+        
+        # Operadores de cada filho e fitness do pai de referência (o melhor
+        # dos dois, se houve crossover; senão, o próprio pai)
+        cx = np.zeros((2 * n_pares, len(tipos)), dtype=bool)
+        linhas = np.flatnonzero(np.repeat(cruza, 2))
+        cx[linhas, np.repeat(escolha, 2)[linhas]] = True
+        aplicados = np.hstack([aplica, (gradual > 0)[:, None], (radical > 0)[:, None], cx])
+        
+        f1, f2 = fitness[pais1], fitness[pais2]
+        melhor_pai = np.minimum(f1, f2)
+        ref = np.column_stack([np.where(cruza, melhor_pai, f1),
+                               np.where(cruza, melhor_pai, f2)]).reshape(-1)
+        seletor.registrar_filhos(aplicados, np.concatenate([tempos_rota, tempos_vel, tempos_cx]),
+                                 ref, n_elite)
+    
+    novas.extend(filhos)
+    return novas[:pop_size]
+
+
+def avaliador_fisica(coords: List[Tuple[float,float]], dist_matrix: List[List[float]],
+                     wind_cache: Dict, split: bool = False, tamanho_cache: int = None,
+                     direcoes=None):
+    """
+    Fitness com a física (simular_rapido), com cache por (rota, velocidades)
+
+    split: avalia com o plano de recargas ótimo sob a física
+    direcoes: matriz de direções dos trechos (ver simulation.simular_rapido)
+
+    Returns:
+        Função (rota, velocidades) → fitness; avaliador.cache_info() conta
+        as simulações feitas (misses) e as reaproveitadas (hits)
+    """
+    if tamanho_cache is None:
+        tamanho_cache = Config.AVALIACAO_DUPLA_CACHE
+
+    @lru_cache(maxsize=tamanho_cache)
+    def avaliar(rota: Tuple[int, ...], velocidades: Tuple[int, ...]) -> float:
+        cromossomo = {"rota": list(rota), "velocidades": list(velocidades)}
+        if split:
+            cromossomo["recargas"] = split_recargas(cromossomo["rota"], cromossomo["velocidades"],
+                                                    dist_matrix, fisica=True)
+        return calcular_fitness(cromossomo, coords, dist_matrix, wind_cache, True, direcoes)
+
+    def avaliador(rota: List[int], velocidades: List[int]) -> float:
+        return avaliar(tuple(rota), tuple(velocidades))
+
+    avaliador.cache_info = avaliar.cache_info
+    return avaliador
+
+
+def confirmar_fisica(rotas: List[List[int]], velocidades: List[List[int]],
+                     fitness: List[float], detalhado, elite: int = None,
+                     margem: float = None) -> List[float]:
+    """
+    Segunda camada da avaliação: física só para os candidatos à elite
+
+    Os `elite` melhores pelo modelo rápido, e quem estiver até `margem`
+    (fração) acima do pior deles, são reavaliados com `detalhado`. Os
+    demais ficam com a estimativa rápida calibrada pela razão mediana
+    física/rápido dos confirmados, para a seleção comparar valores na
+    mesma escala. Se o melhor da população ainda for uma estimativa, ele
+    também é confirmado (até o melhor ser avaliado com a física).
+    """
+    if elite is None:
+        elite = Config.AVALIACAO_DUPLA_ELITE
+    if margem is None:
+        margem = Config.AVALIACAO_DUPLA_MARGEM
+
+    rapido = np.asarray(fitness, dtype=np.float64)
+    finitos = np.isfinite(rapido)
+    if not finitos.any():
+        return list(fitness)
+
+    k = min(elite, int(finitos.sum()))
+    corte = np.partition(rapido[finitos], k - 1)[k - 1]
+    confirmados = finitos & (rapido <= corte * (1 + margem))
+
+    final = rapido.copy()
+    for i in np.flatnonzero(confirmados):
+        final[i] = detalhado(rotas[i], velocidades[i])
+
+    razoes = final[confirmados] / rapido[confirmados]
+    razoes = razoes[np.isfinite(razoes)]
+    fator = float(np.median(razoes)) if len(razoes) else 1.0
+    estimados = ~confirmados & finitos
+    final[estimados] = rapido[estimados] * fator
+
+    while True:
+        i = int(np.argmin(final))
+        if confirmados[i] or not np.isfinite(final[i]):
+            break
+        final[i] = detalhado(rotas[i], velocidades[i])
+        confirmados[i] = True
+
+    return final.tolist()
+
+
+def avaliar_populacao(rotas: List[List[int]], velocidades: List[List[int]],
+                      coords: List[Tuple[float,float]], dist_matrix: List[List[float]],
+                      wind_cache: Dict, split: bool = False, detalhado=None,
+                      direcoes=None) -> List[float]:
+    """
+    Fitness de cada par (rota, velocidades), sem montar cópias dos cromossomos
+    
+    split: avalia cada indivíduo com o plano de recargas ótimo (split_recargas)
+    em vez da regra gulosa do simulador
+    detalhado: avaliação em duas camadas — todos pelo modelo rápido e os
+    candidatos à elite pela física (ver confirmar_fisica e avaliador_fisica)
+    direcoes: matriz de direções dos trechos (ver simulation.simular_rapido)
+    """
+    fisica = False if detalhado else None
+    if split:
+        fitness = [calcular_fitness({"rota": r, "velocidades": v,
+                                     "recargas": split_recargas(r, v, dist_matrix, fisica=fisica)},
+                                    coords, dist_matrix, wind_cache, fisica, direcoes)
+                   for r, v in zip(rotas, velocidades)]
+    else:
+        fitness = [calcular_fitness({"rota": r, "velocidades": v}, coords, dist_matrix,
+                                    wind_cache, fisica, direcoes)
+                   for r, v in zip(rotas, velocidades)]
+    if detalhado:
+        fitness = confirmar_fisica(rotas, velocidades, fitness, detalhado)
+    return fitness
+
+
+def decodificar_populacao(rotas: List[List[int]], vel: np.ndarray, decodificar) -> None:
+    """Reescreve as velocidades de cada rota com as da DP (decodificador com cache)"""
+    for i, rota in enumerate(rotas):
+        vel[i] = decodificar(rota)
+
+
+def busca_local_rota(rota: List[int], dist_matrix: List[List[float]],
+                     vizinhos: List[List[int]]) -> List[int]:
+    """2-opt (+ Or-opt, se Config.LOCAL_SEARCH_OROPT) sobre uma rota; retorna nova lista"""
+    rota = two_opt_vizinhanca(rota, dist_matrix, vizinhos, Config.LOCAL_SEARCH_FIRST_IMPROVEMENT)
+    if Config.LOCAL_SEARCH_OROPT:
+        rota = or_opt_vizinhanca(rota, dist_matrix, vizinhos, Config.OROPT_MAX_SEGMENTO)
+    return rota
 
 
 # ===========================
@@ -289,7 +845,13 @@ def hypermutation(cromossomo: Dict) -> None:
 # ===========================
 def evolve_optimized(ceps: List[str], coords: List[Tuple[float,float]],
                     dist_matrix: List[List[float]], idx_base: int,
-                    wind_cache: Dict, pop_size: int, generations: int, verbose: bool = True):
+                    wind_cache: Dict, pop_size: int, generations: int, verbose: bool = True,
+                    tempo_busca_profunda: float = None, crossover: str = None,
+                    adaptativo: bool = None, velocidades_dp: str = None,
+                    recargas_otimas: str = None, fracao_construtiva: float = None,
+                    populacao_inicial: List[Dict] = None, exato: bool = None,
+                    tolerancia_gap: float = None, limite_inferior: float = None,
+                    avaliacao_dupla: bool = None, vizinhos=None, direcoes=None):
     """
     AG REFORMULADO COM ANTI-ESTAGNAÇÃO
     
@@ -298,23 +860,118 @@ def evolve_optimized(ceps: List[str], coords: List[Tuple[float,float]],
     2. População inicial balanceada (30%/30%/30%/10%)
     3. Múltiplos operadores de mutação (swap + inversion + 2-opt)
     4. Detecção de estagnação (regressão linear em 20 gerações)
-    5. Estratégias de recuperação (restart + hypermutation + local search)
+    5. Estratégias de recuperação (restart + hypermutation + LNS + local search)
     6. Monitoramento completo (min/média/mediana/desvio)
+    
+    tempo_busca_profunda: segundos de busca profunda (LK + Or-opt) no elite
+    final (default: Config.DEEP_SEARCH_TEMPO_SEG; 0 = desligada)
+    crossover: "ox", "erx", "eax" ou "gpx" (default: Config.CROSSOVER_TIPO)
+    adaptativo: seleção adaptativa de operadores (bandit sobre as mutações
+    e os crossovers de Config.ADAPTATIVO_CROSSOVERS; ignora `crossover`);
+    default: Config.OPERADORES_ADAPTATIVOS. As estatísticas por operador
+    ficam em historico['operadores'] e as probabilidades por geração em
+    historico['prob_operadores'].
+    velocidades_dp: velocidades ótimas por DP para a rota (speed_optimizer.py):
+    "off", "final" (polimento do melhor) ou "decoder" (as velocidades de
+    todo indivíduo vêm da DP e o AG busca só permutações); default:
+    Config.VELOCIDADES_DP
+    recargas_otimas: pontos de recarga por split (recharge_split.py): "off",
+    "final" (plano da rota final, conferido na simulação detalhada) ou
+    "fitness" (cada indivíduo é avaliado com o seu plano ótimo); default:
+    Config.SPLIT_RECARGAS
+    fracao_construtiva: fração da população inicial com rotas das
+    heurísticas construtivas (construction.py); default: Config.INIT_CONSTRUTIVA
+    populacao_inicial: indivíduos para começar (ex.: a população de uma
+    fase anterior), completados pela população balanceada
+    exato: com n <= Config.EXATO_N_MAX, resolve por Held-Karp
+    (exact_solver.py) em vez do AG; default: Config.EXATO_AUTOMATICO
+    tolerancia_gap: para quando o gap de distância do melhor para o limite
+    de Held-Karp (lower_bound.py) fica ≤ tolerância (fração; default:
+    Config.GAP_TOLERANCIA; 0 = roda todas as gerações)
+    limite_inferior: limite já calculado (km); None = calcula se
+    Config.LIMITE_INFERIOR ou tolerancia_gap > 0 (até LIMITE_INFERIOR_N_MAX);
+    False = sem limite nem gap (ex.: instância contraída, cujo limite não
+    vale para a original)
+    avaliacao_dupla: triagem de todos pelo modelo rápido e física
+    (simular_rapido, com cache) só para os candidatos à elite; vale com
+    Config.USE_FAST_FITNESS; default: Config.AVALIACAO_DUPLA. O número de
+    simulações com física fica em historico['avaliacoes_fisica'].
+    vizinhos: listas k-NN já calculadas (ex.: as do pacote --prepare);
+    default: calculadas da matriz
+    direcoes: matriz de direções dos trechos, repassada aos simuladores
+    (ver simulation.simular_rapido); default: bearing() das coordenadas
+    
+    O gap por geração fica em historico['gap'], o limite em
+    historico['limite_inferior'] e a geração da parada antecipada, se
+    houver, em historico['parada_gap'].
+    A população final, em ordem de fitness, fica em historico['populacao'].
     """
     n = len(ceps)
     
-    # População inicial BALANCEADA
+    if tempo_busca_profunda is None:
+        tempo_busca_profunda = Config.DEEP_SEARCH_TEMPO_SEG
+    if adaptativo is None:
+        adaptativo = Config.OPERADORES_ADAPTATIVOS
+    seletor = SeletorOperadores() if adaptativo else None
+    if velocidades_dp is None:
+        velocidades_dp = Config.VELOCIDADES_DP
+    decodificar = decodificador_velocidades(dist_matrix) if velocidades_dp == "decoder" else None
+    if recargas_otimas is None:
+        recargas_otimas = Config.SPLIT_RECARGAS
+    split = recargas_otimas == "fitness"
+    if exato is None:
+        exato = Config.EXATO_AUTOMATICO
+    if tolerancia_gap is None:
+        tolerancia_gap = Config.GAP_TOLERANCIA
+    if avaliacao_dupla is None:
+        avaliacao_dupla = Config.AVALIACAO_DUPLA
+    if exato and n <= Config.EXATO_N_MAX:
+        return resolver_exato(ceps, coords, dist_matrix, idx_base, wind_cache,
+                              velocidades_dp, recargas_otimas, verbose, direcoes)
+    
+    # Listas de vizinhos para a busca local (calculadas uma vez, se não vierem prontas)
+    vizinhos = preparar_vizinhos(dist_matrix, vizinhos)
+    
+    # Segunda camada da avaliação (física com cache) para os candidatos à elite
+    detalhado = (avaliador_fisica(coords, dist_matrix, wind_cache, split, direcoes=direcoes)
+                 if avaliacao_dupla and Config.USE_FAST_FITNESS else None)
+    
+    # Rotas da curva de Hilbert (sem matriz) para os reiniciados
+    curva = construtor_curva(coords) if Config.RESTART_CURVA > 0 else None
+    
+    # Sorteios em lote (máscaras e índices) vêm deste gerador
+    rng = _rng_padrao()
+    
+    # População inicial BALANCEADA (completando a informada, se houver)
     print(f"\nGerando população inicial balanceada...")
-    pop = populacao_inicial_balanceada(pop_size, n, idx_base)
-    fitness = [calcular_fitness(ind, coords, dist_matrix, wind_cache) for ind in pop]
+    pop = [{"rota": ind["rota"][:], "velocidades": list(ind["velocidades"])}
+           for ind in (populacao_inicial or [])[:pop_size]]
+    if len(pop) < pop_size:
+        pop += populacao_inicial_balanceada(pop_size - len(pop), n, idx_base, dist_matrix, coords,
+                                            vizinhos, fracao_construtiva)
+    
+    # Rotas (listas compartilhadas, nunca alteradas in-place) e velocidades
+    # em dois buffers pré-alocados que se alternam entre as gerações
+    rotas = [ind["rota"] for ind in pop]
+    buffers = [np.empty((len(pop) + 1, n), dtype=np.int64) for _ in range(2)]
+    atual = 0
+    buffers[atual][:len(pop)] = [ind["velocidades"] for ind in pop]
+    if decodificar:
+        decodificar_populacao(rotas, buffers[atual], decodificar)
+    vel_listas = buffers[atual][:len(pop)].tolist()
+    
+    fitness = avaliar_populacao(rotas, vel_listas, coords, dist_matrix, wind_cache, split,
+                                detalhado, direcoes)
     
     # Estatísticas iniciais
     stats = calcular_estatisticas(fitness)
     
-    melhor_idx = min(range(len(pop)), 
-                     key=lambda i: fitness[i] if fitness[i] != float('inf') else float('inf'))
-    melhor = {"rota": pop[melhor_idx]["rota"][:], 
-              "velocidades": pop[melhor_idx]["velocidades"][:]}
+    melhor_idx = int(np.argmin(fitness))
+    melhor = {"rota": rotas[melhor_idx][:], 
+              "velocidades": vel_listas[melhor_idx][:]}
+    if split:
+        melhor["recargas"] = split_recargas(melhor["rota"], melhor["velocidades"], dist_matrix,
+                                            fisica=True if detalhado else None)
     melhor_fit = fitness[melhor_idx]
     
     # Histórico
@@ -326,6 +983,20 @@ def evolve_optimized(ceps: List[str], coords: List[Tuple[float,float]],
         'desvio': [stats['desvio']],
         'num_validos': [stats['num_validos']]
     }
+    if seletor is not None:
+        historico['prob_operadores'] = [seletor.probabilidades()]
+    
+    # Limite inferior da distância (Held-Karp) para o gap de otimalidade
+    if limite_inferior is False:
+        limite_inferior = None
+    elif limite_inferior is None and (Config.LIMITE_INFERIOR or tolerancia_gap > 0) \
+            and n <= Config.LIMITE_INFERIOR_N_MAX:
+        limite_inferior, _ = limite_held_karp(dist_matrix, idx_base,
+                                              distancia_rota(melhor["rota"], dist_matrix))
+    if limite_inferior is not None:
+        historico['limite_inferior'] = limite_inferior
+        historico['gap'] = [calcular_gap(distancia_rota(melhor["rota"], dist_matrix),
+                                         limite_inferior)]
     
     if verbose:
         print(f"\n{'='*100}")
@@ -336,7 +1007,9 @@ def evolve_optimized(ceps: List[str], coords: List[Tuple[float,float]],
         print(f"  Mediana: {stats['mediana']:>15,.0f}")
         print(f"  Máximo:  {stats['maximo']:>15,.0f}")
         print(f"  Desvio:  {stats['desvio']:>15,.0f}")
-        print(f"  Viáveis: {stats['num_validos']:>3} / {len(pop):>3}")
+        print(f"  Viáveis: {stats['num_validos']:>3} / {len(rotas):>3}")
+        if limite_inferior is not None:
+            print(f"  Limite:  {limite_inferior:>15,.2f} km (Held-Karp) — gap {historico['gap'][0]:.2%}")
         print(f"{'='*100}\n")
     
     # Validação da escala
@@ -347,40 +1020,27 @@ def evolve_optimized(ceps: List[str], coords: List[Tuple[float,float]],
     
     # Evolução
     for gen in range(generations):
-        nova_pop = []
-        sorted_idx = sorted(range(len(pop)), key=lambda i: fitness[i])
-        
-        # ELITISMO
-        for i in range(Config.ELITISM_COUNT):
-            nova_pop.append({
-                "rota": pop[sorted_idx[i]]["rota"][:],
-                "velocidades": pop[sorted_idx[i]]["velocidades"][:]
-            })
+        proximo = 1 - atual
+        rotas = reproduzir(rotas, buffers[atual], np.asarray(fitness, dtype=np.float64),
+                           buffers[proximo], rng, idx_base, crossover, dist_matrix, vizinhos,
+                           seletor)
+        atual = proximo
         
-        # CROSSOVER + MUTAÇÃO
-        while len(nova_pop) < pop_size:
-            p1 = selecao_torneio(pop, fitness, Config.TOURNAMENT_SIZE)
-            p2 = selecao_torneio(pop, fitness, Config.TOURNAMENT_SIZE)
-            
-            if random.random() < Config.CROSSOVER_RATE:
-                c1, c2 = crossover_ox(p1, p2, idx_base)
-            else:
-                c1 = {"rota": p1["rota"][:], "velocidades": p1["velocidades"][:]}
-                c2 = {"rota": p2["rota"][:], "velocidades": p2["velocidades"][:]}
-            
-            mutacao_multipla(c1, Config.MUTATION_RATE_SWAP)
-            mutacao_multipla(c2, Config.MUTATION_RATE_SWAP)
-            
-            nova_pop.extend([c1, c2])
+        # LOCAL SEARCH nos melhores (elites ocupam as primeiras posições)
+        if (gen + 1) % Config.LOCAL_SEARCH_EVERY == 0:
+            for i in range(min(Config.LOCAL_SEARCH_ELITE, len(rotas))):
+                rotas[i] = busca_local_rota(rotas[i], dist_matrix, vizinhos)
         
-        # LOCAL SEARCH nos melhores
-        if (gen + 1) % 10 == 0:
-            for i in range(Config.LOCAL_SEARCH_ELITE):
-                if i < len(nova_pop):
-                    nova_pop[i] = local_search_2opt(nova_pop[i], dist_matrix)
+        if decodificar:
+            decodificar_populacao(rotas, buffers[atual], decodificar)
+        vel_listas = buffers[atual][:len(rotas)].tolist()
+        fitness = avaliar_populacao(rotas, vel_listas, coords, dist_matrix, wind_cache, split,
+                                    detalhado, direcoes)
         
-        pop = nova_pop[:pop_size]
-        fitness = [calcular_fitness(ind, coords, dist_matrix, wind_cache) for ind in pop]
+        # Crédito dos operadores (ganho dos filhos por segundo de CPU)
+        if seletor is not None:
+            seletor.creditar(fitness)
+            historico['prob_operadores'].append(seletor.probabilidades())
         
         # Estatísticas
         stats = calcular_estatisticas(fitness)
@@ -396,10 +1056,13 @@ def evolve_optimized(ceps: List[str], coords: List[Tuple[float,float]],
         if stats['minimo'] < melhor_fit and stats['minimo'] != float('inf'):
             melhoria = ((melhor_fit - stats['minimo']) / melhor_fit) * 100
             melhor_fit = stats['minimo']
-            melhor_idx = min(range(len(pop)), 
-                            key=lambda i: fitness[i] if fitness[i] != float('inf') else float('inf'))
-            melhor = {"rota": pop[melhor_idx]["rota"][:],
-                     "velocidades": pop[melhor_idx]["velocidades"][:]}
+            melhor_idx = int(np.argmin(fitness))
+            melhor = {"rota": rotas[melhor_idx][:],
+                     "velocidades": vel_listas[melhor_idx][:]}
+            if split:
+                melhor["recargas"] = split_recargas(melhor["rota"], melhor["velocidades"],
+                                                    dist_matrix,
+                                                    fisica=True if detalhado else None)
             geracoes_sem_melhoria = 0
             
             if verbose:
@@ -407,13 +1070,27 @@ def evolve_optimized(ceps: List[str], coords: List[Tuple[float,float]],
         else:
             geracoes_sem_melhoria += 1
         
+        if limite_inferior is not None:
+            historico['gap'].append(calcular_gap(distancia_rota(melhor["rota"], dist_matrix),
+                                                 limite_inferior))
+        
         # Monitoramento
         if verbose and (gen + 1) % Config.PRINT_EVERY == 0:
             print(f"Gen {gen+1:3d} | "
                   f"Min: {stats['minimo']:10,.0f} | "
                   f"Média: {stats['media']:10,.0f} | "
                   f"Desvio: {stats['desvio']:8,.0f} | "
-                  f"Viáveis: {stats['num_validos']}/{len(pop)}")
+                  f"Viáveis: {stats['num_validos']}/{len(rotas)}"
+                  + (f" | Gap: {historico['gap'][-1]:.2%}" if limite_inferior is not None else ""))
+        
+        # PARADA ANTECIPADA: distância comprovadamente a menos de tolerancia_gap do ótimo
+        if tolerancia_gap > 0 and limite_inferior is not None \
+                and historico['gap'][-1] <= tolerancia_gap:
+            historico['parada_gap'] = gen + 1
+            if verbose:
+                print(f"\nGen {gen+1:3d} | ✓ Gap {historico['gap'][-1]:.2%} ≤ "
+                      f"{tolerancia_gap:.2%}: parada antecipada")
+            break
         
         # DETECÇÃO DE ESTAGNAÇÃO (a cada 20 gerações)
         if (gen + 1) % Config.STAGNATION_CHECK == 0:
@@ -433,18 +1110,103 @@ def evolve_optimized(ceps: List[str], coords: List[Tuple[float,float]],
             
             # ESTRATÉGIAS ANTI-ESTAGNAÇÃO
             if estagnado:
-                # 1. Restart parcial
-                pop = restart_parcial(pop, fitness, n, idx_base)
+                # 1. Restart parcial (melhores mantidos, em ordem de fitness)
+                proximo = 1 - atual
+                num_manter = int(len(rotas) * (1 - Config.RESTART_PERCENTAGE))
+                manter = indices_elite(np.asarray(fitness, dtype=np.float64), num_manter)
+                np.take(buffers[atual], manter, axis=0, out=buffers[proximo][:num_manter],
+                        mode='clip')
+                novas = [rotas[i] for i in manter]
+                for i in range(num_manter, len(rotas)):
+                    c = criar_cromossomo(n, idx_base, _construtor_restart(curva, i - num_manter))
+                    novas.append(c["rota"])
+                    buffers[proximo][i] = c["velocidades"]
+                rotas = novas
+                atual = proximo
+                vel = buffers[atual][:len(rotas)]
+                
+                # 2. Hiper-mutação nos piores (cópia das rotas só se mutadas)
+                metade = len(rotas) // 2
+                piores = rotas[metade:]
+                for _ in range(3):
+                    mutacao_rotas_lote(piores, Config.HYPERMUTATION_RATE, rng,
+                                       compartilhadas=[True] * len(piores))
+                    mutacao_velocidades_lote(vel[metade:], Config.HYPERMUTATION_RATE, rng)
+                rotas[metade:] = piores
                 
-                # 2. Hiper-mutação nos piores
-                for i in range(len(pop) // 2, len(pop)):
-                    hypermutation(pop[i])
+                # 3. LNS (ruína e recriação) a partir do melhor, no lugar do último
+                if Config.LNS_TEMPO_SEG > 0:
+                    rotas[-1] = lns(rotas[0], dist_matrix, vizinhos, Config.LNS_TEMPO_SEG,
+                                    Config.LNS_MIN_REMOVER, Config.LNS_MAX_REMOVER)
+                    vel[-1] = vel[0]
                 
                 # Recalcula fitness
-                fitness = [calcular_fitness(ind, coords, dist_matrix, wind_cache) for ind in pop]
+                if decodificar:
+                    decodificar_populacao(rotas, vel, decodificar)
+                vel_listas = vel.tolist()
+                fitness = avaliar_populacao(rotas, vel_listas, coords, dist_matrix, wind_cache, split,
+                                            detalhado, direcoes)
                 
                 if verbose:
                     print(f"  → Restart parcial aplicado ({Config.RESTART_PERCENTAGE*100:.0f}% novos)")
                     print(f"  → Hiper-mutação aplicada em 50% da população")
+                    if Config.LNS_TEMPO_SEG > 0:
+                        print(f"  → LNS ({Config.LNS_TEMPO_SEG:g}s) a partir do melhor indivíduo")
+    
+    historico['populacao'] = [{"rota": rotas[i], "velocidades": vel_listas[i]}
+                              for i in np.argsort(fitness, kind='stable')]
+    if detalhado:
+        historico['avaliacoes_fisica'] = detalhado.cache_info().misses
+        if verbose:
+            uso = detalhado.cache_info()
+            print(f"\nAvaliação em duas camadas: {uso.misses:,} simulações com física "
+                  f"({uso.hits:,} reaproveitadas do cache)")
+    
+    # BUSCA PROFUNDA no elite final (tempo dividido entre os elites)
+    if tempo_busca_profunda > 0:
+        elite = [melhor] + [{"rota": rotas[i], "velocidades": vel_listas[i]}
+                            for i in indices_elite(np.asarray(fitness, dtype=np.float64),
+                                                   Config.LOCAL_SEARCH_ELITE - 1)]
+        tempo = tempo_busca_profunda / len(elite)
+        
+        for ind in elite:
+            novo = local_search_profunda(ind, dist_matrix, tempo, vizinhos)
+            if split:
+                novo["recargas"] = split_recargas(novo["rota"], novo["velocidades"], dist_matrix,
+                                                  fisica=True if detalhado else None)
+            fit = (detalhado(novo["rota"], novo["velocidades"]) if detalhado
+                   else calcular_fitness(novo, coords, dist_matrix, wind_cache,
+                                         direcoes=direcoes))
+            if fit < melhor_fit:
+                melhor, melhor_fit = novo, fit
+        
+        if verbose:
+            print(f"\nBusca profunda ({tempo_busca_profunda:g}s em {len(elite)} elites): "
+                  f"{melhor_fit:,.0f}")
+    
+    # VELOCIDADES ÓTIMAS (DP) para a rota final (com a física, se a
+    # seleção foi pela física)
+    fisica = True if detalhado else None
+    if velocidades_dp != "off":
+        fit_antes = melhor_fit
+        planejar = ((lambda rota, vel: split_recargas(rota, vel, dist_matrix, fisica=fisica))
+                    if split else None)
+        melhor, melhor_fit = polir_velocidades(melhor, coords, dist_matrix, wind_cache, fisica,
+                                               planejar, direcoes)
+        if verbose and melhor_fit < fit_antes:
+            print(f"\nVelocidades por DP: {fit_antes:,.0f} → {melhor_fit:,.0f}")
+    
+    # PONTOS DE RECARGA ÓTIMOS para a rota final (simulação detalhada)
+    if recargas_otimas != "off":
+        melhor, _ = otimizar_recargas(melhor, ceps, coords, dist_matrix, wind_cache, direcoes)
+        melhor_fit = calcular_fitness(melhor, coords, dist_matrix, wind_cache, fisica, direcoes)
+        if verbose and "recargas" in melhor:
+            print(f"\nRecargas por split: {len(melhor['recargas'])} pousos planejados")
+    
+    if seletor is not None:
+        historico['operadores'] = seletor.estatisticas()
+        if verbose:
+            print(f"\nSeleção adaptativa de operadores:")
+            imprimir_estatisticas(historico['operadores'])
     
     return melhor, melhor_fit, historico
\ No newline at end of file
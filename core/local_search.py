@@ -0,0 +1,775 @@
+# local_search.py - BUSCA LOCAL COM LISTAS DE VIZINHOS
+"""
+Operadores de busca local para a rota (TSP fechado na Unibrasil).
+
+A rota é tratada como um ciclo: `tour` é a rota sem o retorno final à base
+e `pos[cidade]` guarda a posição de cada cidade no tour, o que torna O(1)
+as consultas de sucessor/predecessor. Os candidatos de cada movimento vêm
+das listas de k vizinhos mais próximos (build_knn_lists), e os
+"don't-look bits" (fila de cidades ativas) evitam reexaminar cidades
+cujo entorno não mudou.
+"""
+import heapq
+import random
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+import numpy as np
+from data_loader import build_knn_lists
+
+# Ganho mínimo para aceitar um movimento (evita ciclos por arredondamento)
+EPS = 1e-10
+
+
+def preparar_vizinhos(dist_matrix: List[List[float]], vizinhos=None, k: int = None) -> List[List[int]]:
+    """
+    Listas de vizinhos no formato usado pelos operadores (lista de listas).
+
+    Args:
+        dist_matrix: Matriz de distâncias NxN
+        vizinhos: Listas já calculadas (array (n, k) ou lista), opcional
+        k: Número de vizinhos se for preciso calcular (default: Config.KNN_VIZINHOS)
+
+    Returns:
+        vizinhos[i] = lista de vizinhos de i ordenados por distância
+    """
+    if vizinhos is None:
+        vizinhos = build_knn_lists(dist_matrix, k)
+    if isinstance(vizinhos, np.ndarray):
+        vizinhos = vizinhos.tolist()
+    return vizinhos
+
+
+def _posicoes(tour: List[int], n_total: int) -> List[int]:
+    """Posição de cada cidade no tour (-1 para cidades fora do tour)"""
+    pos = [-1] * n_total
+    for p, cidade in enumerate(tour):
+        pos[cidade] = p
+    return pos
+
+
+def _fechar_rota(tour: List[int], pos: List[int], base: int) -> List[int]:
+    """Rotaciona o tour para começar na base e fecha a rota"""
+    k = pos[base]
+    return tour[k:] + tour[:k] + [base]
+
+
+def _inverter(tour: List[int], pos: List[int], i: int, j: int) -> None:
+    """Inverte o trecho circular do tour entre as posições i e j (inclusive)"""
+    n = len(tour)
+    comprimento = (j - i) % n + 1
+
+    for _ in range(comprimento // 2):
+        a = tour[i]
+        b = tour[j]
+        tour[i] = b
+        tour[j] = a
+        pos[b] = i
+        pos[a] = j
+
+        i += 1
+        if i == n:
+            i = 0
+        j -= 1
+        if j < 0:
+            j = n - 1
+
+
+def _mover_2opt(tour: List[int], pos: List[int], a: int, c: int) -> Tuple[int, int]:
+    """
+    Movimento 2-opt: remove (a, suc(a)) e (c, suc(c)) e adiciona
+    (a, c) e (suc(a), suc(c)). Inverte o menor dos dois lados do ciclo.
+
+    Retorna o trecho (i, j) invertido; inverter o mesmo trecho desfaz o movimento.
+    """
+    n = len(tour)
+    i = pos[a] + 1
+    if i == n:
+        i = 0
+    j = pos[c]
+
+    if 2 * ((j - i) % n + 1) > n:
+        i = pos[c] + 1
+        if i == n:
+            i = 0
+        j = pos[a]
+
+    _inverter(tour, pos, i, j)
+    return i, j
+
+
+def _fila_inicial(tour: List[int], n_total: int):
+    """Fila com todas as cidades do tour ativas (don't-look bits desligados)"""
+    na_fila = [False] * n_total
+    for cidade in tour:
+        na_fila[cidade] = True
+    return deque(tour), na_fila
+
+
+def _ativar(fila: deque, na_fila: List[bool], cidades) -> None:
+    """Recoloca cidades na fila (limpa seus don't-look bits)"""
+    for cidade in cidades:
+        if not na_fila[cidade]:
+            na_fila[cidade] = True
+            fila.append(cidade)
+
+
+def _two_opt_fila(tour: List[int], pos: List[int], d: List[List[float]],
+                  vizinhos: List[List[int]], fila: deque, na_fila: List[bool],
+                  primeira_melhoria: bool = True) -> float:
+    """Laço do 2-opt sobre as cidades ativas; retorna o ganho total (km)"""
+    n = len(tour)
+    ganho_total = 0.0
+
+    while fila:
+        a = fila.popleft()
+        na_fila[a] = False
+
+        melhor = None
+        melhor_ganho = EPS
+
+        for sentido in (1, -1):
+            a2 = tour[(pos[a] + sentido) % n]
+            d_a = d[a][a2]
+
+            for c in vizinhos[a]:
+                d_ac = d[a][c]
+                if d_ac >= d_a:
+                    break
+
+                pc = pos[c]
+                if pc < 0:
+                    continue
+
+                c2 = tour[(pc + sentido) % n]
+                if c2 == a or c == a2:
+                    continue
+
+                ganho = d_a + d[c][c2] - d_ac - d[a2][c2]
+                if ganho > melhor_ganho:
+                    melhor_ganho = ganho
+                    melhor = (sentido, a2, c, c2)
+                    if primeira_melhoria:
+                        break
+
+            if melhor is not None and primeira_melhoria:
+                break
+
+        if melhor is None:
+            continue
+
+        sentido, a2, c, c2 = melhor
+        if sentido == 1:
+            _mover_2opt(tour, pos, a, c)
+        else:
+            _mover_2opt(tour, pos, a2, c2)
+
+        ganho_total += melhor_ganho
+        _ativar(fila, na_fila, (a, a2, c, c2))
+
+    return ganho_total
+
+
+def two_opt_vizinhanca(rota: List[int], dist_matrix: List[List[float]],
+                       vizinhos: List[List[int]],
+                       primeira_melhoria: bool = True) -> List[int]:
+    """
+    2-OPT COM LISTAS DE VIZINHOS E DON'T-LOOK BITS
+
+    Para cada cidade ativa `a`, testa as novas arestas (a, c) com c entre
+    os vizinhos de a, nos dois sentidos do ciclo. Como as listas estão
+    ordenadas, a busca para assim que d(a, c) >= d(a, vizinho atual de a)
+    (ganho parcial não positivo). Um movimento aplicado reativa apenas as
+    quatro cidades envolvidas, sem reiniciar a varredura.
+
+    Args:
+        rota: Rota fechada [base, ..., base]
+        dist_matrix: Matriz de distâncias NxN
+        vizinhos: Listas de vizinhos (ver preparar_vizinhos)
+        primeira_melhoria: Se True, aplica o primeiro movimento de melhoria
+                           encontrado; se False, o melhor entre os candidatos
+                           da cidade
+
+    Returns:
+        Nova rota fechada, começando e terminando na base
+    """
+    base = rota[0]
+    tour = rota[:-1]
+
+    if len(tour) < 4:
+        return rota[:]
+
+    pos = _posicoes(tour, len(dist_matrix))
+    fila, na_fila = _fila_inicial(tour, len(dist_matrix))
+    _two_opt_fila(tour, pos, dist_matrix, vizinhos, fila, na_fila, primeira_melhoria)
+
+    return _fechar_rota(tour, pos, base)
+
+
+def _melhor_insercao(tour: List[int], pos: List[int], d: List[List[float]],
+                     vizinhos: List[List[int]], p: int, L: int,
+                     limite: float) -> Optional[Tuple[float, int, bool]]:
+    """
+    Melhor ponto de inserção do segmento tour[p:p+L] entre os vizinhos
+    das suas pontas.
+
+    Cada candidato é uma aresta (x, suc(x)) com x ou suc(x) vizinho de uma
+    das pontas do segmento, fora do segmento e diferente da lacuna
+    deixada por ele. O custo de cada inserção é calculado em O(1), nas
+    duas orientações do segmento.
+
+    Args:
+        limite: Só aceita inserções com custo menor que este valor
+
+    Returns:
+        (custo, x, invertido) ou None se nenhuma inserção ficar abaixo do limite
+    """
+    n = len(tour)
+    s1 = tour[p]
+    sL = tour[p + L - 1]
+    anterior = tour[p - 1]
+    proximo = tour[(p + L) % n]
+
+    melhor = None
+    melhor_custo = limite
+
+    for ponta in (s1, sL):
+        for c in vizinhos[ponta]:
+            if d[ponta][c] >= melhor_custo:
+                break
+
+            pc = pos[c]
+            if pc < 0 or p <= pc < p + L:
+                continue
+
+            # Arestas (pred(c), c) e (c, suc(c))
+            for x in (tour[pc - 1], c):
+                if x == anterior:
+                    continue
+
+                px = pos[x]
+                if p <= px < p + L:
+                    continue
+
+                y = tour[(px + 1) % n]
+                if p <= pos[y] < p + L:
+                    continue
+
+                d_xy = d[x][y]
+                custo = d[x][s1] + d[sL][y] - d_xy
+                if custo < melhor_custo:
+                    melhor_custo = custo
+                    melhor = (custo, x, False)
+
+                custo = d[x][sL] + d[s1][y] - d_xy
+                if custo < melhor_custo:
+                    melhor_custo = custo
+                    melhor = (custo, x, True)
+
+    return melhor
+
+
+def _mover_segmento(tour: List[int], pos: List[int], p: int, L: int,
+                    x: int, invertido: bool) -> None:
+    """Move tour[p:p+L] para logo após a cidade x (segmento sem volta circular)"""
+    segmento = tour[p:p + L]
+    if invertido:
+        segmento.reverse()
+
+    del tour[p:p + L]
+    q = pos[x] - L + 1 if pos[x] > p else pos[x] + 1
+    tour[q:q] = segmento
+
+    inicio = min(p, q)
+    fim = max(p, q) + L
+    for k in range(inicio, fim):
+        pos[tour[k]] = k
+
+
+def _or_opt_fila(tour: List[int], pos: List[int], d: List[List[float]],
+                 vizinhos: List[List[int]], fila: deque, na_fila: List[bool],
+                 max_segmento: int = 3) -> float:
+    """Laço do Or-opt sobre as cidades ativas; retorna o ganho total (km)"""
+    n = len(tour)
+    ganho_total = 0.0
+
+    while fila:
+        s1 = fila.popleft()
+        na_fila[s1] = False
+
+        for L in range(1, min(max_segmento, n - 3) + 1):
+            p = pos[s1]
+            if p + L > n:
+                break
+
+            anterior = tour[p - 1]
+            proximo = tour[(p + L) % n]
+            sL = tour[p + L - 1]
+            ganho_remocao = d[anterior][s1] + d[sL][proximo] - d[anterior][proximo]
+
+            if ganho_remocao <= EPS:
+                continue
+
+            insercao = _melhor_insercao(tour, pos, d, vizinhos, p, L, ganho_remocao - EPS)
+            if insercao is None:
+                continue
+
+            custo, x, invertido = insercao
+            y = tour[(pos[x] + 1) % n]
+            _mover_segmento(tour, pos, p, L, x, invertido)
+
+            ganho_total += ganho_remocao - custo
+            _ativar(fila, na_fila, (s1, sL, anterior, proximo, x, y))
+            break
+
+    return ganho_total
+
+
+def or_opt_vizinhanca(rota: List[int], dist_matrix: List[List[float]],
+                      vizinhos: List[List[int]], max_segmento: int = 3) -> List[int]:
+    """
+    OR-OPT COM LISTAS DE VIZINHOS E DON'T-LOOK BITS
+
+    Realoca segmentos de 1 a `max_segmento` paradas consecutivas (podendo
+    invertê-los) para a melhor posição entre os vizinhos das suas pontas.
+    O ganho é avaliado em O(1):
+        ganho = d(ant, s1) + d(sL, prox) - d(ant, prox)   (remoção)
+              - [d(x, s1) + d(sL, y) - d(x, y)]           (inserção)
+
+    Args:
+        rota: Rota fechada [base, ..., base]
+        dist_matrix: Matriz de distâncias NxN
+        vizinhos: Listas de vizinhos (ver preparar_vizinhos)
+        max_segmento: Tamanho máximo do segmento realocado
+
+    Returns:
+        Nova rota fechada, começando e terminando na base
+    """
+    base = rota[0]
+    tour = rota[:-1]
+
+    if len(tour) < 5:
+        return rota[:]
+
+    pos = _posicoes(tour, len(dist_matrix))
+    fila, na_fila = _fila_inicial(tour, len(dist_matrix))
+    _or_opt_fila(tour, pos, dist_matrix, vizinhos, fila, na_fila, max_segmento)
+
+    return _fechar_rota(tour, pos, base)
+
+
+def mutacao_or_opt(rota: List[int], dist_matrix: List[List[float]],
+                   vizinhos: List[List[int]], max_segmento: int = 3) -> None:
+    """
+    MUTAÇÃO OR-OPT (in-place)
+
+    Sorteia um segmento de 1 a `max_segmento` paradas (sem a base) e o
+    reinsere, na orientação mais barata, na melhor posição entre os
+    vizinhos das suas pontas, mesmo que a rota piore.
+    """
+    n = len(rota) - 1
+    L = random.randint(1, max_segmento)
+    if n - 1 < L + 2:
+        return
+
+    tour = rota[:-1]
+    pos = _posicoes(tour, len(dist_matrix))
+    p = random.randint(1, n - L)
+
+    insercao = _melhor_insercao(tour, pos, dist_matrix, vizinhos, p, L, float('inf'))
+    if insercao is None:
+        return
+
+    _, x, invertido = insercao
+    _mover_segmento(tour, pos, p, L, x, invertido)
+    rota[:] = _fechar_rota(tour, pos, rota[0])
+
+
+def _aresta(a: int, b: int) -> Tuple[int, int]:
+    return (a, b) if a < b else (b, a)
+
+
+def _lk_passo(tour: List[int], pos: List[int], d: List[List[float]],
+              vizinhos: List[List[int]], t1: int, profundidade: int):
+    """
+    Cadeia de movimentos 2-opt no estilo Lin-Kernighan a partir de t1.
+
+    Remove (t1, t2) e, a cada nível, escolhe t3 entre os vizinhos de t2
+    com ganho parcial G - d(t2, t3) > 0; o movimento adiciona (t2, t3) e
+    (t1, t4), e (t1, t4) é reaberta no nível seguinte com t2 := t4.
+    Arestas adicionadas na cadeia não são removidas de novo. Ao final,
+    os movimentos além do melhor fechamento são desfeitos.
+
+    Returns:
+        (ganho, cidades tocadas); ganho 0 se nenhuma melhoria
+    """
+    n = len(tour)
+
+    for sentido in (1, -1):
+        t2 = tour[(pos[t1] + sentido) % n]
+        G = d[t1][t2]
+        movimentos = []
+        adicionadas = set()
+        tocadas = [t1, t2]
+        melhor_ganho = EPS
+        melhor_nivel = 0
+
+        for _ in range(profundidade):
+            sucessor = tour[(pos[t1] + 1) % n] == t2
+
+            escolha = None
+            melhor_valor = -float('inf')
+            for t3 in vizinhos[t2]:
+                g1 = G - d[t2][t3]
+                if g1 <= EPS:
+                    break
+
+                p3 = pos[t3]
+                if p3 < 0 or t3 == t1:
+                    continue
+
+                t4 = tour[p3 - 1] if sucessor else tour[(p3 + 1) % n]
+                if t4 == t2 or _aresta(t3, t4) in adicionadas:
+                    continue
+
+                valor = g1 + d[t3][t4]
+                if valor > melhor_valor:
+                    melhor_valor = valor
+                    escolha = (t3, t4, g1)
+
+            if escolha is None:
+                break
+
+            t3, t4, g1 = escolha
+            if sucessor:
+                movimentos.append(_mover_2opt(tour, pos, t1, t4))
+            else:
+                movimentos.append(_mover_2opt(tour, pos, t2, t3))
+
+            adicionadas.add(_aresta(t2, t3))
+            tocadas.extend((t3, t4))
+            G = g1 + d[t3][t4]
+
+            fechamento = G - d[t4][t1]
+            if fechamento > melhor_ganho:
+                melhor_ganho = fechamento
+                melhor_nivel = len(movimentos)
+
+            t2 = t4
+
+        for i, j in reversed(movimentos[melhor_nivel:]):
+            _inverter(tour, pos, i, j)
+
+        if melhor_nivel > 0:
+            return melhor_ganho, tocadas
+
+    return 0.0, []
+
+
+def _lk_fila(tour: List[int], pos: List[int], d: List[List[float]],
+             vizinhos: List[List[int]], fila: deque, na_fila: List[bool],
+             profundidade: int = 5) -> float:
+    """Laço do LK (cadeias de 2-opt) sobre as cidades ativas; retorna o ganho total"""
+    ganho_total = 0.0
+
+    while fila:
+        t1 = fila.popleft()
+        na_fila[t1] = False
+
+        ganho, tocadas = _lk_passo(tour, pos, d, vizinhos, t1, profundidade)
+        if ganho > 0:
+            ganho_total += ganho
+            _ativar(fila, na_fila, tocadas)
+
+    return ganho_total
+
+
+def _otimizar_trecho(tour: List[int], pos: List[int], d: List[List[float]],
+                     vizinhos: List[List[int]], cidades, profundidade: int,
+                     max_segmento: int) -> float:
+    """LK seguido de Or-opt a partir das cidades dadas, até não haver ganho"""
+    ganho_total = 0.0
+    na_fila = [False] * len(d)
+
+    while True:
+        fila = deque()
+        _ativar(fila, na_fila, cidades)
+        ganho = _lk_fila(tour, pos, d, vizinhos, fila, na_fila, profundidade)
+
+        _ativar(fila, na_fila, cidades)
+        ganho += _or_opt_fila(tour, pos, d, vizinhos, fila, na_fila, max_segmento)
+
+        ganho_total += ganho
+        if ganho <= EPS:
+            return ganho_total
+
+
+def _double_bridge_local(tour: List[int], pos: List[int], d: List[List[float]],
+                         janela: int = 50):
+    """
+    Perturbação double-bridge (A B C D -> A C B D) restrita a uma janela
+    do tour, para que a reotimização seja local.
+
+    Returns:
+        (variação do custo, pontas das arestas alteradas)
+    """
+    n = len(tour)
+    inicio = random.randint(1, n - 4)
+    fim = min(n, inicio + janela)
+    x, y, z = sorted(random.sample(range(inicio, fim + 1), 3))
+
+    a, b = tour[x - 1], tour[x]
+    c, e = tour[y - 1], tour[y]
+    f, g = tour[z - 1], tour[z % n]
+    delta = (d[a][e] + d[f][b] + d[c][g]) - (d[a][b] + d[c][e] + d[f][g])
+
+    tour[x:z] = tour[y:z] + tour[x:y]
+    for k in range(x, z):
+        pos[tour[k]] = k
+
+    return delta, [a, b, c, e, f, g]
+
+
+def busca_profunda(rota: List[int], dist_matrix: List[List[float]],
+                   vizinhos: List[List[int]], tempo_limite_seg: float,
+                   profundidade: int = 5, max_segmento: int = 3,
+                   max_iteracoes: Optional[int] = None) -> List[int]:
+    """
+    BUSCA PROFUNDA (LK + Or-opt iterados)
+
+    Otimiza a rota até o ótimo local de cadeias 2-opt no estilo
+    Lin-Kernighan (_lk_passo) e de Or-opt, e depois repete
+    perturbação double-bridge local + reotimização das pontas alteradas
+    enquanto houver tempo, aceitando apenas melhorias.
+
+    Args:
+        rota: Rota fechada [base, ..., base]
+        dist_matrix: Matriz de distâncias NxN
+        vizinhos: Listas de vizinhos (ver preparar_vizinhos)
+        tempo_limite_seg: Tempo máximo de parede (segundos)
+        profundidade: Número máximo de movimentos encadeados no LK
+        max_segmento: Tamanho máximo do segmento do Or-opt
+        max_iteracoes: Limite opcional de perturbações
+
+    Returns:
+        Melhor rota fechada encontrada, começando e terminando na base
+    """
+    limite = time.perf_counter() + tempo_limite_seg
+    base = rota[0]
+    tour = rota[:-1]
+
+    if len(tour) < 5:
+        return rota[:]
+
+    pos = _posicoes(tour, len(dist_matrix))
+    custo = distancia_rota(rota, dist_matrix)
+    custo -= _otimizar_trecho(tour, pos, dist_matrix, vizinhos, tour[:],
+                              profundidade, max_segmento)
+
+    melhor_tour = tour[:]
+    melhor_custo = custo
+    iteracao = 0
+
+    while time.perf_counter() < limite and len(tour) >= 8:
+        if max_iteracoes is not None and iteracao >= max_iteracoes:
+            break
+        iteracao += 1
+
+        delta, pontas = _double_bridge_local(tour, pos, dist_matrix)
+        custo += delta
+        custo -= _otimizar_trecho(tour, pos, dist_matrix, vizinhos, pontas,
+                                  profundidade, max_segmento)
+
+        if custo < melhor_custo - EPS:
+            melhor_custo = custo
+            melhor_tour = tour[:]
+        elif tour != melhor_tour:
+            tour[:] = melhor_tour
+            for k, cidade in enumerate(tour):
+                pos[cidade] = k
+            custo = melhor_custo
+
+    return _fechar_rota(melhor_tour, _posicoes(melhor_tour, len(dist_matrix)), base)
+
+
+def _remover_cluster(tour: List[int], d: List[List[float]], base: int,
+                     n_remover: int) -> List[int]:
+    """Sorteia uma semente e retorna ela e as paradas mais próximas (sem a base)"""
+    semente = random.choice([c for c in tour if c != base])
+    linha = d[semente]
+    return heapq.nsmallest(n_remover, (c for c in tour if c != base),
+                           key=linha.__getitem__)
+
+
+def _custos_insercao(c: int, d: List[List[float]], vizinhos: List[List[int]],
+                     suc: List[int], ant: List[int], no_tour: List[bool]):
+    """
+    Dois menores custos de inserção de c e a aresta (x, suc(x)) do menor.
+    Arestas candidatas: as que tocam vizinhos de c já no tour; sem nenhum
+    vizinho no tour, varre todas as arestas.
+    """
+    candidatos = [x for x in vizinhos[c] if no_tour[x]]
+    if not candidatos:
+        candidatos = [x for x in range(len(d)) if no_tour[x]]
+
+    melhor = segundo = float('inf')
+    melhor_x = -1
+    vistos = set()
+    dc = d[c]
+
+    for x in candidatos:
+        for a in (ant[x], x):
+            if a in vistos:
+                continue
+            vistos.add(a)
+            b = suc[a]
+            custo = dc[a] + dc[b] - d[a][b]
+            if custo < melhor:
+                segundo = melhor
+                melhor = custo
+                melhor_x = a
+            elif custo < segundo:
+                segundo = custo
+
+    return melhor, segundo, melhor_x
+
+
+def _ruina_recriacao(rota: List[int], dist_matrix: List[List[float]],
+                     vizinhos: List[List[int]], n_remover: int, regret: bool):
+    """Ruína e recriação; retorna (nova rota, paradas reinseridas)"""
+    base = rota[0]
+    tour = rota[:-1]
+    n_remover = min(n_remover, len(tour) - 3)
+
+    if n_remover < 1:
+        return rota[:], []
+
+    removidas = _remover_cluster(tour, dist_matrix, base, n_remover)
+    n_total = len(dist_matrix)
+    no_tour = [False] * n_total
+    for c in tour:
+        no_tour[c] = True
+    for c in removidas:
+        no_tour[c] = False
+
+    restante = [c for c in tour if no_tour[c]]
+    suc = [-1] * n_total
+    ant = [-1] * n_total
+    for i, c in enumerate(restante):
+        proximo = restante[(i + 1) % len(restante)]
+        suc[c] = proximo
+        ant[proximo] = c
+
+    def inserir(c, a):
+        b = suc[a]
+        suc[a] = c
+        ant[c] = a
+        suc[c] = b
+        ant[b] = c
+        no_tour[c] = True
+
+    if regret:
+        pendentes = set(removidas)
+        while pendentes:
+            escolha = None
+            maior_regret = -float('inf')
+            for c in pendentes:
+                melhor, segundo, a = _custos_insercao(c, dist_matrix, vizinhos, suc, ant, no_tour)
+                r = segundo - melhor
+                if r > maior_regret:
+                    maior_regret = r
+                    escolha = (c, a)
+            c, a = escolha
+            inserir(c, a)
+            pendentes.discard(c)
+    else:
+        removidas = removidas[:]
+        random.shuffle(removidas)
+        for c in removidas:
+            _, _, a = _custos_insercao(c, dist_matrix, vizinhos, suc, ant, no_tour)
+            inserir(c, a)
+
+    nova = [base]
+    c = suc[base]
+    while c != base:
+        nova.append(c)
+        c = suc[c]
+    nova.append(base)
+    return nova, removidas
+
+
+def ruina_recriacao(rota: List[int], dist_matrix: List[List[float]],
+                    vizinhos: List[List[int]], n_remover: int,
+                    regret: bool = False) -> List[int]:
+    """
+    RUÍNA E RECRIAÇÃO (LNS)
+
+    Remove um grupo espacialmente concentrado de `n_remover` paradas (uma
+    semente aleatória e as mais próximas dela) e as reinsere uma a uma:
+      - inserção mais barata (regret=False), em ordem aleatória;
+      - regret-2 (regret=True): insere primeiro a parada com maior
+        diferença entre a segunda e a melhor posição.
+    O tour parcial é mantido como lista duplamente encadeada (suc/ant),
+    o que torna cada inserção O(1).
+
+    Returns:
+        Nova rota fechada, começando e terminando na base
+    """
+    return _ruina_recriacao(rota, dist_matrix, vizinhos, n_remover, regret)[0]
+
+
+def mutacao_ruina_recriacao(rota: List[int], dist_matrix: List[List[float]],
+                            vizinhos: List[List[int]], min_remover: int = 5,
+                            max_remover: int = 50) -> None:
+    """MUTAÇÃO RUÍNA E RECRIAÇÃO (in-place), inserção mais barata ou regret-2"""
+    n_remover = random.randint(min_remover, max_remover)
+    rota[:] = ruina_recriacao(rota, dist_matrix, vizinhos, n_remover,
+                              regret=random.random() < 0.5)
+
+
+def lns(rota: List[int], dist_matrix: List[List[float]], vizinhos: List[List[int]],
+        tempo_limite_seg: float, min_remover: int = 5, max_remover: int = 50,
+        max_iteracoes: Optional[int] = None) -> List[int]:
+    """
+    LNS (laço de ruína e recriação)
+
+    A cada iteração aplica ruína e recriação (inserção mais barata ou
+    regret-2, sorteado) seguida de 2-opt a partir das paradas reinseridas,
+    e aceita o resultado se não for pior. Para no tempo de parede ou em
+    `max_iteracoes`.
+
+    Returns:
+        Melhor rota fechada encontrada
+    """
+    limite = time.perf_counter() + tempo_limite_seg
+    melhor = rota[:]
+    melhor_custo = distancia_rota(melhor, dist_matrix)
+    iteracao = 0
+
+    while time.perf_counter() < limite:
+        if max_iteracoes is not None and iteracao >= max_iteracoes:
+            break
+        iteracao += 1
+
+        n_remover = random.randint(min_remover, max_remover)
+        nova, reinseridas = _ruina_recriacao(melhor, dist_matrix, vizinhos, n_remover,
+                                             random.random() < 0.5)
+
+        tour = nova[:-1]
+        pos = _posicoes(tour, len(dist_matrix))
+        na_fila = [False] * len(dist_matrix)
+        fila = deque()
+        _ativar(fila, na_fila, reinseridas)
+        _two_opt_fila(tour, pos, dist_matrix, vizinhos, fila, na_fila)
+        nova = _fechar_rota(tour, pos, nova[0])
+
+        custo = distancia_rota(nova, dist_matrix)
+        if custo <= melhor_custo + EPS:
+            melhor, melhor_custo = nova, custo
+
+    return melhor
+
+
+def distancia_rota(rota: List[int], dist_matrix: List[List[float]]) -> float:
+    """Comprimento total da rota em km"""
+    return sum(dist_matrix[rota[i]][rota[i + 1]] for i in range(len(rota) - 1))
@@ -0,0 +1,129 @@
+"""
+LIMITE INFERIOR DA DISTÂNCIA (1-ÁRVORE / HELD-KARP LAGRANGIANO)
+
+Toda rota fechada é uma 1-árvore: uma árvore geradora mínima (MST) sobre
+as paradas sem a base, mais as duas arestas da base. O comprimento da
+menor 1-árvore é, portanto, um limite inferior da menor rota.
+
+O limite de Held-Karp aperta a 1-árvore com multiplicadores π (um por
+parada): com custos d[i][j] + π[i] + π[j], toda rota ganha exatamente
+2·Σπ, então
+
+    w(π) = L(1-árvore com custos penalizados) - 2·Σπ  ≤  rota ótima
+
+para qualquer π. O subgradiente de w é (grau - 2) de cada parada; a
+otimização sobe por ele com passo de Polyak
+t = λ · (limite_superior - w) / ‖grau - 2‖², reduzindo λ pela metade
+quando w para de melhorar. A MST é um Prim denso com as chaves
+atualizadas em NumPy (O(n²) por iteração, sem montar a matriz
+penalizada).
+
+O gap (distância do melhor - limite) / limite é um certificado: com gap
+de 1%, nenhuma rota é mais de 1% mais curta que a encontrada.
+"""
+
+from typing import List, Tuple
+import numpy as np
+from config import Config
+from construction import vizinho_mais_proximo
+from local_search import distancia_rota
+
+
+def _um_arvore(d_nos: np.ndarray, d_base: np.ndarray,
+               pi: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Menor 1-árvore com custos d[i][j] + π[i] + π[j]
+
+    d_nos: distâncias entre as paradas (sem a base); d_base: da base
+    a cada parada
+
+    Returns:
+        (comprimento penalizado, grau de cada parada)
+    """
+    m = len(d_nos)
+    chave = d_nos[0] + pi[0] + pi
+    pai = np.zeros(m, dtype=np.int64)
+    fora = np.ones(m, dtype=bool)
+    fora[0] = False
+    chave[0] = np.inf
+    total = 0.0
+
+    for _ in range(m - 1):
+        j = int(np.argmin(chave))
+        total += chave[j]
+        chave[j] = np.inf
+        fora[j] = False
+        novo = d_nos[j] + pi[j] + pi
+        melhora = fora & (novo < chave)
+        chave[melhora] = novo[melhora]
+        pai[melhora] = j
+
+    grau = np.bincount(pai[1:], minlength=m)
+    grau[1:] += 1
+
+    # Duas arestas mais baratas da base
+    custo_base = d_base + pi
+    duas = np.argpartition(custo_base, 2)[:2]
+    grau[duas] += 1
+    return total + float(custo_base[duas].sum()), grau
+
+
+def limite_held_karp(dist_matrix: List[List[float]], idx_base: int,
+                     limite_superior: float = None, iteracoes: int = None,
+                     paciencia: int = 10) -> Tuple[float, np.ndarray]:
+    """
+    Limite inferior de Held-Karp para o comprimento da rota (km)
+
+    limite_superior: comprimento de uma rota conhecida, usado no passo do
+    subgradiente (default: vizinho mais próximo)
+    iteracoes: passos do subgradiente (default: Config.LIMITE_INFERIOR_ITERACOES;
+    0 = só a 1-árvore)
+    paciencia: passos sem melhora antes de reduzir λ pela metade
+
+    Returns:
+        (limite, π dos melhores multiplicadores, um por parada sem a base)
+    """
+    if iteracoes is None:
+        iteracoes = Config.LIMITE_INFERIOR_ITERACOES
+
+    n = len(dist_matrix)
+    d = np.asarray(dist_matrix, dtype=np.float64)
+    nos = np.array([i for i in range(n) if i != idx_base], dtype=np.int64)
+    m = len(nos)
+    if m <= 2:
+        # Uma única rota possível: o limite é ela mesma
+        return distancia_rota([idx_base, *nos.tolist(), idx_base], dist_matrix), np.zeros(m)
+
+    d_nos = d[np.ix_(nos, nos)]
+    d_base = d[idx_base, nos]
+    if limite_superior is None:
+        limite_superior = distancia_rota(vizinho_mais_proximo(d, idx_base), dist_matrix)
+
+    pi = np.zeros(m)
+    melhor, melhor_pi = -np.inf, pi
+    lam, sem_melhora = 2.0, 0
+
+    for _ in range(max(iteracoes, 1)):
+        comprimento, grau = _um_arvore(d_nos, d_base, pi)
+        w = comprimento - 2.0 * pi.sum()
+        if w > melhor:
+            melhor, melhor_pi = w, pi.copy()
+            sem_melhora = 0
+        else:
+            sem_melhora += 1
+            if sem_melhora >= paciencia:
+                lam, sem_melhora = lam / 2, 0
+
+        g = grau - 2
+        norma = float(g @ g)
+        folga = limite_superior - w
+        if norma == 0 or folga <= 1e-9 * limite_superior or lam < 1e-6:
+            break    # 1-árvore é uma rota (limite ótimo) ou passo desprezível
+        pi = pi + lam * folga / norma * g
+
+    return float(melhor), melhor_pi
+
+
+def calcular_gap(distancia: float, limite: float) -> float:
+    """Gap de otimalidade (fração): (distância - limite) / limite"""
+    return max(distancia - limite, 0.0) / max(limite, 1e-12)
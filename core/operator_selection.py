@@ -0,0 +1,210 @@
+"""
+SELEÇÃO ADAPTATIVA DE OPERADORES (multi-armed bandit)
+
+Cada operador de mutação e de crossover é um "braço". A cada geração, o
+ganho de fitness dos filhos (relativo ao pai de referência) é creditado
+aos operadores que os geraram e dividido pelo tempo de CPU que esses
+operadores gastaram. A qualidade de cada braço é a razão entre as médias
+móveis exponenciais do ganho e do tempo (ganho por segundo recente, menos
+ruidosa que a média das razões de cada geração), convertida em
+probabilidades por probability matching, com um piso por braço para
+nenhum operador sumir de vez:
+
+    p_i = p_min + (1 - K·p_min) · q_i / Σq
+
+Grupos de braços (as probabilidades são normalizadas dentro de cada um):
+  - rota:       swap, inversion, 2opt, oropt, lns (as taxas de aplicação
+                somam o mesmo que as taxas fixas da Config; o bandit só
+                redistribui o orçamento de mutação entre os operadores)
+  - velocidade: vel_gradual, vel_radical (fração das mutações de gene)
+  - crossover:  os tipos em Config.ADAPTATIVO_CROSSOVERS
+"""
+
+import numpy as np
+from typing import Dict, Sequence
+from config import Config
+
+
+OPERADORES_ROTA = ("swap", "inversion", "2opt", "oropt", "lns")
+OPERADORES_VELOCIDADE = ("vel_gradual", "vel_radical")
+
+
+def ganho_relativo(fitness_ref: np.ndarray, fitness_filho: np.ndarray) -> np.ndarray:
+    """
+    Melhoria relativa de cada filho sobre o pai de referência (>= 0)
+
+    Filho viável de pai inviável (fitness infinito) conta como ganho 1.
+    """
+    ref = np.asarray(fitness_ref, dtype=np.float64)
+    filho = np.asarray(fitness_filho, dtype=np.float64)
+    ganho = np.zeros(len(filho))
+
+    finitos = np.isfinite(ref) & np.isfinite(filho) & (ref > 0)
+    ganho[finitos] = (ref[finitos] - filho[finitos]) / ref[finitos]
+    ganho[~np.isfinite(ref) & np.isfinite(filho)] = 1.0
+    return np.maximum(ganho, 0.0)
+
+
+class SeletorOperadores:
+    """
+    Bandit por probability matching sobre os operadores do AG
+
+    Uso (ver reproduzir / evolve_optimized):
+        taxas = seletor.taxas_mutacao()
+        fracao = seletor.fracao_gradual()
+        probs = seletor.probs_crossover()
+        ... gera os filhos, medindo aplicações e tempos ...
+        seletor.registrar_filhos(aplicados, tempos, fitness_ref, inicio)
+        ... avalia a população ...
+        seletor.creditar(fitness)
+    """
+
+    def __init__(self, crossovers: Sequence[str] = None, taxa_aprendizado: float = None,
+                 prob_minima: float = None):
+        self.crossovers = tuple(crossovers or Config.ADAPTATIVO_CROSSOVERS)
+        self.nomes = (list(OPERADORES_ROTA) + list(OPERADORES_VELOCIDADE) +
+                      [f"cx_{c}" for c in self.crossovers])
+        self.alfa = Config.ADAPTATIVO_TAXA_APRENDIZADO if taxa_aprendizado is None else taxa_aprendizado
+        self.prob_minima = Config.ADAPTATIVO_PROB_MINIMA if prob_minima is None else prob_minima
+
+        n_rota = len(OPERADORES_ROTA)
+        n_vel = len(OPERADORES_VELOCIDADE)
+        self.grupos = {
+            "rota": np.arange(n_rota),
+            "velocidade": np.arange(n_rota, n_rota + n_vel),
+            "crossover": np.arange(n_rota + n_vel, len(self.nomes)),
+        }
+
+        # Taxas fixas da Config: orçamento total e divisão inicial
+        self.taxas_base = np.array([Config.MUTATION_RATE_SWAP, Config.MUTATION_RATE_INVERSION,
+                                    Config.MUTATION_RATE_2OPT, Config.MUTATION_RATE_OROPT,
+                                    Config.MUTATION_RATE_LNS])
+        iniciais = np.concatenate([self.taxas_base / self.taxas_base.sum(),
+                                   [0.7, 0.3],
+                                   np.full(len(self.crossovers), 1 / len(self.crossovers))])
+
+        self.probs = iniciais
+        self.ganho_recente = np.zeros(len(self.nomes))   # EMA do ganho creditado
+        self.tempo_recente = np.zeros(len(self.nomes))   # EMA do tempo gasto
+
+        # Estatísticas acumuladas
+        self.aplicacoes = np.zeros(len(self.nomes), dtype=np.int64)
+        self.sucessos = np.zeros(len(self.nomes), dtype=np.int64)
+        self.ganho = np.zeros(len(self.nomes))
+        self.tempo = np.zeros(len(self.nomes))
+
+        self._pendente = None
+
+    # ----- probabilidades correntes -----
+
+    def taxas_mutacao(self) -> np.ndarray:
+        """Taxas de aplicação de swap, inversion, 2-opt, Or-opt e LNS"""
+        return np.minimum(self.probs[self.grupos["rota"]] * self.taxas_base.sum(), 1.0)
+
+    def fracao_gradual(self) -> float:
+        """Fração das mutações de velocidade que são graduais (o resto é radical)"""
+        return float(self.probs[self.grupos["velocidade"]][0])
+
+    def probs_crossover(self) -> np.ndarray:
+        """Probabilidade de cada tipo em self.crossovers"""
+        return self.probs[self.grupos["crossover"]]
+
+    # ----- crédito -----
+
+    def registrar_filhos(self, aplicados: np.ndarray, tempos: np.ndarray,
+                         fitness_ref: np.ndarray, inicio: int) -> None:
+        """
+        Guarda os operadores aplicados aos filhos da geração
+
+        aplicados: (filhos, braços) booleano; tempos: segundos por braço;
+        fitness_ref: fitness do pai de referência de cada filho; inicio:
+        posição do primeiro filho na nova população.
+        """
+        self._pendente = (np.asarray(aplicados, dtype=bool), np.asarray(tempos),
+                          np.asarray(fitness_ref, dtype=np.float64), inicio)
+
+    def creditar(self, fitness: Sequence[float]) -> None:
+        """
+        Credita o ganho dos filhos avaliados e atualiza as probabilidades
+
+        O ganho de cada filho é dividido igualmente entre os operadores que
+        o produziram; a recompensa do braço é ganho / tempo de CPU.
+        """
+        if self._pendente is None:
+            return
+        aplicados, tempos, ref, inicio = self._pendente
+        self._pendente = None
+
+        fit = np.asarray(fitness[inicio:inicio + len(aplicados)], dtype=np.float64)
+        aplicados = aplicados[:len(fit)]
+        ganho = ganho_relativo(ref[:len(fit)], fit)
+
+        por_filho = aplicados.sum(axis=1)
+        parcela = np.divide(ganho, por_filho, out=np.zeros(len(ganho)), where=por_filho > 0)
+        credito = parcela @ aplicados
+        usos = aplicados.sum(axis=0)
+
+        self.aplicacoes += usos
+        self.sucessos += ((ganho > 0)[:, None] & aplicados).sum(axis=0)
+        self.ganho += credito
+        self.tempo += tempos
+
+        self.ganho_recente += self.alfa * (credito - self.ganho_recente)
+        self.tempo_recente += self.alfa * (tempos - self.tempo_recente)
+        self._atualizar_probs()
+
+    def qualidade(self) -> np.ndarray:
+        """Ganho por segundo recente de cada braço (nan se nunca aplicado)"""
+        q = np.full(len(self.nomes), np.nan)
+        usados = self.aplicacoes > 0
+        q[usados] = self.ganho_recente[usados] / np.maximum(self.tempo_recente[usados], 1e-9)
+        return q
+
+    def _atualizar_probs(self) -> None:
+        """Probability matching por grupo (braços ainda sem estimativa mantêm a fatia)"""
+        qualidade = self.qualidade()
+        for idx in self.grupos.values():
+            q = qualidade[idx]
+            conhecidos = ~np.isnan(q)
+            if conhecidos.sum() < 2 or q[conhecidos].sum() <= 0:
+                continue
+
+            # Fatia dos braços sem estimativa fica como está
+            fatia = self.probs[idx][conhecidos].sum()
+            k = conhecidos.sum()
+            p_min = min(self.prob_minima, 1 / k)
+            p = p_min + (1 - k * p_min) * q[conhecidos] / q[conhecidos].sum()
+            novas = self.probs[idx].copy()
+            novas[conhecidos] = p * fatia
+            self.probs[idx] = novas
+
+    # ----- relatório -----
+
+    def estatisticas(self) -> Dict[str, Dict[str, float]]:
+        """Estatísticas acumuladas por operador (para o histórico)"""
+        q = self.qualidade()
+        return {
+            nome: {
+                "aplicacoes": int(self.aplicacoes[i]),
+                "sucessos": int(self.sucessos[i]),
+                "ganho": float(self.ganho[i]),
+                "tempo_seg": float(self.tempo[i]),
+                "ganho_por_seg": float(self.ganho[i] / self.tempo[i]) if self.tempo[i] > 0 else 0.0,
+                "ganho_por_seg_recente": float(np.nan_to_num(q[i])),
+                "prob": float(self.probs[i]),
+            }
+            for i, nome in enumerate(self.nomes)
+        }
+
+    def probabilidades(self) -> Dict[str, float]:
+        """Probabilidade corrente de cada operador"""
+        return {nome: float(p) for nome, p in zip(self.nomes, self.probs)}
+
+
+def imprimir_estatisticas(estatisticas: Dict[str, Dict[str, float]]) -> None:
+    """Tabela das estatísticas por operador"""
+    print(f"\n{'Operador':<14}{'Aplic.':>10}{'Sucessos':>10}{'Ganho/s':>12}"
+          f"{'Recente':>12}{'Tempo (s)':>11}{'Prob.':>8}")
+    for nome, e in estatisticas.items():
+        print(f"{nome:<14}{e['aplicacoes']:>10,}{e['sucessos']:>10,}{e['ganho_por_seg']:>12.4f}"
+              f"{e['ganho_por_seg_recente']:>12.4f}{e['tempo_seg']:>11.2f}{e['prob']:>8.3f}")
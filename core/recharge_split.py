@@ -0,0 +1,180 @@
+"""
+PONTOS DE RECARGA ÓTIMOS PARA UMA ROTA (split)
+
+Nos simuladores, o drone pousa para recarregar só quando a bateria não
+cobre o próximo trecho (regra gulosa). Aqui, para uma rota e velocidades
+fixas, escolhemos em quais paradas recarregar, como no "split" de
+roteamento por giant tour:
+
+  - o estado j é "bateria cheia antes do trecho j" (j = 0 é a partida);
+  - de j é possível voar sem pousar até o trecho k - 1 se, para todo i
+    em (j, k), a bateria restante AUTONOMIA - (P[i] - P[j]) cobre o
+    limiar de recarga do trecho i (P: soma prefixa do consumo). Como P é
+    crescente, o maior k alcançável nunca diminui com j (dois ponteiros);
+  - o relógio avança trecho a trecho a partir de j, com as mesmas regras
+    de simulate_route_detailed: parada, recarga (tardia se começa após
+    HORA_CUSTO_EXTRA), espera até o dia seguinte se já passou de HORA_FIM
+    e voo que ultrapassa HORA_FIM continuando na manhã seguinte.
+
+Cada transição j → k custa O(1) a partir da transição j → k - 1, então o
+total é O(n·w), com w o número máximo de trechos por carga. Cada estado
+guarda um único rótulo (o de menor custo acumulado: pousos, pousos
+tardios e tempo decorrido), o que é exato sem os efeitos de hora do dia
+e uma aproximação com eles; por isso otimizar_recargas confere o plano
+com a simulação detalhada antes de adotá-lo.
+
+O plano é gravado em cromossomo["recargas"]: os simuladores recarregam
+antes desses trechos, e a regra gulosa continua valendo como segurança.
+"""
+
+from typing import Dict, List, Tuple
+from config import Config
+from simulation import simulate_route_detailed
+from speed_optimizer import tabelas_trechos
+
+SEGUNDOS_DIA = 86400
+
+
+def _proxima_manha(relogio: float) -> float:
+    """Início da operação (HORA_INICIO) do dia seguinte"""
+    return (relogio // SEGUNDOS_DIA + 1) * SEGUNDOS_DIA + Config.HORA_INICIO * 3600
+
+
+def _voar(relogio: float, tempo_voo: float) -> float:
+    """Fim do voo; o que passa de HORA_FIM continua na manhã seguinte"""
+    fim = relogio + tempo_voo
+    hora_dia = fim % SEGUNDOS_DIA
+    if hora_dia > Config.HORA_FIM * 3600:
+        fim = _proxima_manha(fim) + (hora_dia - Config.HORA_FIM * 3600)
+    return fim
+
+
+def custo_pouso_tardio() -> float:
+    """Custo extra de um pouso após HORA_CUSTO_EXTRA, na escala de MULT_POUSOS"""
+    return Config.MULT_POUSOS * Config.CUSTO_POUSO_TARDIO / Config.CUSTO_POUSO_REAIS
+
+
+def split_recargas(rota: List[int], velocidades: List[int], dist_matrix: List[List[float]],
+                   fisica: bool = None, horario: bool = None) -> List[int]:
+    """
+    Trechos antes dos quais recarregar, minimizando pousos + tempo
+
+    fisica: modelo de bateria (ver speed_optimizer.tabelas_trechos)
+    horario: modela o relógio (esperas de fim de dia, pousos tardios e
+    prazo em dias); default: igual a `fisica`, como nos simuladores
+
+    Returns:
+        Índices (crescentes) dos trechos precedidos de recarga
+    """
+    if fisica is None:
+        fisica = not Config.USE_FAST_FITNESS
+    if horario is None:
+        horario = fisica
+    tempo, consumo, limiar = tabelas_trechos(rota, dist_matrix, fisica, velocidades)
+    tempo, consumo, limiar = tempo.tolist(), consumo.tolist(), limiar.tolist()
+    n = len(tempo)
+    if n == 0:
+        return []
+
+    autonomia = Config.AUTONOMIA_BASE_SEG
+    parada = Config.TEMPO_PARADA_SEG
+    recarga = Config.TEMPO_RECARGA_SEG + Config.TEMPO_PARADA_SEG
+    custo_pouso = Config.MULT_POUSOS
+    extra_tardio = custo_pouso_tardio()
+    hora_extra = Config.HORA_CUSTO_EXTRA * 3600
+    hora_fim = Config.HORA_FIM * 3600
+    inicio = Config.HORA_INICIO * 3600
+
+    prefixo = [0.0] * (n + 1)
+    for i in range(n):
+        prefixo[i + 1] = prefixo[i] + consumo[i]
+
+    inf = float('inf')
+    acumulado = [inf] * (n + 1)      # custo dos pousos até o estado
+    relogio = [inf] * (n + 1)        # relógio ao chegar no estado
+    anterior = [-1] * (n + 1)
+    acumulado[0], relogio[0] = 0.0, inicio
+    melhor_final, estado_final = inf, -1
+
+    alcance = 1
+    for j in range(n):
+        if acumulado[j] == inf:
+            continue
+
+        # Maior k com [j, k) voável sem pouso (dois ponteiros)
+        alcance = max(alcance, j + 1)
+        while alcance < n:
+            restante = autonomia - (prefixo[alcance] - prefixo[j])
+            if restante < limiar[alcance] or (fisica and restante < consumo[alcance]):
+                break
+            alcance += 1
+
+        custo, t = acumulado[j], relogio[j]
+        for i in range(j, alcance):
+            if i > 0:
+                t += parada
+            if i == j and j > 0:
+                if horario and t % SEGUNDOS_DIA >= hora_extra:
+                    custo += custo_pouso + extra_tardio
+                else:
+                    custo += custo_pouso
+                t += recarga
+            if horario:
+                if t % SEGUNDOS_DIA >= hora_fim:
+                    t = _proxima_manha(t)
+                t = _voar(t, tempo[i])
+            else:
+                t += tempo[i]
+
+            k = i + 1
+            total = custo + Config.MULT_TEMPO * (t - inicio)
+            if k == n:
+                if horario:
+                    dias = int((t - inicio) // SEGUNDOS_DIA) + 1
+                    total += max(0, dias - Config.PRAZO_DIAS) * Config.PENALIDADE_DIAS
+                if total < melhor_final:
+                    melhor_final, estado_final = total, j
+            elif total < acumulado[k] + Config.MULT_TEMPO * (relogio[k] - inicio):
+                acumulado[k], relogio[k], anterior[k] = custo, t, j
+
+    recargas = []
+    j = estado_final
+    while j > 0:
+        recargas.append(j)
+        j = anterior[j]
+    return recargas[::-1]
+
+
+def custo_detalhado(metricas: Dict) -> float:
+    """Custo lexicográfico das métricas de simulate_route_detailed"""
+    dias_excedidos = max(0, metricas['dias_usados'] - Config.PRAZO_DIAS)
+    return (metricas['distancia_total_km'] * Config.MULT_DISTANCIA +
+            metricas['pousos'] * Config.MULT_POUSOS +
+            metricas['pousos_tardios'] * custo_pouso_tardio() +
+            metricas['tempo_total_seg'] * Config.MULT_TEMPO +
+            dias_excedidos * Config.PENALIDADE_DIAS)
+
+
+def otimizar_recargas(cromossomo: Dict, ceps: List[str], coords: List[Tuple[float, float]],
+                      dist_matrix: List[List[float]], wind_cache,
+                      direcoes=None) -> Tuple[Dict, float]:
+    """
+    Plano de recargas ótimo (modelo físico com relógio) para a rota final
+
+    O plano só é adotado se a simulação detalhada (com vento) ficar mais
+    barata que a da regra gulosa. direcoes: ver simulate_route_detailed.
+
+    Returns:
+        (cromossomo, custo_detalhado) — com "recargas", se adotado
+    """
+    gulosa = {"rota": cromossomo["rota"], "velocidades": cromossomo["velocidades"]}
+    custo_guloso = custo_detalhado(simulate_route_detailed(gulosa, ceps, coords, dist_matrix,
+                                                           wind_cache, direcoes)[1])
+
+    plano = dict(gulosa, recargas=split_recargas(cromossomo["rota"], cromossomo["velocidades"],
+                                                 dist_matrix, fisica=True))
+    custo_plano = custo_detalhado(simulate_route_detailed(plano, ceps, coords, dist_matrix,
+                                                          wind_cache, direcoes)[1])
+    if custo_plano < custo_guloso:
+        return plano, custo_plano
+    return gulosa, custo_guloso
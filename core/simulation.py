@@ -1,32 +1,69 @@
 # simulation.py - COMPLETO E REFORMULADO
 import math
+import numpy as np
 from typing import List, Tuple, Dict
 from datetime import datetime, timedelta
 from config import Config
 
 from physics import DronePhysics, bearing
+from data_loader import HORA_PARA_SLOT, SEGUNDOS_DIA
+
+# Versões Python (escalares) para a consulta de um trecho por vez
+_ORDINAL_INICIO = datetime(2025, 1, 1).toordinal()
+_HORA_PARA_SLOT = HORA_PARA_SLOT.tolist()
 
 def calcular_dia_semana(dt: datetime) -> int:
     """Calcula dia da semana (1-7)"""
-    base = datetime(2025, 1, 1)
-    dias_passados = (dt.toordinal() - base.toordinal())
+    dias_passados = dt.toordinal() - _ORDINAL_INICIO
     return (dias_passados % 7) + 1
 
-def get_wind_slot(dt: datetime, wind_cache: Dict) -> Tuple[float, float]:
-    """Obtém vento para datetime específico"""
+def consultar_vento(tabela: np.ndarray, dias, segundos):
+    """
+    Consulta vetorizada da tabela de ventos (indexação pura).
+    
+    Args:
+        tabela: Array (7, 5, 2) de build_wind_tensor ou (7, 86400, 2) de
+                build_wind_table_interpolada
+        dias: Dia(s) da semana (1-7), escalar ou array
+        segundos: Segundo(s) do dia (0-86399), escalar ou array
+    
+    Returns:
+        Array (..., 2) com (velocidade_kmh, direcao_graus)
+    """
+    dias = np.asarray(dias) - 1
+    segundos = np.asarray(segundos)
+    
+    if tabela.shape[1] == SEGUNDOS_DIA:
+        return tabela[dias, segundos]
+    return tabela[dias, HORA_PARA_SLOT[segundos // 3600]]
+
+def get_wind_slot(dt: datetime, wind_cache) -> Tuple[float, float]:
+    """
+    Obtém vento para datetime específico
+    
+    wind_cache pode ser o dict de build_wind_cache ou uma tabela NumPy
+    (ver consultar_vento). Para um instante só, a tabela é indexada com
+    inteiros Python (sem np.asarray nem indexação avançada), o que custa o
+    mesmo que o dict; consultar_vento fica para consultas em lote.
+    """
     dia = calcular_dia_semana(dt)
-    hora = dt.hour
     
-    slots = [18, 15, 12, 9, 6]
-    slot = next((s for s in slots if hora >= s), 6)
+    if isinstance(wind_cache, np.ndarray):
+        if wind_cache.shape[1] == SEGUNDOS_DIA:
+            vento = wind_cache[dia - 1, dt.hour * 3600 + dt.minute * 60 + dt.second]
+        else:
+            vento = wind_cache[dia - 1, _HORA_PARA_SLOT[dt.hour]]
+        return float(vento[0]), float(vento[1])
     
+    slot = Config.SLOTS_VENTO[HORA_PARA_SLOT[dt.hour]]
     return wind_cache.get((dia, slot), (0.0, 0.0))
 
 # ===========================
 # FITNESS LEXICOGRÁFICO - ESCALA CORRETA
 # ===========================
 def calcular_fitness(cromossomo: Dict, coords: List[Tuple[float,float]],
-                    dist_matrix: List[List[float]], wind_cache: Dict) -> float:
+                    dist_matrix: List[List[float]], wind_cache: Dict,
+                    fisica: bool = None, direcoes=None) -> float:
     """
     FITNESS LEXICOGRÁFICO COM ESCALA CORRETA
     
@@ -46,16 +83,22 @@ def calcular_fitness(cromossomo: Dict, coords: List[Tuple[float,float]],
     2. POUSOS (×1.000) - Desempate médio
     3. TEMPO (×1) - Desempate fino
     4. PENALIDADES (×100.000.000) - Violações graves
+    
+    fisica: True usa simular_rapido, False simular_rapido_simples
+    (default: conforme Config.USE_FAST_FITNESS)
+    direcoes: matriz de direções dos trechos (ver simular_rapido)
     """
+    if fisica is None:
+        fisica = not Config.USE_FAST_FITNESS
     try:
-        # Simulação (rápida ou detalhada conforme Config)
-        if Config.USE_FAST_FITNESS:
+        # Simulação (rápida ou detalhada)
+        if not fisica:
             distancia_total, tempo_total_seg, pousos, dias_usados, penalidade_vento = simular_rapido_simples(
                 cromossomo, coords, dist_matrix, wind_cache
             )
         else:
             distancia_total, tempo_total_seg, pousos, dias_usados, penalidade_vento = simular_rapido(
-                cromossomo, coords, dist_matrix, wind_cache
+                cromossomo, coords, dist_matrix, wind_cache, direcoes
             )
         
         if distancia_total == float('inf'):
@@ -111,9 +154,14 @@ def simular_rapido_simples(cromossomo: Dict, coords: List[Tuple[float,float]],
     - Estimativa de tempo (distância / velocidade média)
     - Estimativa de pousos (baseada em autonomia)
     - Dias estimados
+    
+    cromossomo['recargas'] (opcional, ver recharge_split.py): trechos antes
+    dos quais o drone recarrega mesmo com bateria; a regra de recarga por
+    bateria insuficiente continua valendo nos demais.
     """
     rota = cromossomo['rota']
     velocidades = cromossomo['velocidades']
+    recargas = set(cromossomo.get('recargas', ()))
     
     # 1. DISTÂNCIA TOTAL (EXATA)
     distancia_total = 0.0
@@ -157,7 +205,7 @@ def simular_rapido_simples(cromossomo: Dict, coords: List[Tuple[float,float]],
         consumo_estimado = tempo_estimado * fator_consumo
         
         # Verifica se precisa recarregar
-        if bateria_restante < consumo_estimado * 1.2:  # Margem de segurança 20%
+        if bateria_restante < consumo_estimado * 1.2 or i in recargas:  # Margem de segurança 20%
             pousos += 1
             bateria_restante = Config.AUTONOMIA_BASE_SEG
             tempo_total_seg += Config.TEMPO_RECARGA_SEG + Config.TEMPO_PARADA_SEG
@@ -180,15 +228,22 @@ def simular_rapido_simples(cromossomo: Dict, coords: List[Tuple[float,float]],
 # SIMULAÇÃO REALISTA COMPLETA
 # ===========================
 def simular_rapido(cromossomo: Dict, coords: List[Tuple[float,float]],
-                   dist_matrix: List[List[float]], wind_cache: Dict) -> Tuple[float, float, int, int, float]:
+                   dist_matrix: List[List[float]], wind_cache: Dict,
+                   direcoes=None) -> Tuple[float, float, int, int, float]:
     """
     SIMULAÇÃO RÁPIDA COM FÍSICA REALISTA
     
     Usado quando Config.USE_FAST_FITNESS = False
     Mais precisa que simular_rapido_simples, mas mais lenta
+    Respeita cromossomo['recargas'] como simular_rapido_simples
+    
+    direcoes: matriz NxN de direções (graus) já calculada, como a do
+    pacote --prepare ou a planar de --planar; default: bearing() das
+    coordenadas a cada trecho
     """
     rota = cromossomo['rota']
     velocidades = cromossomo['velocidades']
+    recargas = set(cromossomo.get('recargas', ()))
     
     bateria_seg = Config.AUTONOMIA_BASE_SEG
     total_pousos = 0
@@ -217,7 +272,7 @@ def simular_rapido(cromossomo: Dict, coords: List[Tuple[float,float]],
             return float('inf'), float('inf'), 999, 999, float('inf')
         
         # Pouso para recarga
-        if bateria_seg < consumo_estimado:
+        if bateria_seg < consumo_estimado or idx in recargas:
             total_pousos += 1
             tempo_total_seg += Config.TEMPO_RECARGA_SEG + Config.TEMPO_PARADA_SEG
             bateria_seg = Config.AUTONOMIA_BASE_SEG
@@ -238,7 +293,8 @@ def simular_rapido(cromossomo: Dict, coords: List[Tuple[float,float]],
         
         # Obtém vento
         vento_kmh, dir_vento = get_wind_slot(dt_atual, wind_cache)
-        dir_drone = bearing(coords[i][0], coords[i][1], coords[j][0], coords[j][1])
+        dir_drone = (direcoes[i][j] if direcoes is not None
+                     else bearing(coords[i][0], coords[i][1], coords[j][0], coords[j][1]))
         
         # Simula trecho
         tempo_voo_seg, consumo_seg, velocidade_final = DronePhysics.simular_trecho_com_fisica(
@@ -279,13 +335,16 @@ def simular_rapido(cromossomo: Dict, coords: List[Tuple[float,float]],
 def simulate_route_detailed(cromossomo: Dict, ceps: List[str],
                      coords: List[Tuple[float,float]],
                      dist_matrix: List[List[float]],
-                     wind_cache: Dict) -> Tuple[List[Dict], Dict]:
+                     wind_cache: Dict, direcoes=None) -> Tuple[List[Dict], Dict]:
     """
     Simulação detalhada para gerar CSV de saída
     Usa física realista completa
+    Respeita cromossomo['recargas'] como simular_rapido_simples
+    direcoes: matriz de direções dos trechos (ver simular_rapido)
     """
     rota = cromossomo['rota']
     velocidades = cromossomo['velocidades']
+    recargas = set(cromossomo.get('recargas', ()))
     
     csv_rows = []
     bateria_seg = Config.AUTONOMIA_BASE_SEG
@@ -315,7 +374,7 @@ def simulate_route_detailed(cromossomo: Dict, ceps: List[str],
         pouso_tardio = False
         
         # Pouso para recarga
-        if bateria_seg < consumo_estimado:
+        if bateria_seg < consumo_estimado or idx in recargas:
             houve_pouso = True
             total_pousos += 1
             
@@ -341,7 +400,8 @@ def simulate_route_detailed(cromossomo: Dict, ceps: List[str],
         dia_semana = calcular_dia_semana(hora_inicial)
         
         vento_kmh, dir_vento = get_wind_slot(hora_inicial, wind_cache)
-        dir_drone = bearing(coords[i][0], coords[i][1], coords[j][0], coords[j][1])
+        dir_drone = (direcoes[i][j] if direcoes is not None
+                     else bearing(coords[i][0], coords[i][1], coords[j][0], coords[j][1]))
         
         tempo_voo_seg, consumo_seg, velocidade_final = DronePhysics.simular_trecho_com_fisica(
             dist_km=dist_km,
@@ -0,0 +1,202 @@
+"""
+VELOCIDADES ÓTIMAS PARA UMA ROTA FIXA (programação dinâmica)
+
+Dada a rota, escolhe a velocidade de cada trecho (uma das 16 válidas)
+minimizando o custo secundário do fitness lexicográfico:
+
+    MULT_POUSOS · pousos + MULT_TEMPO · tempo
+
+sob o modelo de bateria do simulador em uso (a distância não depende das
+velocidades). O estado da DP é a bateria restante ao fim de cada trecho,
+discretizada em passos de Config.DP_BATERIA_PASSO_SEG (arredondada para
+baixo, isto é, de forma conservadora). A regra de recarga é a mesma dos
+simuladores: pousa antes do trecho se a bateria não cobre o limiar.
+
+  - simular_rapido_simples: consumo = tempo · (v/36)^1.5, limiar = 1.2 ·
+    consumo; bateria negativa é tolerada (o trecho seguinte recarrega);
+  - simular_rapido: tempo e consumo de simular_trecho_com_fisica (sem
+    vento), limiar = estimar_consumo_trecho; bateria negativa é inviável.
+
+O vento, as esperas de fim de dia e as penalidades não entram na DP; por
+isso polir_velocidades sempre confere o resultado com calcular_fitness.
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from config import Config
+from physics import DronePhysics
+from simulation import calcular_fitness, simular_rapido_simples, simular_rapido
+
+
+def tabelas_trechos(rota: List[int], dist_matrix: List[List[float]],
+                    fisica: bool = None,
+                    velocidades: List[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tempo, consumo e limiar de recarga de cada trecho em cada velocidade
+
+    velocidades: se informadas (uma por trecho), só a coluna de cada trecho
+
+    Returns:
+        Arrays (trechos, velocidades) em segundos, ou (trechos,) se
+        `velocidades` for informado
+    """
+    if fisica is None:
+        fisica = not Config.USE_FAST_FITNESS
+    d = np.array([dist_matrix[a][b] for a, b in zip(rota[:-1], rota[1:])])
+    if velocidades is None:
+        v = np.broadcast_to(np.asarray(Config.VELOCIDADES_VALIDAS, dtype=np.float64),
+                            (len(d), len(Config.VELOCIDADES_VALIDAS)))
+        d = d[:, None]
+    else:
+        v = np.asarray(velocidades, dtype=np.float64)
+
+    if not fisica:
+        tempo = (d / v) * 3600
+        consumo = tempo * (v / 36.0) ** 1.5
+        return tempo, consumo, consumo * 1.2
+
+    tempo = np.empty(v.shape)
+    consumo = np.empty(v.shape)
+    limiar = np.empty(v.shape)
+    d = np.broadcast_to(d, v.shape)
+    for idx in np.ndindex(v.shape):
+        tempo[idx], consumo[idx], _ = DronePhysics.simular_trecho_com_fisica(d[idx], 0.0, v[idx])
+        limiar[idx] = DronePhysics.estimar_consumo_trecho(d[idx], v[idx])
+    return tempo, consumo, limiar
+
+
+def otimizar_velocidades(rota: List[int], dist_matrix: List[List[float]],
+                         passo_seg: float = None, fisica: bool = None,
+                         custo_pouso: float = None) -> List[int]:
+    """
+    DP sobre (trecho, bateria discretizada) com as 16 velocidades válidas
+
+    Para cada trecho, o custo de chegar a cada nível de bateria vem de um
+    gather vetorizado (sem pouso, o nível cai ceil(consumo/passo)) e de
+    um mínimo de prefixo (com pouso, qualquer nível abaixo do limiar
+    leva ao mesmo nível pós-recarga).
+
+    custo_pouso: custo de um pouso na DP (default: MULT_POUSOS + o tempo
+    de recarga e parada em MULT_TEMPO)
+
+    Returns:
+        Velocidade de cada trecho (len(rota) - 1 valores)
+    """
+    if fisica is None:
+        fisica = not Config.USE_FAST_FITNESS
+    if passo_seg is None:
+        passo_seg = Config.DP_BATERIA_PASSO_SEG
+    if custo_pouso is None:
+        custo_pouso = Config.MULT_POUSOS
+    custo_pouso += Config.MULT_TEMPO * (Config.TEMPO_RECARGA_SEG + Config.TEMPO_PARADA_SEG)
+
+    tempo, consumo, limiar = tabelas_trechos(rota, dist_matrix, fisica)
+    n_trechos, n_vel = tempo.shape
+    if n_trechos == 0:
+        return []
+
+    niveis = int(Config.AUTONOMIA_BASE_SEG // passo_seg) + 1
+    estados = np.arange(niveis)
+    queda = np.ceil(consumo / passo_seg).astype(np.int64)             # níveis gastos
+    corte = np.minimum(np.ceil(limiar / passo_seg), niveis).astype(np.int64)  # pousa se nível < corte
+    pos_recarga = np.floor((Config.AUTONOMIA_BASE_SEG - consumo) / passo_seg).astype(np.int64)
+    if fisica:
+        pos_recarga[pos_recarga < 0] = -1          # trecho maior que a autonomia: inviável
+    else:
+        np.maximum(pos_recarga, 0, out=pos_recarga)
+    custo_tempo = Config.MULT_TEMPO * tempo
+
+    custo = np.full(niveis, np.inf)
+    custo[-1] = 0.0
+    escolha = np.empty((n_trechos, niveis), dtype=np.int8)
+    origem = np.empty((n_trechos, niveis), dtype=np.int32)
+    linhas = np.arange(n_vel)
+
+    for i in range(n_trechos):
+        # Sem pouso: chega ao nível j vindo do nível j + queda (se >= corte)
+        src = estados[None, :] + queda[i][:, None]
+        valido = (src < niveis) & (src >= corte[i][:, None])
+        src = np.minimum(src, niveis - 1)
+        cand = np.where(valido, custo[src] + custo_tempo[i][:, None], np.inf)
+
+        # Com pouso: melhor nível abaixo do corte (mínimo de prefixo)
+        pref = np.minimum.accumulate(custo)
+        arg_pref = np.maximum.accumulate(np.where(custo <= pref, estados, 0))
+        k = corte[i] - 1
+        ok = (k >= 0) & (pos_recarga[i] >= 0)
+        k = np.maximum(k, 0)
+        custo_r = np.where(ok, pref[k] + custo_tempo[i] + custo_pouso, np.inf)
+        dest = np.maximum(pos_recarga[i], 0)
+        melhora = custo_r < cand[linhas, dest]
+        cand[linhas[melhora], dest[melhora]] = custo_r[melhora]
+        src[linhas[melhora], dest[melhora]] = arg_pref[k[melhora]]
+
+        melhor_v = np.argmin(cand, axis=0)
+        custo = cand[melhor_v, estados]
+        escolha[i] = melhor_v
+        origem[i] = src[melhor_v, estados]
+
+    # Reconstrução a partir do melhor nível final
+    velocidades = [0] * n_trechos
+    nivel = int(np.argmin(custo))
+    for i in range(n_trechos - 1, -1, -1):
+        velocidades[i] = Config.VELOCIDADES_VALIDAS[escolha[i, nivel]]
+        nivel = int(origem[i, nivel])
+    return velocidades
+
+
+def polir_velocidades(cromossomo: Dict, coords: List[Tuple[float, float]],
+                      dist_matrix: List[List[float]], wind_cache,
+                      fisica: bool = None, recargas=None,
+                      direcoes=None) -> Tuple[Dict, float]:
+    """
+    Substitui as velocidades pelas da DP se o fitness real melhorar
+
+    Se a DP passar de POUSOS_LIMITE, roda de novo com o custo do pouso
+    acrescido da penalidade por excesso e fica com o melhor dos dois.
+
+    fisica: modelo da DP e do fitness (default: not Config.USE_FAST_FITNESS);
+    True na avaliação em duas camadas, que seleciona pela física
+    recargas: função (rota, velocidades) → plano de recargas; com ela,
+    cada candidato é avaliado com o seu plano (recargas por split no
+    fitness), como o cromossomo de entrada
+    direcoes: matriz de direções dos trechos (ver simulation.simular_rapido)
+
+    Returns:
+        (cromossomo, fitness) — o original, se nenhum candidato for melhor
+    """
+    if fisica is None:
+        fisica = not Config.USE_FAST_FITNESS
+    melhor = cromossomo
+    melhor_fit = calcular_fitness(cromossomo, coords, dist_matrix, wind_cache, fisica, direcoes)
+
+    for custo_pouso in (Config.MULT_POUSOS,
+                        Config.MULT_POUSOS + Config.PENALIDADE_POUSOS_EXCESSO):
+        candidato = {"rota": cromossomo["rota"],
+                     "velocidades": otimizar_velocidades(cromossomo["rota"], dist_matrix,
+                                                         fisica=fisica, custo_pouso=custo_pouso)}
+        if recargas:
+            candidato["recargas"] = recargas(candidato["rota"], candidato["velocidades"])
+        fit = calcular_fitness(candidato, coords, dist_matrix, wind_cache, fisica, direcoes)
+        if fit < melhor_fit:
+            melhor, melhor_fit = candidato, fit
+        pousos = (simular_rapido(candidato, coords, dist_matrix, wind_cache, direcoes) if fisica
+                  else simular_rapido_simples(candidato, coords, dist_matrix, wind_cache))[2]
+        if pousos <= Config.POUSOS_LIMITE:
+            break
+    return melhor, melhor_fit
+
+
+def decodificador_velocidades(dist_matrix: List[List[float]], tamanho_cache: int = 4096):
+    """
+    Decodificador rota → velocidades ótimas (DP), com cache por rota
+
+    Returns:
+        Função que recebe a rota e devolve a lista de velocidades
+    """
+    @lru_cache(maxsize=tamanho_cache)
+    def decodificar(rota: Tuple[int, ...]) -> Tuple[int, ...]:
+        return tuple(otimizar_velocidades(list(rota), dist_matrix))
+
+    return lambda rota: list(decodificar(tuple(rota)))
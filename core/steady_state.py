@@ -0,0 +1,341 @@
+"""
+MOTOR DE ESTADO ESTACIONÁRIO (steady-state) COM SUBSTITUIÇÃO INCREMENTAL
+
+O laço geracional de evolve_optimized refaz e reavalia a população
+inteira a cada geração. Aqui cada passo cruza dois pais (torneio), muta
+os filhos e cada filho disputa uma vaga com um indivíduo da população:
+
+  - "pior": o pior da população, mantido no topo de um heap indexado
+    (max-heap por fitness com a posição de cada vaga), em O(log n) por
+    substituição;
+  - "semelhante": o pai com mais arestas em comum com o filho (crowding
+    determinístico), o que preserva a diversidade.
+
+O filho só entra se for melhor que o alvo e não for cópia de alguém da
+população, então a população nunca piora, o melhor nunca sai e clones
+não tomam conta das vagas. Antes de simular, o termo de distância do filho
+(exato e barato) limita o fitness por baixo: se MULT_DISTANCIA ·
+distância já não bate o alvo, o filho é descartado sem simulação. Em
+populações convergidas isso evita a maior parte das avaliações.
+Não há avaliação incremental a partir do pai: o filho que passa pelo
+limite é simulado por inteiro.
+
+Para o histórico, pop_size filhos contam como uma geração; busca local
+nos elites, detecção de estagnação (reinício dos piores), gap para o
+limite de Held-Karp e a etapa final (busca profunda, velocidades por DP
+e recargas por split) seguem evolve_optimized.
+"""
+
+import random
+from collections import Counter
+from typing import Dict, List, Tuple
+import numpy as np
+from config import Config
+from simulation import calcular_fitness
+from local_search import preparar_vizinhos, distancia_rota
+from construction import construtor_curva
+from speed_optimizer import polir_velocidades, decodificador_velocidades
+from recharge_split import split_recargas, otimizar_recargas
+from exact_solver import resolver_exato
+from lower_bound import limite_held_karp, calcular_gap
+from genetic_algorithm import (populacao_inicial_balanceada, criar_cromossomo, cruzar_rotas,
+                               cruzar_rota, crossover_velocidades_lote, mutacao_rotas_lote,
+                               mutacao_velocidades_lote, avaliar_populacao, calcular_estatisticas,
+                               detectar_estagnacao, indices_elite, busca_local_rota,
+                               local_search_profunda, _construtor_restart, _rng_padrao)
+
+
+class HeapIndexado:
+    """
+    Max-heap de fitness das vagas da população, com a posição de cada vaga
+
+    pior() em O(1); atualizar(vaga, fitness) em O(log n), subindo ou
+    descendo a vaga conforme o novo valor.
+    """
+
+    def __init__(self, fitness: List[float]):
+        self.fitness = list(fitness)
+        self.heap = sorted(range(len(self.fitness)), key=lambda i: -self.fitness[i])
+        self.posicao = [0] * len(self.fitness)
+        for p, vaga in enumerate(self.heap):
+            self.posicao[vaga] = p
+
+    def pior(self) -> int:
+        """Vaga com o maior fitness"""
+        return self.heap[0]
+
+    def atualizar(self, vaga: int, fitness: float) -> None:
+        antigo, self.fitness[vaga] = self.fitness[vaga], fitness
+        p = self.posicao[vaga]
+        if fitness > antigo:
+            self._subir(p)
+        else:
+            self._descer(p)
+
+    def _trocar(self, a: int, b: int) -> None:
+        self.heap[a], self.heap[b] = self.heap[b], self.heap[a]
+        self.posicao[self.heap[a]] = a
+        self.posicao[self.heap[b]] = b
+
+    def _subir(self, p: int) -> None:
+        while p > 0:
+            pai = (p - 1) // 2
+            if self.fitness[self.heap[p]] <= self.fitness[self.heap[pai]]:
+                break
+            self._trocar(p, pai)
+            p = pai
+
+    def _descer(self, p: int) -> None:
+        tamanho = len(self.heap)
+        while True:
+            maior = p
+            for filho in (2 * p + 1, 2 * p + 2):
+                if filho < tamanho and \
+                        self.fitness[self.heap[filho]] > self.fitness[self.heap[maior]]:
+                    maior = filho
+            if maior == p:
+                return
+            self._trocar(p, maior)
+            p = maior
+
+
+def arestas_comuns(r1: List[int], r2: List[int]) -> int:
+    """Número de arestas (sem sentido) presentes nas duas rotas"""
+    arestas = {(min(a, b), max(a, b)) for a, b in zip(r1[:-1], r1[1:])}
+    return sum((min(a, b), max(a, b)) in arestas for a, b in zip(r2[:-1], r2[1:]))
+
+
+def evolve_steady_state(ceps: List[str], coords: List[Tuple[float, float]],
+                        dist_matrix: List[List[float]], idx_base: int, wind_cache,
+                        pop_size: int, generations: int, verbose: bool = True,
+                        tempo_busca_profunda: float = None, crossover: str = None,
+                        velocidades_dp: str = None, recargas_otimas: str = None,
+                        fracao_construtiva: float = None, exato: bool = None,
+                        tolerancia_gap: float = None, substituicao: str = None,
+                        filhos_por_passo: int = None, vizinhos=None, direcoes=None):
+    """
+    AG de estado estacionário (mesma interface e retorno de evolve_optimized)
+
+    generations: gerações equivalentes (pop_size filhos cada)
+    substituicao: "pior" ou "semelhante" (default: Config.ESTADO_ESTAVEL_SUBSTITUICAO)
+    filhos_por_passo: filhos gerados antes de disputar as vagas (1 ou 2;
+    default: Config.ESTADO_ESTAVEL_FILHOS)
+    Os demais parâmetros seguem evolve_optimized (a seleção adaptativa
+    de operadores e a avaliação em duas camadas são só do laço geracional).
+
+    Returns:
+        (melhor, melhor_fit, historico); historico['avaliacoes'] conta as
+        simulações e historico['descartados'] os filhos rejeitados sem
+        simulação (pela distância ou por serem cópias)
+    """
+    n = len(ceps)
+    if tempo_busca_profunda is None:
+        tempo_busca_profunda = Config.DEEP_SEARCH_TEMPO_SEG
+    if velocidades_dp is None:
+        velocidades_dp = Config.VELOCIDADES_DP
+    decodificar = decodificador_velocidades(dist_matrix) if velocidades_dp == "decoder" else None
+    if recargas_otimas is None:
+        recargas_otimas = Config.SPLIT_RECARGAS
+    split = recargas_otimas == "fitness"
+    if exato is None:
+        exato = Config.EXATO_AUTOMATICO
+    if tolerancia_gap is None:
+        tolerancia_gap = Config.GAP_TOLERANCIA
+    if substituicao is None:
+        substituicao = Config.ESTADO_ESTAVEL_SUBSTITUICAO
+    if filhos_por_passo is None:
+        filhos_por_passo = Config.ESTADO_ESTAVEL_FILHOS
+    if exato and n <= Config.EXATO_N_MAX:
+        return resolver_exato(ceps, coords, dist_matrix, idx_base, wind_cache,
+                              velocidades_dp, recargas_otimas, verbose, direcoes)
+
+    vizinhos = preparar_vizinhos(dist_matrix, vizinhos)
+    curva = construtor_curva(coords) if Config.RESTART_CURVA > 0 else None
+    rng = _rng_padrao()
+
+    if verbose:
+        print(f"\nGerando população inicial balanceada (estado estacionário, "
+              f"substituição: {substituicao})...")
+    pop = populacao_inicial_balanceada(pop_size, n, idx_base, dist_matrix, coords, vizinhos,
+                                       fracao_construtiva)
+    rotas = [ind["rota"] for ind in pop]
+    vel = np.array([ind["velocidades"] for ind in pop], dtype=np.int64)
+    if decodificar:
+        vel[:] = [decodificar(r) for r in rotas]
+
+    def avaliar(rota: List[int], velocidades: List[int]) -> float:
+        return avaliar_populacao([rota], [velocidades], coords, dist_matrix, wind_cache, split,
+                                 direcoes=direcoes)[0]
+
+    fitness = avaliar_populacao(rotas, vel.tolist(), coords, dist_matrix, wind_cache, split,
+                                direcoes=direcoes)
+    heap = HeapIndexado(fitness)
+    avaliacoes, descartados = len(rotas), 0
+
+    def chave(rota: List[int], velocidades) -> Tuple:
+        return tuple(rota), tuple(velocidades)
+
+    presentes = Counter(chave(r, v) for r, v in zip(rotas, vel.tolist()))
+
+    def substituir(vaga: int, rota: List[int], velocidades, fit: float) -> None:
+        presentes[chave(rotas[vaga], vel[vaga].tolist())] -= 1
+        presentes[chave(rota, velocidades)] += 1
+        rotas[vaga] = rota
+        vel[vaga] = velocidades
+        heap.atualizar(vaga, fit)
+
+    def registrar(historico: Dict) -> Dict:
+        stats = calcular_estatisticas(heap.fitness)
+        for chave in ('minimo', 'media', 'mediana', 'maximo', 'desvio', 'num_validos'):
+            historico.setdefault(chave, []).append(stats[chave])
+        return stats
+
+    historico = {}
+    stats = registrar(historico)
+    melhor_idx = int(np.argmin(heap.fitness))
+    melhor = {"rota": rotas[melhor_idx][:], "velocidades": vel[melhor_idx].tolist()}
+    melhor_fit = heap.fitness[melhor_idx]
+
+    limite = None
+    if (Config.LIMITE_INFERIOR or tolerancia_gap > 0) and n <= Config.LIMITE_INFERIOR_N_MAX:
+        limite, _ = limite_held_karp(dist_matrix, idx_base,
+                                     distancia_rota(melhor["rota"], dist_matrix))
+        historico['limite_inferior'] = limite
+        historico['gap'] = [calcular_gap(distancia_rota(melhor["rota"], dist_matrix), limite)]
+
+    if verbose:
+        print(f"Gen   0 | Min: {stats['minimo']:10,.0f} | Média: {stats['media']:10,.0f}"
+              + (f" | Gap: {historico['gap'][0]:.2%}" if limite is not None else ""))
+
+    passos = max(pop_size // 2, 1)
+    for gen in range(generations):
+        for _ in range(passos):
+            # SELEÇÃO: dois torneios sobre as vagas
+            pais = [min(random.sample(range(len(rotas)), min(Config.TOURNAMENT_SIZE, len(rotas))),
+                        key=heap.fitness.__getitem__) for _ in range(2)]
+
+            # CROSSOVER + MUTAÇÃO (rotas copiadas só se mutadas; com um
+            # filho por passo, o segundo nem é montado)
+            cruza = random.random() < Config.CROSSOVER_RATE
+            if filhos_por_passo == 1:
+                filhos = [cruzar_rota(rotas[pais[0]], rotas[pais[1]], idx_base, crossover,
+                                      dist_matrix, vizinhos) if cruza else rotas[pais[0]]]
+                vel_filhos = vel[pais[:1]]
+                if cruza:
+                    troca = rng.random(vel.shape[1]) < 0.5
+                    vel_filhos[0, troca] = vel[pais[1], troca]
+            else:
+                if cruza:
+                    filhos = list(cruzar_rotas(rotas[pais[0]], rotas[pais[1]], idx_base,
+                                               crossover, dist_matrix, vizinhos))
+                else:
+                    filhos = [rotas[pais[0]], rotas[pais[1]]]
+                vel_filhos = crossover_velocidades_lote(vel, np.array(pais[:1]),
+                                                        np.array(pais[1:]), np.array([cruza]), rng)
+            mutacao_rotas_lote(filhos, Config.MUTATION_RATE_SWAP, rng, dist_matrix, vizinhos,
+                               [not cruza] * len(filhos))
+            mutacao_velocidades_lote(vel_filhos, Config.MUTATION_RATE_SWAP, rng)
+
+            for k in range(len(filhos)):
+                rota = filhos[k]
+                velocidades = decodificar(rota) if decodificar else vel_filhos[k].tolist()
+
+                # SUBSTITUIÇÃO: pior da população ou pai mais parecido
+                if substituicao == "semelhante":
+                    alvo = max(pais, key=lambda p: arestas_comuns(rotas[p], rota))
+                else:
+                    alvo = heap.pior()
+
+                # A distância limita o fitness: sem chance de bater o alvo, não simula
+                if distancia_rota(rota, dist_matrix) * Config.MULT_DISTANCIA >= heap.fitness[alvo] \
+                        or presentes[chave(rota, velocidades)] > 0:
+                    descartados += 1
+                    continue
+                fit = avaliar(rota, velocidades)
+                avaliacoes += 1
+                if fit < heap.fitness[alvo]:
+                    substituir(alvo, rota, velocidades, fit)
+                    if fit < melhor_fit:
+                        melhor_fit = fit
+                        melhor = {"rota": rota[:], "velocidades": list(velocidades)}
+
+        # LOCAL SEARCH nos elites (por geração equivalente)
+        if (gen + 1) % Config.LOCAL_SEARCH_EVERY == 0:
+            for i in indices_elite(np.asarray(heap.fitness), Config.LOCAL_SEARCH_ELITE):
+                rota = busca_local_rota(rotas[i], dist_matrix, vizinhos)
+                velocidades = decodificar(rota) if decodificar else vel[i].tolist()
+                fit = avaliar(rota, velocidades)
+                avaliacoes += 1
+                if fit < heap.fitness[i]:
+                    substituir(i, rota, velocidades, fit)
+                    if fit < melhor_fit:
+                        melhor_fit = fit
+                        melhor = {"rota": rota[:], "velocidades": list(velocidades)}
+
+        stats = registrar(historico)
+        if limite is not None:
+            historico['gap'].append(calcular_gap(distancia_rota(melhor["rota"], dist_matrix),
+                                                 limite))
+
+        if verbose and (gen + 1) % Config.PRINT_EVERY == 0:
+            print(f"Gen {gen+1:3d} | "
+                  f"Min: {stats['minimo']:10,.0f} | "
+                  f"Média: {stats['media']:10,.0f} | "
+                  f"Desvio: {stats['desvio']:8,.0f} | "
+                  f"Avaliações: {avaliacoes:,} (+{descartados:,} descartados)"
+                  + (f" | Gap: {historico['gap'][-1]:.2%}" if limite is not None else ""))
+
+        if tolerancia_gap > 0 and limite is not None and historico['gap'][-1] <= tolerancia_gap:
+            historico['parada_gap'] = gen + 1
+            if verbose:
+                print(f"\nGen {gen+1:3d} | ✓ Gap {historico['gap'][-1]:.2%} ≤ "
+                      f"{tolerancia_gap:.2%}: parada antecipada")
+            break
+
+        # ESTAGNAÇÃO: os piores dão lugar a indivíduos novos
+        if (gen + 1) % Config.STAGNATION_CHECK == 0:
+            estagnado, melhoria_pct = detectar_estagnacao(historico['media'])
+            if estagnado:
+                novos = int(len(rotas) * Config.RESTART_PERCENTAGE)
+                for i in range(novos):
+                    c = criar_cromossomo(n, idx_base, _construtor_restart(curva, i))
+                    velocidades = decodificar(c["rota"]) if decodificar else c["velocidades"]
+                    substituir(heap.pior(), c["rota"], velocidades,
+                               avaliar(c["rota"], velocidades))
+                avaliacoes += novos
+                if verbose:
+                    print(f"  → Estagnado ({melhoria_pct:.2f}%): {novos} piores reiniciados")
+
+    vel_listas = vel.tolist()
+    ordem = np.argsort(heap.fitness, kind='stable')
+    historico['populacao'] = [{"rota": rotas[i], "velocidades": vel_listas[i]} for i in ordem]
+    historico['avaliacoes'] = avaliacoes
+    historico['descartados'] = descartados
+    if verbose:
+        print(f"\nEstado estacionário: {avaliacoes:,} simulações, "
+              f"{descartados:,} filhos descartados pela distância")
+
+    # BUSCA PROFUNDA no elite final (tempo dividido entre os elites)
+    if tempo_busca_profunda > 0:
+        elite = [melhor] + historico['populacao'][:Config.LOCAL_SEARCH_ELITE - 1]
+        tempo = tempo_busca_profunda / len(elite)
+        for ind in elite:
+            novo = local_search_profunda(ind, dist_matrix, tempo, vizinhos)
+            fit = avaliar(novo["rota"], novo["velocidades"])
+            if fit < melhor_fit:
+                melhor, melhor_fit = novo, fit
+
+    planejar = None
+    if split:
+        # Mesmo objetivo da população: cada candidato com o seu plano de recargas
+        planejar = lambda rota, velocidades: split_recargas(rota, velocidades, dist_matrix)
+        melhor["recargas"] = planejar(melhor["rota"], melhor["velocidades"])
+    if velocidades_dp != "off":
+        melhor, melhor_fit = polir_velocidades(melhor, coords, dist_matrix, wind_cache,
+                                               recargas=planejar, direcoes=direcoes)
+    if recargas_otimas != "off":
+        melhor, _ = otimizar_recargas(melhor, ceps, coords, dist_matrix, wind_cache, direcoes)
+        melhor_fit = calcular_fitness(melhor, coords, dist_matrix, wind_cache,
+                                      direcoes=direcoes)
+
+    return melhor, melhor_fit, historico
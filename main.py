@@ -25,9 +25,24 @@ sys.path.insert(0, str(Path(__file__).parent / 'core'))
 
 import numpy as np
 from core.config import Config
-from core.data_loader import load_ceps_coords, generate_distance_matrix, build_wind_cache
+from core.data_loader import (
+    load_ceps_stream,
+    generate_distance_matrix,
+    generate_bearing_matrix,
+    avaliar_erro_projecao,
+    build_wind_tensor,
+    build_wind_table_interpolada,
+    salvar_instancia,
+    carregar_instancia,
+    reduzir_instancia,
+    expandir_cromossomo
+)
 from core.genetic_algorithm import evolve_optimized
-from core.simulation import simulate_route_detailed, validate_solution
+from core.simulation import simulate_route_detailed, validate_solution, calcular_fitness
+from core.recharge_split import otimizar_recargas
+from core.decomposition import resolver_decomposto
+from core.backbone import evolve_backbone
+from core.steady_state import evolve_steady_state
 
 # ⚠️ CORREÇÃO PRINCIPAL: Import correto das funções de visualização
 from core.visualization import (
@@ -67,8 +82,12 @@ def validar_arquivos_entrada(arquivo_ceps: str, arquivo_ventos: str = None):
             f"Certifique-se de que o arquivo está em {DATA_DIR}/"
         )
     
-    # Valida arquivo de ventos (opcional)
+    # Pacote binário já contém os ventos
     path_ventos = None
+    if path_ceps.suffix == '.npz':
+        return path_ceps, path_ventos
+    
+    # Valida arquivo de ventos (opcional)
     if arquivo_ventos:
         path_ventos = DATA_DIR / arquivo_ventos
         if not path_ventos.exists():
@@ -92,7 +111,10 @@ def imprimir_configuracao(args, usa_ventos: bool):
     print("\n⚙️  CONFIGURAÇÃO DA EXECUÇÃO:")
     print(f"   • Arquivo de entrada: {args.arquivo}")
     print(f"   • Arquivo de saída: {args.out}")
-    print(f"   • Considerando ventos: {'SIM' if usa_ventos else 'NÃO'}")
+    if args.arquivo.endswith('.npz'):
+        print(f"   • Considerando ventos: conforme pacote")
+    else:
+        print(f"   • Considerando ventos: {'SIM' if usa_ventos else 'NÃO'}")
     print(f"   • Seed: {args.seed if args.seed else 'Aleatória'}")
     
     print(f"\n📊 CONFIGURAÇÃO DO FITNESS:")
@@ -103,81 +125,287 @@ def imprimir_configuracao(args, usa_ventos: bool):
     print(f"\n🧬 CONFIGURAÇÃO DO ALGORITMO GENÉTICO:")
     print(f"   • População: {args.pop} indivíduos")
     print(f"   • Gerações: {args.gen}")
-    print(f"   • Crossover: OX ({Config.CROSSOVER_RATE})")
+    if args.adaptive:
+        print(f"   • Crossover: adaptativo entre "
+              f"{', '.join(c.upper() for c in Config.ADAPTATIVO_CROSSOVERS)} "
+              f"({Config.CROSSOVER_RATE})")
+    else:
+        print(f"   • Crossover: {args.crossover.upper()} ({Config.CROSSOVER_RATE})")
     print(f"   • Mutação: Swap ({Config.MUTATION_RATE_SWAP}) + "
           f"Inversion ({Config.MUTATION_RATE_INVERSION}) + "
-          f"2-opt ({Config.MUTATION_RATE_2OPT})")
+          f"2-opt ({Config.MUTATION_RATE_2OPT}) + "
+          f"Or-opt ({Config.MUTATION_RATE_OROPT}) + "
+          f"Ruína e recriação ({Config.MUTATION_RATE_LNS})"
+          f"{' — taxas iniciais, ajustadas pelo bandit' if args.adaptive else ''}")
     print(f"   • Elitismo: {Config.ELITISM_COUNT} indivíduos")
+    if args.init_construtiva > 0:
+        print(f"   • População inicial: {args.init_construtiva:.0%} com rotas construtivas "
+              f"({', '.join(Config.INIT_CONSTRUTIVA_METODOS)})")
+    if args.split != "off":
+        print(f"   • Recargas por split: "
+              f"{'na avaliação de cada indivíduo' if args.split == 'fitness' else 'rota final'}")
+    if args.speed_dp != "off":
+        print(f"   • Velocidades por DP: "
+              f"{'decodificador (toda a população)' if args.speed_dp == 'decoder' else 'polimento final'}")
+    if args.decompose > 0:
+        print(f"   • Decomposição: clusters de ~{args.decompose} CEPs ({args.decompose_method}), "
+              f"{args.workers or os.cpu_count()} processo(s)")
+    if args.exact:
+        print(f"   • Solver exato (Held-Karp) para instâncias com até {Config.EXATO_N_MAX} paradas")
+    if args.gap_tol > 0:
+        print(f"   • Parada antecipada: gap ≤ {args.gap_tol:.2%} do limite de Held-Karp")
+    if args.backbone > 0:
+        print(f"   • Backbone: arestas comuns aos {Config.BACKBONE_ELITE} melhores fixadas a partir "
+              f"da geração {args.backbone} (fases de {Config.BACKBONE_INTERVALO})")
+    if args.steady_state:
+        print(f"   • Motor: estado estacionário (substituição: {args.replace}, "
+              f"{Config.ESTADO_ESTAVEL_FILHOS} filho(s) por passo)")
+    if args.deep_search > 0:
+        print(f"   • Busca profunda: LK + Or-opt por {args.deep_search:g}s "
+              f"{'na rota costurada' if args.decompose > 0 else 'no elite final'}")
     print(f"   • Torneio: k={Config.TOURNAMENT_SIZE}")
-    print(f"   • Simulação: {'RÁPIDA' if Config.USE_FAST_FITNESS else 'DETALHADA'}")
+    if Config.USE_FAST_FITNESS and args.two_tier:
+        print(f"   • Simulação: RÁPIDA + FÍSICA nos {Config.AVALIACAO_DUPLA_ELITE} melhores "
+              f"(margem de {Config.AVALIACAO_DUPLA_MARGEM:.0%})")
+    else:
+        print(f"   • Simulação: {'RÁPIDA' if Config.USE_FAST_FITNESS else 'DETALHADA'}")
+
+
+def imprimir_resumo_ventos(wind_schedule):
+    """Imprime resumo da previsão de ventos por dia"""
+    print(f"\n   📋 Resumo dos Ventos:")
+    for dia in sorted([int(d) for d in wind_schedule.keys()]):
+        dia_str = str(dia)
+        velocidades = [wind_schedule[dia_str][h]['velocidade_kmh'] 
+                      for h in wind_schedule[dia_str].keys()]
+        vel_min = min(velocidades)
+        vel_max = max(velocidades)
+        vel_med = sum(velocidades) / len(velocidades)
+        print(f"      Dia {dia}: {vel_min:.0f}-{vel_max:.0f} km/h "
+              f"(média: {vel_med:.1f} km/h)")
+
+
+def carregar_ventos(arquivo_ventos: Path = None):
+    """
+    Carrega a previsão de ventos (lida uma única vez por execução)
+    
+    Returns:
+        Dict no formato do ventos.json, ou None se não houver vento
+    """
+    wind_schedule = None
+    if arquivo_ventos and arquivo_ventos.exists():
+        try:
+            import json
+            print(f"\n🌬️  CARREGANDO PREVISÃO DE VENTOS...")
+            print(f"   Arquivo: {arquivo_ventos}")
+            
+            with open(arquivo_ventos, 'r', encoding='utf-8') as f:
+                wind_schedule = json.load(f)
+            
+            print(f"   ✓ Previsão de 7 dias carregada")
+            imprimir_resumo_ventos(wind_schedule)
+        
+        except Exception as e:
+            print(f"\n⚠️  Erro ao carregar ventos: {e}")
+            print(f"   Executando SEM considerar ventos")
+            wind_schedule = None
+    
+    return wind_schedule
 
 
-def carregar_dados(arquivo_ceps: Path, arquivo_ventos: Path = None):
+def carregar_pacote(arquivo_pacote: Path, planar: bool = False):
+    """
+    Carrega instância pré-processada (gerada com --prepare)
+    
+    As matrizes de distância e direção viram lista de listas: o AG e os
+    simuladores as indexam elemento a elemento, o que é bem mais rápido
+    em listas do que em arrays NumPy. As listas k-NN seguem prontas para
+    o AG.
+    
+    Args:
+        planar: valor de --planar; o pacote já traz distâncias e direções
+                calculadas, então só se avisa se ele não for planar
+    
+    Returns:
+        Tuple com (ceps, coords, dist_matrix, idx_unibrasil, wind_cache, wind_schedule,
+        vizinhos, direcoes)
+    """
+    print(f"\n📦 CARREGANDO PACOTE DA INSTÂNCIA...")
+    print(f"   Arquivo: {arquivo_pacote}")
+    
+    dados = carregar_instancia(str(arquivo_pacote))
+    ceps = dados['ceps']
+    coords = dados['coords']
+    idx_unibrasil = dados['idx_unibrasil']
+    dist_matrix = dados['dist_matrix'].tolist()
+    projecao = "planar local" if dados['planar'] else "esférica (haversine)"
+    
+    print(f"   ✓ {len(ceps)} CEPs, matrizes {len(dist_matrix)}×{len(dist_matrix)}, "
+          f"k-NN (k={dados['knn'].shape[1]}) e ventos carregados")
+    print(f"   ✓ Projeção do pacote: {projecao}")
+    if planar and not dados['planar']:
+        print(f"   ⚠️  --planar ignorado: o pacote foi gerado sem ele "
+              f"(gere outro com --prepare ... --planar)")
+    print(f"   ✓ Unibrasil (índice {idx_unibrasil}): {ceps[idx_unibrasil]}")
+    
+    if dados['wind_schedule'] is not None:
+        imprimir_resumo_ventos(dados['wind_schedule'])
+    
+    return (ceps, coords, dist_matrix, idx_unibrasil, dados['wind_tensor'], dados['wind_schedule'],
+            dados['knn'], dados['bearing_matrix'].tolist())
+
+
+def imprimir_erro_projecao(coords):
+    """Relata o erro da projeção planar em relação a haversine/bearing"""
+    erro = avaliar_erro_projecao(coords)
+    
+    print(f"   • Projeção planar local ({erro['pares']:,} pares avaliados):")
+    print(f"      Erro máx. distância: {erro['dist_max_km']*1000:.1f} m "
+          f"({erro['dist_max_rel']*100:.3f}%)")
+    print(f"      Erro máx. direção:   {erro['bearing_max_graus']:.3f}°")
+    
+    if erro['dist_max_rel'] > Config.PROJECAO_ERRO_MAX_REL:
+        print(f"   ⚠️  Erro acima do limite ({Config.PROJECAO_ERRO_MAX_REL*100:.2f}%): "
+              f"considere executar sem --planar")
+    else:
+        print(f"   ✓ Erro dentro do limite ({Config.PROJECAO_ERRO_MAX_REL*100:.2f}%)")
+    
+    return erro
+
+
+def carregar_dados(arquivo_ceps: Path, arquivo_ventos: Path = None, planar: bool = False):
     """
     Carrega todos os dados necessários
     
+    Aceita o CSV de CEPs (+ JSON de ventos) ou um pacote .npz gerado
+    com --prepare.
+    
+    Args:
+        planar: Se True, calcula distâncias e direções pela projeção planar
+                local e relata o erro em relação à Haversine
+    
     Returns:
-        Tuple com (ceps, coords, dist_matrix, idx_unibrasil, wind_cache, wind_schedule)
+        Tuple com (ceps, coords, dist_matrix, idx_unibrasil, wind_cache, wind_schedule,
+        vizinhos, direcoes); vizinhos são as listas k-NN do pacote, ou None
+        para o CSV (o AG as calcula); direcoes é a matriz de direções do
+        pacote ou a planar, ou None (os simuladores usam bearing())
     """
+    if arquivo_ceps.suffix == '.npz':
+        return carregar_pacote(arquivo_ceps, planar)
+    
     # Carrega CEPs e coordenadas
     print(f"\n📂 CARREGANDO DADOS...")
     print(f"   Arquivo: {arquivo_ceps}")
     
-    ceps, coords, idx_unibrasil = load_ceps_coords(str(arquivo_ceps))
+    ceps, coords, idx_unibrasil, num_linhas, erros = load_ceps_stream(str(arquivo_ceps))
+    
+    if erros:
+        print(f"   ⚠️  {len(erros)} problema(s) encontrado(s) no arquivo:")
+        for erro in erros[:10]:
+            print(f"      - {erro}")
+        if len(erros) > 10:
+            print(f"      ... ({len(erros) - 10} outros)")
+    
+    if num_linhas == 0:
+        raise ValueError("Arquivo CSV está vazio ou não contém dados válidos")
+    if np.isnan(coords).any():
+        raise ValueError("Arquivo CSV contém coordenadas inválidas (ver linhas acima)")
+    if idx_unibrasil is None:
+        raise ValueError(f"CEP da Unibrasil ({Config.CEP_UNIBRASIL}) não encontrado no arquivo!")
     
     print(f"   ✓ {len(ceps)} CEPs carregados")
     print(f"   ✓ Unibrasil (índice {idx_unibrasil}): {ceps[idx_unibrasil]}")
-    print(f"   ✓ Coordenadas: {coords[idx_unibrasil]}")
+    print(f"   ✓ Coordenadas: {tuple(coords[idx_unibrasil].tolist())}")
     
     # Gera matriz de distâncias
     print(f"\n🗺️  GERANDO MATRIZ DE DISTÂNCIAS...")
-    dist_matrix = generate_distance_matrix(coords)
+    if planar:
+        imprimir_erro_projecao(coords)
+    dist_matrix = generate_distance_matrix(coords, planar=planar)
+    direcoes = generate_bearing_matrix(coords, planar=True).tolist() if planar else None
     dist_total = sum(sum(row) for row in dist_matrix) / 2
     
     print(f"   ✓ Matriz {len(dist_matrix)}×{len(dist_matrix)} calculada")
     print(f"   ✓ Distância total possível: {dist_total:.2f} km")
     
     # Carrega ventos (opcional)
-    wind_schedule = None
-    if arquivo_ventos and arquivo_ventos.exists():
-        try:
-            import json
-            print(f"\n🌬️  CARREGANDO PREVISÃO DE VENTOS...")
-            print(f"   Arquivo: {arquivo_ventos}")
-            
-            with open(arquivo_ventos, 'r', encoding='utf-8') as f:
-                wind_schedule = json.load(f)
-            
-            print(f"   ✓ Previsão de 7 dias carregada")
-            
-            # Resumo dos ventos
-            print(f"\n   📋 Resumo dos Ventos:")
-            for dia in sorted([int(d) for d in wind_schedule.keys()]):
-                dia_str = str(dia)
-                velocidades = [wind_schedule[dia_str][h]['velocidade_kmh'] 
-                              for h in wind_schedule[dia_str].keys()]
-                vel_min = min(velocidades)
-                vel_max = max(velocidades)
-                vel_med = sum(velocidades) / len(velocidades)
-                print(f"      Dia {dia}: {vel_min:.0f}-{vel_max:.0f} km/h "
-                      f"(média: {vel_med:.1f} km/h)")
-        
-        except Exception as e:
-            print(f"\n⚠️  Erro ao carregar ventos: {e}")
-            print(f"   Executando SEM considerar ventos")
-            wind_schedule = None
+    wind_schedule = carregar_ventos(arquivo_ventos)
+    
+    # Constrói tabela de ventos (7 dias × 5 janelas × velocidade/direção)
+    wind_cache = build_wind_tensor(wind_schedule)
+    
+    return ceps, coords, dist_matrix, idx_unibrasil, wind_cache, wind_schedule, None, direcoes
+
+
+def preparar_pacote(arquivo_ceps: Path, arquivo_ventos: Path, arquivo_pacote: str,
+                    planar: bool = False):
+    """
+    Pré-processa a instância e grava o pacote binário (.npz) em ./data/
+    
+    Returns:
+        Path: Caminho do pacote gerado
+    """
+    ceps, coords, dist_matrix, idx_unibrasil, _, wind_schedule, _, _ = \
+        carregar_dados(arquivo_ceps, arquivo_ventos, planar)
+    
+    path_pacote = DATA_DIR / arquivo_pacote
+    if path_pacote.suffix != '.npz':
+        path_pacote = path_pacote.with_suffix(path_pacote.suffix + '.npz')
+    
+    print(f"\n📦 GERANDO PACOTE DA INSTÂNCIA...")
+    dados = salvar_instancia(str(path_pacote), ceps, coords, idx_unibrasil,
+                             wind_schedule=wind_schedule, dist_matrix=dist_matrix,
+                             planar=planar)
     
-    # Constrói cache de ventos
-    wind_cache = build_wind_cache(wind_schedule)
+    print(f"   ✓ Matrizes de distância e direção, k-NN (k={dados['knn'].shape[1]}) e ventos gravados")
+    print(f"   ✓ Pacote salvo em: {path_pacote}")
     
-    return ceps, coords, dist_matrix, idx_unibrasil, wind_cache, wind_schedule
+    return path_pacote
+
+
+def agrupar_ceps(ceps, coords, dist_matrix, idx_unibrasil, raio_m: float):
+    """
+    Agrupa CEPs próximos em super-nós para o AG
+    
+    Returns:
+        Dict da instância reduzida (ver reduzir_instancia)
+    """
+    print(f"\n🧩 AGRUPANDO CEPs PRÓXIMOS (raio {raio_m:.0f} m)...")
+    
+    instancia = reduzir_instancia(ceps, coords, dist_matrix, idx_unibrasil, raio_m)
+    n_reduzido = len(instancia['ceps'])
+    reducao = (1 - n_reduzido / len(ceps)) * 100
+    
+    print(f"   ✓ {len(ceps)} CEPs → {n_reduzido} super-nós ({reducao:.1f}% menor)")
+    
+    return instancia
 
 
 def executar_algoritmo_genetico(ceps, coords, dist_matrix, idx_unibrasil, 
-                                wind_cache, pop_size, generations):
+                                wind_cache, pop_size, generations,
+                                tempo_busca_profunda=0.0, crossover=None,
+                                adaptativo=False, velocidades_dp=None,
+                                recargas_otimas=None, fracao_construtiva=None,
+                                tamanho_cluster=0, metodo_particao=None, processos=None,
+                                geracao_backbone=0, exato=None, tolerancia_gap=None,
+                                avaliacao_dupla=None, estado_estavel=False, substituicao=None,
+                                vizinhos=None, direcoes=None):
     """
     Executa o algoritmo genético
     
+    Com tamanho_cluster > 0, resolve por decomposição geográfica (um AG
+    por cluster em paralelo + costura; ver core/decomposition.py).
+    Com geracao_backbone > 0, fixa as arestas comuns aos melhores a partir
+    dessa geração e segue em fases na instância contraída (core/backbone.py).
+    Com tolerancia_gap > 0, para quando o gap para o limite inferior de
+    Held-Karp (core/lower_bound.py) fica abaixo dela.
+    Com avaliacao_dupla, todos são avaliados pelo modelo rápido e os
+    candidatos à elite pela física (simular_rapido).
+    Com estado_estavel, usa o motor de estado estacionário (filhos
+    disputam vagas um a um; core/steady_state.py) no lugar do geracional.
+    vizinhos: listas k-NN já calculadas (pacote --prepare), ou None
+    direcoes: matriz de direções dos trechos (pacote ou --planar), ou None
+    
     Returns:
         Tuple com (melhor_cromossomo, melhor_fitness, historico)
     """
@@ -185,6 +413,57 @@ def executar_algoritmo_genetico(ceps, coords, dist_matrix, idx_unibrasil,
     print(" EXECUTANDO ALGORITMO GENÉTICO ".center(100))
     print(f"{'='*100}")
     
+    if tamanho_cluster > 0:
+        return resolver_decomposto(
+            ceps, coords, dist_matrix, idx_unibrasil, wind_cache, pop_size, generations,
+            tamanho_cluster=tamanho_cluster,
+            metodo=metodo_particao,
+            processos=processos,
+            tempo_busca_profunda=tempo_busca_profunda,
+            velocidades_dp=velocidades_dp,
+            recargas_otimas=recargas_otimas,
+            crossover=crossover,
+            adaptativo=adaptativo,
+            fracao_construtiva=fracao_construtiva,
+            exato=exato,
+            tolerancia_gap=tolerancia_gap,
+            avaliacao_dupla=avaliacao_dupla,
+            vizinhos=vizinhos,
+            direcoes=direcoes
+        )
+    
+    if geracao_backbone > 0:
+        return evolve_backbone(
+            ceps, coords, dist_matrix, idx_unibrasil, wind_cache, pop_size, generations,
+            geracao_fixacao=geracao_backbone,
+            tempo_busca_profunda=tempo_busca_profunda,
+            velocidades_dp=velocidades_dp,
+            recargas_otimas=recargas_otimas,
+            crossover=crossover,
+            adaptativo=adaptativo,
+            fracao_construtiva=fracao_construtiva,
+            exato=exato,
+            tolerancia_gap=tolerancia_gap,
+            avaliacao_dupla=avaliacao_dupla,
+            vizinhos=vizinhos,
+            direcoes=direcoes
+        )
+    
+    if estado_estavel:
+        return evolve_steady_state(
+            ceps, coords, dist_matrix, idx_unibrasil, wind_cache, pop_size, generations,
+            tempo_busca_profunda=tempo_busca_profunda,
+            crossover=crossover,
+            velocidades_dp=velocidades_dp,
+            recargas_otimas=recargas_otimas,
+            fracao_construtiva=fracao_construtiva,
+            exato=exato,
+            tolerancia_gap=tolerancia_gap,
+            substituicao=substituicao,
+            vizinhos=vizinhos,
+            direcoes=direcoes
+        )
+    
     melhor, melhor_fit, historico = evolve_optimized(
         ceps=ceps,
         coords=coords,
@@ -193,7 +472,18 @@ def executar_algoritmo_genetico(ceps, coords, dist_matrix, idx_unibrasil,
         wind_cache=wind_cache,
         pop_size=pop_size,
         generations=generations,
-        verbose=True
+        verbose=True,
+        tempo_busca_profunda=tempo_busca_profunda,
+        crossover=crossover,
+        adaptativo=adaptativo,
+        velocidades_dp=velocidades_dp,
+        recargas_otimas=recargas_otimas,
+        fracao_construtiva=fracao_construtiva,
+        exato=exato,
+        tolerancia_gap=tolerancia_gap,
+        avaliacao_dupla=avaliacao_dupla,
+        vizinhos=vizinhos,
+        direcoes=direcoes
     )
     
     return melhor, melhor_fit, historico
@@ -279,7 +569,7 @@ def salvar_resultados(csv_rows, arquivo_saida: str):
 
 
 def gerar_visualizacoes(csv_rows, ceps, coords, idx_unibrasil, metricas, 
-                       wind_schedule_path: Path = None):
+                       wind_schedule=None):
     """Gera todos os gráficos de visualização"""
     print(f"\n📊 GERANDO VISUALIZAÇÕES...")
     
@@ -292,10 +582,7 @@ def gerar_visualizacoes(csv_rows, ceps, coords, idx_unibrasil, metricas,
         }
         
         # 1. Gráfico de ventos
-        if wind_schedule_path and wind_schedule_path.exists():
-            import json
-            with open(wind_schedule_path, 'r', encoding='utf-8') as f:
-                wind_schedule = json.load(f)
+        if wind_schedule is not None:
             plotar_distribuicao_ventos(wind_schedule, str(graficos['ventos']))
         
         # 2. Mapa da rota
@@ -348,6 +635,14 @@ def analisar_convergencia(historico):
     else:
         print(f"\n   ✗ CONVERGÊNCIA FRACA (<5% em 20 gerações)")
         print(f"     ATENÇÃO: Revisar fitness ou parâmetros do AG!")
+    
+    if 'limite_inferior' in historico:
+        print(f"\n📐 Limite inferior da distância (Held-Karp): "
+              f"{historico['limite_inferior']:,.2f} km")
+        if historico.get('gap'):
+            print(f"   • Gap do melhor na última geração: {historico['gap'][-1]:.2%}")
+        if 'parada_gap' in historico:
+            print(f"   • Parada antecipada na geração {historico['parada_gap']}")
 
 
 def imprimir_resumo_final(arquivo_csv: Path, graficos_gerados: list):
@@ -381,6 +676,8 @@ Exemplos de uso:
   %(prog)s coordenadas.csv --gen 200 --pop 150
   %(prog)s coordenadas.csv --wind ventos.json --seed 42
   %(prog)s coordenadas.csv --gen 300 --pop 200 --wind ventos.json --out rota_final.csv
+  %(prog)s coordenadas.csv --wind ventos.json --prepare instancia.npz
+  %(prog)s instancia.npz --gen 200
 
 Os arquivos de entrada devem estar em ./data/
 Os arquivos de saída serão salvos em ./output/
@@ -389,7 +686,7 @@ Os arquivos de saída serão salvos em ./output/
     
     parser.add_argument(
         "arquivo",
-        help="Nome do arquivo CSV com CEPs (deve estar em ./data/)"
+        help="Nome do arquivo CSV com CEPs ou pacote .npz (deve estar em ./data/)"
     )
     parser.add_argument(
         "--wind",
@@ -419,9 +716,160 @@ Os arquivos de saída serão salvos em ./output/
         default="rota_saida.csv",
         help="Nome do arquivo CSV de saída (default: rota_saida.csv)"
     )
+    parser.add_argument(
+        "--cluster-radius",
+        type=float,
+        default=Config.RAIO_AGRUPAMENTO_M,
+        help="Agrupa CEPs a até N metros em um único nó do AG "
+             f"(default: {Config.RAIO_AGRUPAMENTO_M:g} = desligado)"
+    )
+    parser.add_argument(
+        "--wind-interp",
+        action="store_true",
+        default=Config.VENTO_INTERPOLADO,
+        help="Interpola o vento linearmente entre as janelas de 3h "
+             "(tabela pré-calculada por segundo)"
+    )
+    parser.add_argument(
+        "--planar",
+        action="store_true",
+        default=Config.USE_PROJECAO_PLANAR,
+        help="Usa projeção planar local para distâncias e direções "
+             "(mais rápido; relata o erro em relação à Haversine)"
+    )
+    parser.add_argument(
+        "--crossover",
+        choices=["ox", "erx", "eax", "gpx"],
+        default=Config.CROSSOVER_TIPO,
+        help="Operador de crossover: OX (ordem), ERX (edge recombination), "
+             f"EAX (edge assembly) ou GPX (partition) (default: {Config.CROSSOVER_TIPO})"
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        default=Config.OPERADORES_ADAPTATIVOS,
+        help="Seleção adaptativa de operadores: um bandit redistribui as taxas de "
+             "mutação e escolhe o crossover pelo ganho de fitness por segundo de CPU"
+    )
+    parser.add_argument(
+        "--speed-dp",
+        choices=["off", "final", "decoder"],
+        default=Config.VELOCIDADES_DP,
+        help="Velocidades ótimas por programação dinâmica: 'final' pole a melhor rota, "
+             "'decoder' calcula as velocidades de todo indivíduo (o AG busca só a rota) "
+             f"(default: {Config.VELOCIDADES_DP})"
+    )
+    parser.add_argument(
+        "--split",
+        choices=["off", "final", "fitness"],
+        default=Config.SPLIT_RECARGAS,
+        help="Pontos de recarga ótimos (split) em vez da regra gulosa: 'final' na rota "
+             "final, 'fitness' na avaliação de cada indivíduo "
+             f"(default: {Config.SPLIT_RECARGAS})"
+    )
+    parser.add_argument(
+        "--init-construtiva",
+        type=float,
+        metavar="FRAC",
+        default=Config.INIT_CONSTRUTIVA,
+        help="Fração da população inicial com rotas de heurísticas construtivas "
+             "(vizinho mais próximo, arestas gulosas, inserção, curva de Hilbert) "
+             f"(default: {Config.INIT_CONSTRUTIVA:g}; 0 = só rotas aleatórias)"
+    )
+    parser.add_argument(
+        "--decompose",
+        type=int,
+        metavar="TAMANHO",
+        default=0,
+        help="Decomposição geográfica: divide os CEPs em clusters de ~TAMANHO, roda um AG "
+             "por cluster em paralelo e costura os sub-tours (default: 0 = desligada; "
+             f"sugerido: {Config.DECOMPOSICAO_TAMANHO_CLUSTER})"
+    )
+    parser.add_argument(
+        "--decompose-method",
+        choices=["kmeans", "grade"],
+        default=Config.DECOMPOSICAO_METODO,
+        help=f"Partição da decomposição (default: {Config.DECOMPOSICAO_METODO})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=Config.DECOMPOSICAO_PROCESSOS,
+        help="Processos em paralelo na decomposição (default: 0 = todos os núcleos)"
+    )
+    parser.add_argument(
+        "--backbone",
+        type=int,
+        metavar="GERACAO",
+        default=Config.BACKBONE_GERACAO,
+        help="A partir da GERACAO, fixa as arestas comuns aos melhores indivíduos e "
+             "continua o AG na instância contraída, refixando a cada fase "
+             "(default: 0 = desligado)"
+    )
+    parser.add_argument(
+        "--no-exact",
+        dest="exact",
+        action="store_false",
+        default=Config.EXATO_AUTOMATICO,
+        help=f"Não usa o solver exato (Held-Karp) em instâncias com até {Config.EXATO_N_MAX} "
+             "paradas; roda sempre o AG"
+    )
+    parser.add_argument(
+        "--gap-tol",
+        type=float,
+        metavar="FRAC",
+        default=Config.GAP_TOLERANCIA,
+        help="Para o AG quando a distância do melhor fica a menos de FRAC do limite "
+             "inferior de Held-Karp (ex.: 0.01 = 1%%; default: 0 = roda todas as gerações)"
+    )
+    parser.add_argument(
+        "--two-tier",
+        action="store_true",
+        default=Config.AVALIACAO_DUPLA,
+        help="Avaliação em duas camadas: modelo rápido para todos e física "
+             f"(simular_rapido, com cache) para os {Config.AVALIACAO_DUPLA_ELITE} melhores e "
+             f"quem estiver a até {Config.AVALIACAO_DUPLA_MARGEM * 100:g}%% deles"
+    )
+    parser.add_argument(
+        "--steady-state",
+        action="store_true",
+        default=Config.ESTADO_ESTAVEL,
+        help="Motor de estado estacionário: cada filho disputa uma vaga com o pior "
+             "(ou o pai mais parecido) em vez de refazer a população a cada geração"
+    )
+    parser.add_argument(
+        "--replace",
+        choices=["pior", "semelhante"],
+        default=Config.ESTADO_ESTAVEL_SUBSTITUICAO,
+        help=f"Vaga disputada no --steady-state (default: {Config.ESTADO_ESTAVEL_SUBSTITUICAO})"
+    )
+    parser.add_argument(
+        "--deep-search",
+        type=float,
+        metavar="SEG",
+        default=Config.DEEP_SEARCH_TEMPO_SEG,
+        help="Ao final do AG, aplica busca profunda (LK + Or-opt) aos elites "
+             f"por até SEG segundos (default: {Config.DEEP_SEARCH_TEMPO_SEG:g} = desligada)"
+    )
+    parser.add_argument(
+        "--prepare",
+        metavar="PACOTE",
+        default=None,
+        help="Apenas gera o pacote binário da instância (.npz) em ./data/ e sai"
+    )
     
     args = parser.parse_args()
     
+    # Motores alternativos: uma combinação não pode ignorar flags em silêncio
+    if args.decompose > 0 and args.backbone > 0:
+        parser.error("--decompose e --backbone são motores alternativos; use só um")
+    if args.steady_state:
+        if args.decompose > 0 or args.backbone > 0:
+            parser.error("--steady-state não combina com --decompose nem com --backbone")
+        if args.adaptive or args.two_tier:
+            parser.error("--adaptive e --two-tier são só do motor geracional "
+                         "(não combinam com --steady-state)")
+    
     # Configura seed se fornecida
     if args.seed:
         random.seed(args.seed)
@@ -431,6 +879,12 @@ Os arquivos de saída serão salvos em ./output/
         # Valida arquivos de entrada
         path_ceps, path_ventos = validar_arquivos_entrada(args.arquivo, args.wind)
         
+        # Modo preparação: gera pacote e sai
+        if args.prepare:
+            imprimir_cabecalho()
+            preparar_pacote(path_ceps, path_ventos, args.prepare, args.planar)
+            return 0
+        
         # Imprime cabeçalho e configuração
         imprimir_cabecalho()
         imprimir_configuracao(args, path_ventos is not None)
@@ -447,18 +901,51 @@ Os arquivos de saída serão salvos em ./output/
                 return 1
         
         # Carrega dados
-        ceps, coords, dist_matrix, idx_unibrasil, wind_cache, wind_schedule = \
-            carregar_dados(path_ceps, path_ventos)
+        ceps, coords, dist_matrix, idx_unibrasil, wind_cache, wind_schedule, vizinhos, direcoes = \
+            carregar_dados(path_ceps, path_ventos, args.planar)
         
-        # Executa AG
-        melhor, melhor_fit, historico = executar_algoritmo_genetico(
-            ceps, coords, dist_matrix, idx_unibrasil, wind_cache,
-            args.pop, args.gen
-        )
+        if args.wind_interp:
+            wind_cache = build_wind_table_interpolada(wind_cache)
+            print(f"   ✓ Vento interpolado entre janelas (tabela por segundo)")
+        
+        # Agrupa CEPs próximos (opcional)
+        if args.cluster_radius > 0:
+            instancia = agrupar_ceps(ceps, coords, dist_matrix, idx_unibrasil,
+                                     args.cluster_radius)
+            lideres = [g[0] for g in instancia['grupos']]
+            direcoes_reduzidas = (None if direcoes is None
+                                  else [[direcoes[i][j] for j in lideres] for i in lideres])
+            
+            melhor, melhor_fit, historico = executar_algoritmo_genetico(
+                instancia['ceps'], instancia['coords'], instancia['dist_matrix'],
+                instancia['idx_base'], wind_cache, args.pop, args.gen,
+                args.deep_search, args.crossover, args.adaptive, args.speed_dp,
+                args.split, args.init_construtiva, args.decompose, args.decompose_method,
+                args.workers, args.backbone, args.exact, args.gap_tol, args.two_tier,
+                args.steady_state, args.replace,
+                direcoes=direcoes_reduzidas
+            )
+            
+            # Volta para os CEPs originais (uma parada por CEP)
+            melhor = expandir_cromossomo(melhor, instancia['grupos'])
+            if args.split != "off":
+                melhor, _ = otimizar_recargas(melhor, ceps, coords, dist_matrix, wind_cache,
+                                              direcoes)
+            melhor_fit = calcular_fitness(melhor, coords, dist_matrix, wind_cache,
+                                          direcoes=direcoes)
+        else:
+            # Executa AG
+            melhor, melhor_fit, historico = executar_algoritmo_genetico(
+                ceps, coords, dist_matrix, idx_unibrasil, wind_cache,
+                args.pop, args.gen, args.deep_search, args.crossover, args.adaptive, args.speed_dp,
+                args.split, args.init_construtiva, args.decompose, args.decompose_method,
+                args.workers, args.backbone, args.exact, args.gap_tol, args.two_tier,
+                args.steady_state, args.replace, vizinhos, direcoes
+            )
         
         # Simula rota detalhada
         csv_rows, metricas = simulate_route_detailed(
-            melhor, ceps, coords, dist_matrix, wind_cache
+            melhor, ceps, coords, dist_matrix, wind_cache, direcoes
         )
         
         # Analisa resultado
@@ -470,7 +957,7 @@ Os arquivos de saída serão salvos em ./output/
         
         # Gera visualizações
         graficos = gerar_visualizacoes(
-            csv_rows, ceps, coords, idx_unibrasil, metricas, path_ventos
+            csv_rows, ceps, coords, idx_unibrasil, metricas, wind_schedule
         )
         
         # Analisa convergência
@@ -0,0 +1,20 @@
+"""Instâncias aleatórias em Curitiba compartilhadas pelos testes"""
+
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+import numpy as np
+from data_loader import generate_distance_matrix
+
+
+def instancia(n: int, seed: int, como_array: bool = False):
+    """n coordenadas uniformes num quadrado de ~0.2° e a matriz de distâncias"""
+    rnd = random.Random(seed)
+    coords = [(-25.45 + rnd.uniform(-0.1, 0.1), -49.27 + rnd.uniform(-0.1, 0.1))
+              for _ in range(n)]
+    dist = generate_distance_matrix(coords)
+    return coords, (np.asarray(dist) if como_array else dist)
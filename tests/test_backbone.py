@@ -0,0 +1,76 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from config import Config
+from local_search import distancia_rota
+from genetic_algorithm import criar_cromossomo
+from backbone import (arestas_backbone, formar_cadeias, contrair_instancia, contrair_cromossomo,
+                      expandir_cromossomo_cadeias, evolve_backbone)
+
+
+def arestas(rota):
+    return {(min(a, b), max(a, b)) for a, b in zip(rota[:-1], rota[1:])}
+from instancias import instancia
+
+
+# ====================================================================
+# TESTE 20: backbone.py - Fixação de arestas e instância contraída
+# ====================================================================
+class TestBackbone(unittest.TestCase):
+
+    def test_backbone_e_cadeias(self):
+        """Arestas comuns (sem as da base) formam cadeias que cobrem todas as paradas."""
+        r1 = [0, 1, 2, 3, 4, 5, 6, 0]
+        r2 = [0, 3, 2, 1, 4, 5, 6, 0]
+
+        fixas = arestas_backbone([r1, r2], 0)
+        cadeias = formar_cadeias(fixas, 7)
+
+        self.assertEqual(fixas, {(1, 2), (2, 3), (4, 5), (5, 6)})
+        self.assertEqual(sorted(map(sorted, cadeias)), [[0], [1, 2, 3], [4, 5, 6]])
+
+    def test_contrair_e_expandir(self):
+        """Rota que contém o backbone volta igual (em comprimento) após contrair e expandir."""
+        random.seed(0)
+        coords, dist = instancia(30, seed=1)
+        ref = criar_cromossomo(30, 0)
+        outra = dict(ref, rota=ref["rota"][:10] + ref["rota"][10:20][::-1] + ref["rota"][20:])
+        cadeias = formar_cadeias(arestas_backbone([ref["rota"], outra["rota"]], 0), 30)
+        inst = contrair_instancia([str(i) for i in range(30)], coords, dist, 0, cadeias, ref)
+
+        reduzido = contrair_cromossomo(ref, inst)
+        expandido = expandir_cromossomo_cadeias(reduzido, inst, dist)
+
+        self.assertLess(len(reduzido["rota"]), 10)
+        self.assertEqual(len(reduzido["velocidades"]), len(reduzido["rota"]) - 1)
+        self.assertEqual(expandido["rota"][0], 0)
+        self.assertEqual(sorted(expandido["rota"][:-1]), list(range(30)))
+        self.assertEqual(len(expandido["velocidades"]), 30)
+        self.assertLessEqual(distancia_rota(expandido["rota"], dist),
+                             distancia_rota(ref["rota"], dist) + 1e-9)
+        self.assertTrue(arestas_backbone([ref["rota"], outra["rota"]], 0)
+                        <= arestas(expandido["rota"]))
+
+    def test_evolve_em_fases(self):
+        """AG em fases devolve rota completa e histórico de todas as gerações."""
+        random.seed(2)
+        coords, dist = instancia(40, seed=3)
+
+        melhor, fit, historico = evolve_backbone(
+            [str(i) for i in range(40)], coords, dist, 0, {}, 16, 12,
+            geracao_fixacao=4, intervalo=4, verbose=False,
+            velocidades_dp="off", recargas_otimas="off", exato=False)
+
+        self.assertEqual(sorted(melhor["rota"][:-1]), list(range(40)))
+        self.assertTrue(set(melhor["velocidades"]) <= set(Config.VELOCIDADES_VALIDAS))
+        self.assertEqual([g for g, _ in historico['fases']], [4, 4, 4])
+        self.assertEqual(len(historico['media']), 12 + 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+import numpy as np
+from config import Config
+from local_search import build_knn_lists
+from genetic_algorithm import populacao_inicial_balanceada, restart_parcial, criar_cromossomo
+from construction import (vizinho_mais_proximo, arestas_gulosas, insercao, rota_curva,
+                          perturbar, rotas_construtivas, indices_hilbert, indices_morton,
+                          construtor_curva)
+from instancias import instancia
+
+
+def comprimento(rota, dist):
+    return sum(dist[a][b] for a, b in zip(rota[:-1], rota[1:]))
+
+
+# ====================================================================
+# TESTE 17: construction.py - Heurísticas construtivas
+# ====================================================================
+class TestHeuristicasConstrutivas(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.n = 80
+        self.coords, self.dist = instancia(self.n, seed=3, como_array=True)
+        self.vizinhos = build_knn_lists(self.dist.tolist(), 10).tolist()
+
+    def assertRotaValida(self, rota, base=0):
+        self.assertEqual(rota[0], base)
+        self.assertEqual(rota[-1], base)
+        self.assertEqual(sorted(rota[:-1]), list(range(self.n)))
+
+    def test_rotas_validas_e_melhores_que_aleatorias(self):
+        """Toda heurística gera rota completa bem mais curta que uma permutação."""
+        aleatoria = [0] + random.sample(range(1, self.n), self.n - 1) + [0]
+        rotas = [vizinho_mais_proximo(self.dist, 0),
+                 arestas_gulosas(self.dist, 0, self.vizinhos),
+                 insercao(self.dist, 0, "mais_barata"),
+                 insercao(self.dist, 0, "mais_distante"),
+                 rota_curva(self.coords, 0)]
+
+        for rota in rotas:
+            self.assertRotaValida(rota)
+            self.assertLess(comprimento(rota, self.dist), 0.5 * comprimento(aleatoria, self.dist))
+
+    def test_insercao_mais_barata_igual_ingenua(self):
+        """Cache de arestas de entrada não muda o resultado da inserção mais barata."""
+        dist = self.dist
+        rota = insercao(dist, 0, "mais_barata", inicio=5)
+
+        ciclo = [0, 5]
+        fora = set(range(self.n)) - {0, 5}
+        while fora:
+            _, k, p = min((dist[ciclo[p]][k] + dist[k][ciclo[(p + 1) % len(ciclo)]]
+                           - dist[ciclo[p]][ciclo[(p + 1) % len(ciclo)]], k, p)
+                          for k in fora for p in range(len(ciclo)))
+            ciclo.insert(p + 1, k)
+            fora.remove(k)
+
+        self.assertAlmostEqual(comprimento(rota, dist), comprimento(ciclo + [0], dist), places=6)
+
+    def test_perturbacao_e_lote(self):
+        """Chutes preservam a permutação; o lote alterna os métodos."""
+        rota = vizinho_mais_proximo(self.dist, 0)
+        self.assertRotaValida(perturbar(rota, 3))
+        self.assertNotEqual(perturbar(rota, 3), rota)
+
+        rotas = rotas_construtivas(12, self.dist, 0, self.coords, self.vizinhos)
+        self.assertEqual(len(rotas), 12)
+        for r in rotas:
+            self.assertRotaValida(r)
+        self.assertEqual(rotas_construtivas(3, self.dist, 0, metodos=("curva",)), [])
+
+    def test_populacao_mantem_faixas_de_velocidade(self):
+        """Só a rota dos indivíduos semeados muda; as velocidades seguem as faixas."""
+        pop_size = 50
+        pop = populacao_inicial_balanceada(pop_size, self.n, 0, self.dist, self.coords,
+                                           self.vizinhos, fracao_construtiva=0.2)
+        limite = 0.5 * np.mean([comprimento(c['rota'], self.dist) for c in pop])
+        semeados = [i for i, c in enumerate(pop) if comprimento(c['rota'], self.dist) < limite]
+
+        self.assertEqual(len(semeados), 10)
+        num_baixa = int(pop_size * Config.INIT_VELOCIDADE_BAIXA)
+        self.assertTrue(any(i < num_baixa for i in semeados))
+        self.assertTrue(any(i >= 2 * num_baixa for i in semeados))
+        for c in pop[:num_baixa]:
+            self.assertRotaValida(c['rota'])
+            self.assertTrue(max(c['velocidades']) <= 52)
+
+
+# ====================================================================
+# TESTE 18: construction.py - Curvas que preenchem o plano (sem matriz)
+# ====================================================================
+class TestCurvaSemMatriz(unittest.TestCase):
+
+    def test_indices_das_curvas(self):
+        """Hilbert visita a grade 4x4 em passos unitários; Morton intercala os bits."""
+        grade = np.array([(x, y) for x in range(4) for y in range(4)], dtype=np.float64)
+
+        ordem = grade[np.argsort(indices_hilbert(grade, ordem=2))]
+        self.assertTrue(np.all(np.abs(np.diff(ordem, axis=0)).sum(axis=1) == 1))
+
+        morton = indices_morton(grade, ordem=2)
+        esperado = [sum(((int(x) >> b & 1) << 2 * b) | ((int(y) >> b & 1) << 2 * b + 1)
+                        for b in range(2)) for x, y in grade]
+        self.assertEqual(morton.tolist(), esperado)
+
+    def test_construtor_diversifica(self):
+        """Ângulos diferentes dão rotas diferentes; o mesmo ângulo repete a rota."""
+        random.seed(2)
+        coords, dist = instancia(300, seed=4, como_array=True)
+        construir = construtor_curva(coords)
+        aleatoria = [0] + random.sample(range(1, 300), 299) + [0]
+
+        rotas = [construir(0) for _ in range(5)]
+        self.assertEqual(len({tuple(r) for r in rotas}), 5)
+        self.assertEqual(construir(0, angulo=1.0), construir(0, angulo=1.0))
+        for r in rotas:
+            self.assertEqual(sorted(r[:-1]), list(range(300)))
+            self.assertLess(comprimento(r, dist), 0.3 * comprimento(aleatoria, dist))
+
+    def test_restart_com_curva(self):
+        """Restart mantém os melhores e injeta rotas da curva na fração configurada."""
+        random.seed(3)
+        coords, dist = instancia(60, seed=5, como_array=True)
+        pop = [criar_cromossomo(60, 0) for _ in range(20)]
+        fitness = list(range(20))
+        construir = construtor_curva(coords)
+
+        nova = restart_parcial(pop, fitness, 60, 0, construir)
+        num_manter = int(20 * (1 - Config.RESTART_PERCENTAGE))
+        novos = nova[num_manter:]
+        limite = 0.5 * np.mean([comprimento(c['rota'], dist) for c in pop])
+        da_curva = [c for c in novos if comprimento(c['rota'], dist) < limite]
+
+        self.assertEqual(nova[0]['rota'], pop[0]['rota'])
+        self.assertEqual(len(nova), 20)
+        self.assertEqual(len(da_curva), int(len(novos) * Config.RESTART_CURVA))
+
+
+if __name__ == '__main__':
+    unittest.main()
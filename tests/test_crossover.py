@@ -0,0 +1,92 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from data_loader import generate_distance_matrix
+from local_search import preparar_vizinhos, two_opt_vizinhanca, distancia_rota
+from crossover import erx, eax, eax_par, gpx
+
+
+def pais_aleatorios(n: int, seed: int = 0, otimizar: bool = False):
+    """Matriz de distâncias e dois pais (opcionalmente 2-opt)."""
+    rnd = random.Random(seed)
+    coords = [(-25.45 + rnd.uniform(-0.1, 0.1), -49.27 + rnd.uniform(-0.1, 0.1))
+              for _ in range(n)]
+    d = generate_distance_matrix(coords)
+    pais = [[0] + rnd.sample(range(1, n), n - 1) + [0] for _ in range(2)]
+    if otimizar:
+        vizinhos = preparar_vizinhos(d)
+        pais = [two_opt_vizinhanca(p, d, vizinhos) for p in pais]
+    return d, pais[0], pais[1]
+
+
+def rota_valida(rota, n):
+    return rota[0] == 0 and rota[-1] == 0 and sorted(rota[1:-1]) == list(range(1, n))
+
+
+def arestas(rota):
+    return {frozenset(rota[i:i + 2]) for i in range(len(rota) - 1)}
+
+
+# ====================================================================
+# TESTE 10: crossover.py - ERX, EAX e GPX
+# ====================================================================
+class TestCrossoverArestas(unittest.TestCase):
+
+    def test_filhos_validos(self):
+        """Os três operadores produzem permutações fechadas na base."""
+        random.seed(0)
+        for n in (6, 30, 120):
+            for seed in range(10):
+                d, r1, r2 = pais_aleatorios(n, seed, otimizar=seed % 2 == 1)
+                vizinhos = preparar_vizinhos(d)
+
+                filhos = [erx(r1, r2)]
+                filhos.extend(eax_par(r1, r2, d, vizinhos))
+                filhos.extend(gpx(r1, r2, d))
+
+                for filho in filhos:
+                    self.assertTrue(rota_valida(filho, n))
+
+    def test_pais_iguais(self):
+        """Pais iguais geram o próprio pai."""
+        d, r1, _ = pais_aleatorios(40, seed=1)
+        vizinhos = preparar_vizinhos(d)
+
+        self.assertEqual(arestas(erx(r1, r1)), arestas(r1))
+        self.assertEqual(eax(r1, r1, d, vizinhos), r1)
+        self.assertEqual(arestas(gpx(r1, r1, d)[0]), arestas(r1))
+
+    def test_erx_herda_arestas(self):
+        """Quase todas as arestas do ERX vêm de algum dos pais."""
+        random.seed(2)
+        d, r1, r2 = pais_aleatorios(100, seed=2)
+        filho = erx(r1, r2)
+
+        herdadas = len(arestas(filho) & (arestas(r1) | arestas(r2)))
+        self.assertGreater(herdadas, 0.9 * len(arestas(filho)))
+
+    def test_eax_preserva_arestas_comuns(self):
+        """Arestas comuns aos pais sobrevivem no filho do EAX (a menos da fusão)."""
+        random.seed(3)
+        d, r1, r2 = pais_aleatorios(120, seed=3, otimizar=True)
+        filho = eax(r1, r2, d, preparar_vizinhos(d))
+
+        comuns = arestas(r1) & arestas(r2)
+        self.assertGreater(len(comuns & arestas(filho)), 0.8 * len(comuns))
+
+    def test_gpx_nao_piora_o_pai(self):
+        """GPX: cada filho é no máximo tão longo quanto o pai de referência."""
+        for seed in range(10):
+            d, r1, r2 = pais_aleatorios(80, seed, otimizar=True)
+            g1, g2 = gpx(r1, r2, d)
+            self.assertLessEqual(distancia_rota(g1, d), distancia_rota(r1, d) + 1e-9)
+            self.assertLessEqual(distancia_rota(g2, d), distancia_rota(r2, d) + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
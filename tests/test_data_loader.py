@@ -4,6 +4,7 @@ Testes Unitários para data_loader.py
 Testa funções de carregamento e processamento de dados.
 """
 
+import math
 import pytest
 import sys
 from pathlib import Path
@@ -15,7 +16,16 @@ from core.data_loader import (
     haversine,
     generate_distance_matrix,
     validar_arquivo_csv,
-    calcular_estatisticas_distancias
+    calcular_estatisticas_distancias,
+    load_ceps_stream,
+    salvar_instancia,
+    carregar_instancia,
+    agrupar_ceps_proximos,
+    reduzir_instancia,
+    expandir_cromossomo,
+    projetar_coords,
+    generate_bearing_matrix,
+    avaliar_erro_projecao
 )
 
 
@@ -96,6 +106,50 @@ class TestDistanceMatrix:
                 assert diff < 0.001, f"Matriz não simétrica em [{i}][{j}]"
 
 
+class TestProjecaoPlanar:
+    """Testes para a projeção planar local"""
+    
+    coords = [
+        (-25.4524871, -49.2925963),
+        (-25.4376831, -49.2729254),
+        (-25.5450000, -49.1800000)
+    ]
+    
+    def test_distancias_proximas_haversine(self):
+        """Distância planar deve ficar a menos de 0,5% da Haversine"""
+        esferica = generate_distance_matrix(self.coords)
+        planar = generate_distance_matrix(self.coords, planar=True)
+        
+        for i in range(3):
+            for j in range(3):
+                if i != j:
+                    assert abs(planar[i][j] - esferica[i][j]) / esferica[i][j] < 0.005
+    
+    def test_direcoes_planares(self):
+        """Norte e Leste devem dar 0° e 90° no plano"""
+        coords = [(-25.45, -49.29), (-25.40, -49.29), (-25.45, -49.24)]
+        bearings = generate_bearing_matrix(coords, planar=True)
+        
+        assert abs(bearings[0][1] - 0.0) < 1e-6
+        assert abs(bearings[0][2] - 90.0) < 1e-6
+    
+    def test_origem_no_centro(self):
+        """Sem origem informada, o plano é centrado nos pontos"""
+        xy = projetar_coords(self.coords)
+        
+        assert xy.shape == (3, 2)
+        assert abs(xy[:, 0].mean()) < 1e-9
+        assert abs(xy[:, 1].mean()) < 1e-9
+    
+    def test_relatorio_de_erro(self):
+        """Relatório deve cobrir todos os pares de instâncias pequenas"""
+        erro = avaliar_erro_projecao(self.coords)
+        
+        assert erro['pares'] == 3
+        assert erro['dist_max_rel'] < 0.005
+        assert erro['bearing_max_graus'] < 0.5
+
+
 class TestValidacaoCSV:
     """Testes para validação de arquivos CSV"""
     
@@ -117,6 +171,180 @@ class TestValidacaoCSV:
         assert 'erros' in resultado
 
 
+class TestCarregamentoStreaming:
+    """Testes para o carregador de leitura única"""
+    
+    def _escrever(self, tmp_path, linhas):
+        arquivo = tmp_path / "ceps.csv"
+        arquivo.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+        return str(arquivo)
+    
+    def test_coords_array_float64(self, tmp_path):
+        """Coordenadas devem vir como array (n, 2) float64"""
+        arquivo = self._escrever(tmp_path, [
+            "cep,latitude,longitude",
+            "80050370,-25.4376831,-49.2729254",
+            "82821020,-25.4524871,-49.2925963",
+        ])
+        
+        ceps, coords, idx, num_linhas, erros = load_ceps_stream(arquivo, chunk_size=1)
+        
+        assert ceps == ["80050370", "82821020"]
+        assert coords.shape == (2, 2)
+        assert coords.dtype.name == "float64"
+        assert coords[1, 0] == -25.4524871
+        assert idx == 1
+        assert num_linhas == 2
+        assert erros == []
+    
+    def test_erros_com_numero_da_linha(self, tmp_path):
+        """Erros de CEP e coordenadas devem citar a linha do arquivo"""
+        arquivo = self._escrever(tmp_path, [
+            "cep,latitude,longitude",
+            "82821020,-25.4524871,-49.2925963",
+            "123,-25.44,-49.27",
+            "80050370,abc,-49.27",
+            "80050371,-10.0,-49.27",
+        ])
+        
+        _, coords, _, _, erros = load_ceps_stream(arquivo, chunk_size=2)
+        
+        assert any(e.startswith("Linha 3: CEP inválido") for e in erros)
+        assert any(e.startswith("Linha 4: Coordenadas inválidas") for e in erros)
+        assert any(e.startswith("Linha 5: Latitude fora") for e in erros)
+        assert coords.shape == (4, 2)
+    
+    def test_nan_e_inf_sao_invalidos(self, tmp_path):
+        """'nan' e 'inf' convertem sem erro, mas devem ser relatados na linha"""
+        arquivo = self._escrever(tmp_path, [
+            "cep,latitude,longitude",
+            "82821020,-25.4524871,-49.2925963",
+            "80050370,nan,-49.27",
+            "80050371,-25.44,inf",
+        ])
+        
+        _, coords, _, _, erros = load_ceps_stream(arquivo, chunk_size=2)
+        
+        assert erros == ["Linha 3: Coordenadas inválidas", "Linha 4: Coordenadas inválidas"]
+        assert all(math.isnan(v) for v in coords[1:].ravel())
+        assert coords[0].tolist() == [-25.4524871, -49.2925963]
+    
+    def test_validacao_usa_mesma_leitura(self, tmp_path):
+        """validar_arquivo_csv deve refletir os erros do carregador"""
+        arquivo = self._escrever(tmp_path, [
+            "cep,latitude,longitude",
+            "80050370,-25.4376831,-49.2729254",
+        ])
+        
+        resultado = validar_arquivo_csv(arquivo)
+        
+        assert resultado['valido'] == False
+        assert resultado['num_linhas'] == 1
+        assert resultado['tem_unibrasil'] == False
+
+
+class TestPacoteInstancia:
+    """Testes para o pacote binário (.npz) da instância"""
+    
+    def test_ida_e_volta(self, tmp_path):
+        """Pacote gravado deve ser lido com os mesmos dados"""
+        ceps = ["82821020", "80050370", "80050371"]
+        coords = [
+            (-25.4524871, -49.2925963),
+            (-25.4376831, -49.2729254),
+            (-25.4450000, -49.2800000)
+        ]
+        ventos = {"1": {"6": {"velocidade_kmh": 9.0, "direcao_graus": 157.5}}}
+        arquivo = str(tmp_path / "instancia.npz")
+        
+        salvar_instancia(arquivo, ceps, coords, 0, wind_schedule=ventos, k=2)
+        dados = carregar_instancia(arquivo)
+        
+        assert dados['ceps'] == ceps
+        assert dados['idx_unibrasil'] == 0
+        assert dados['dist_matrix'].shape == (3, 3)
+        assert dados['bearing_matrix'].shape == (3, 3)
+        assert dados['knn'].shape == (3, 2)
+        assert dados['wind_tensor'].shape == (7, 5, 2)
+        assert dados['wind_cache'][(1, 6)] == (9.0, 157.5)
+        assert dados['wind_cache'][(2, 6)] == (0.0, 0.0)
+        
+        matrix = generate_distance_matrix(coords)
+        assert abs(dados['dist_matrix'][0][1] - matrix[0][1]) < 1e-9
+    
+    def test_sem_vento(self, tmp_path):
+        """Pacote sem vento não deve gerar previsão para os gráficos"""
+        arquivo = str(tmp_path / "instancia.npz")
+        salvar_instancia(arquivo, ["82821020", "80050370"],
+                         [(-25.45, -49.29), (-25.43, -49.27)], 0)
+        
+        dados = carregar_instancia(arquivo)
+        
+        assert dados['wind_schedule'] is None
+        assert dados['wind_cache'][(1, 6)] == (0.0, 0.0)
+        assert dados['planar'] == False
+    
+    def test_flag_planar(self, tmp_path):
+        """Pacote planar deve registrar o flag e as direções planares"""
+        coords = [(-25.45, -49.29), (-25.43, -49.27), (-25.44, -49.30)]
+        arquivo = str(tmp_path / "instancia.npz")
+        salvar_instancia(arquivo, ["82821020", "80050370", "80050371"], coords, 0, planar=True)
+        
+        dados = carregar_instancia(arquivo)
+        
+        assert dados['planar'] == True
+        planares = generate_bearing_matrix(coords, planar=True)
+        assert abs(dados['bearing_matrix'][0][1] - planares[0][1]) < 1e-9
+
+
+class TestAgrupamento:
+    """Testes para o agrupamento de CEPs próximos"""
+    
+    coords = [
+        (-25.4524871, -49.2925963),  # Unibrasil
+        (-25.4376831, -49.2729254),
+        (-25.4376841, -49.2729254),  # ~0,1 m do anterior
+        (-25.4450000, -49.2800000),
+        (-25.4524875, -49.2925963),  # ~0,05 m da Unibrasil
+    ]
+    ceps = ["82821020", "80050370", "80050371", "80050372", "80050373"]
+    
+    def test_agrupa_coincidentes(self):
+        """Pontos a menos do raio devem cair no mesmo grupo"""
+        grupos, grupo_base = agrupar_ceps_proximos(self.coords, 0, raio_m=5.0)
+        
+        assert grupos[grupo_base] == [0, 4]
+        assert [1, 2] in grupos
+        assert [3] in grupos
+        assert sorted(i for g in grupos for i in g) == list(range(5))
+    
+    def test_raio_zero_nao_agrupa(self):
+        """Raio 0 deve manter um grupo por CEP"""
+        grupos, grupo_base = agrupar_ceps_proximos(self.coords, 0, raio_m=0.0)
+        
+        assert grupos == [[i] for i in range(5)]
+        assert grupo_base == 0
+    
+    def test_expansao_visita_todos(self):
+        """Rota expandida deve visitar cada CEP original uma vez"""
+        matrix = generate_distance_matrix(self.coords)
+        inst = reduzir_instancia(self.ceps, self.coords, matrix, 0, raio_m=5.0)
+        
+        assert len(inst['ceps']) == 3
+        
+        outros = [g for g in range(3) if g != inst['idx_base']]
+        rota_r = [inst['idx_base']] + outros + [inst['idx_base']]
+        cromossomo = expandir_cromossomo(
+            {"rota": rota_r, "velocidades": [40, 60, 80]}, inst['grupos']
+        )
+        
+        rota = cromossomo["rota"]
+        assert rota[0] == 0 and rota[-1] == 0
+        assert sorted(rota[1:-1]) == [1, 2, 3, 4]
+        assert len(cromossomo["velocidades"]) == len(rota) - 1
+        assert cromossomo["velocidades"][-1] == 80
+
+
 class TestEstatisticas:
     """Testes para cálculo de estatísticas"""
     
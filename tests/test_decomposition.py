@@ -0,0 +1,86 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+import numpy as np
+from config import Config
+from data_loader import generate_distance_matrix, projetar_coords
+from local_search import distancia_rota
+from decomposition import particionar, costurar, resolver_decomposto
+from instancias import instancia
+
+
+# ====================================================================
+# TESTE 19: decomposition.py - Decomposição por clusters e costura
+# ====================================================================
+class TestDecomposicao(unittest.TestCase):
+
+    def test_particao_cobre_todos(self):
+        """As duas partições dividem as paradas sem repetir nenhuma."""
+        random.seed(0)
+        coords, _ = instancia(200, seed=1)
+        for metodo in ("kmeans", "grade"):
+            clusters = particionar(coords, 9, metodo)
+
+            self.assertLessEqual(len(clusters), 9)
+            self.assertEqual(sorted(np.concatenate(clusters).tolist()), list(range(200)))
+
+        tamanhos = [len(c) for c in particionar(coords, 9, "grade")]
+        self.assertLessEqual(max(tamanhos) - min(tamanhos), 2)
+
+    def test_costura_abre_ciclos(self):
+        """Costura de dois ciclos corta uma aresta de cada e liga as pontas mais próximas."""
+        coords = [(-25.45, -49.27 + 0.001 * i) for i in range(4)] + \
+                 [(-25.45, -49.20 + 0.001 * i) for i in range(4)]
+        dist = generate_distance_matrix(coords)
+        xy = projetar_coords(coords)
+        ciclos = [[0, 1, 2, 3], [4, 5, 6, 7]]
+        centros = np.array([xy[c].mean(axis=0) for c in ciclos])
+
+        tour = costurar(ciclos, [0, 1], dist, xy, centros)
+
+        self.assertEqual(sorted(tour), list(range(8)))
+        self.assertAlmostEqual(distancia_rota(tour + [tour[0]], dist),
+                               2 * dist[0][7], places=6)
+
+    def test_resolve_em_paralelo(self):
+        """Rota costurada é completa, começa na base e tem velocidades válidas."""
+        random.seed(2)
+        coords, dist = instancia(60, seed=3)
+        ceps = [str(i) for i in range(60)]
+
+        melhor, fit, historico = resolver_decomposto(
+            ceps, coords, dist, 5, {}, pop_size=12, generations=3,
+            tamanho_cluster=20, processos=2, verbose=False)
+
+        self.assertEqual(melhor["rota"][0], 5)
+        self.assertEqual(melhor["rota"][-1], 5)
+        self.assertEqual(sorted(melhor["rota"][:-1]), list(range(60)))
+        self.assertEqual(len(melhor["velocidades"]), 60)
+        self.assertTrue(set(melhor["velocidades"]) <= set(Config.VELOCIDADES_VALIDAS))
+        self.assertEqual(sum(c["tamanho"] for c in historico["clusters"]), 60)
+        self.assertEqual(len(historico["media"]), 4)
+
+    def test_busca_profunda_na_costura(self):
+        """A busca profunda na rota costurada nunca aumenta a distância."""
+        coords, dist = instancia(60, seed=3)
+        ceps = [str(i) for i in range(60)]
+        distancias = []
+        for tempo in (0.0, 0.2):
+            random.seed(2)
+            melhor, _, _ = resolver_decomposto(
+                ceps, coords, dist, 5, {}, pop_size=12, generations=3, tamanho_cluster=20,
+                processos=1, verbose=False, velocidades_dp="off", recargas_otimas="off",
+                tempo_busca_profunda=tempo)
+            self.assertEqual(sorted(melhor["rota"][:-1]), list(range(60)))
+            distancias.append(distancia_rota(melhor["rota"], dist))
+
+        self.assertLessEqual(distancias[1], distancias[0] + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import itertools
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from config import Config
+from local_search import distancia_rota
+from genetic_algorithm import evolve_optimized
+from exact_solver import held_karp
+from instancias import instancia
+
+
+# ====================================================================
+# TESTE 21: exact_solver.py - Held-Karp para instâncias pequenas
+# ====================================================================
+class TestHeldKarp(unittest.TestCase):
+
+    def test_igual_forca_bruta(self):
+        """Held-Karp acha a menor rota entre todas as permutações."""
+        for n, seed in [(2, 0), (3, 1), (6, 2), (8, 3), (8, 4)]:
+            coords, dist = instancia(n, seed)
+            base = seed % n
+            resto = [i for i in range(n) if i != base]
+            otimo = min(distancia_rota([base, *p, base], dist)
+                        for p in itertools.permutations(resto))
+
+            rota = held_karp(dist, base)
+
+            self.assertEqual((rota[0], rota[-1]), (base, base))
+            self.assertEqual(sorted(rota[:-1]), list(range(n)))
+            self.assertAlmostEqual(distancia_rota(rota, dist), otimo, places=9)
+
+    def test_evolve_despacha_instancias_pequenas(self):
+        """evolve_optimized usa o solver exato até EXATO_N_MAX, e o AG com exato=False."""
+        random.seed(5)
+        n = Config.EXATO_N_MAX
+        coords, dist = instancia(n, seed=6)
+        ceps = [str(i) for i in range(n)]
+
+        melhor, fit, historico = evolve_optimized(ceps, coords, dist, 0, {}, 10, 2,
+                                                  verbose=False)
+
+        self.assertTrue(historico.get('exato'))
+        self.assertAlmostEqual(distancia_rota(melhor["rota"], dist),
+                               distancia_rota(held_karp(dist, 0), dist), places=9)
+        self.assertEqual(len(melhor["velocidades"]), n)
+
+        _, _, historico = evolve_optimized(ceps, coords, dist, 0, {}, 10, 2,
+                                           verbose=False, exato=False)
+        self.assertNotIn('exato', historico)
+        self.assertEqual(len(historico['media']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
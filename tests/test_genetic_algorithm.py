@@ -0,0 +1,273 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from config import Config
+from genetic_algorithm import (
+    ox_filho,
+    crossover_ox,
+    crossover_velocidades_lote,
+    mutacao_rotas_lote,
+    mutacao_velocidades_lote,
+    selecao_torneio_lote,
+    indices_elite,
+    criar_cromossomo,
+    reproduzir,
+    avaliar_populacao,
+    avaliador_fisica,
+    evolve_optimized
+)
+from data_loader import generate_distance_matrix
+from simulation import calcular_fitness
+
+
+def ox_referencia(ra, rb, a, b):
+    """Implementação original (quadrática) do OX, para comparação."""
+    n = len(ra)
+    filho = [None] * n
+    filho[a:b+1] = ra[a:b+1]
+
+    idx_filho = (b + 1) % n
+    idx_rb = (b + 1) % n
+
+    while None in filho:
+        if rb[idx_rb] not in filho:
+            filho[idx_filho] = rb[idx_rb]
+            idx_filho = (idx_filho + 1) % n
+        idx_rb = (idx_rb + 1) % n
+
+    return filho
+
+
+# ====================================================================
+# TESTE 9: genetic_algorithm.py - Order Crossover linear
+# ====================================================================
+class TestOrderCrossover(unittest.TestCase):
+
+    def test_identico_a_referencia(self):
+        """Mesmos pontos de corte produzem o mesmo filho da versão original."""
+        rnd = random.Random(0)
+        for n in (2, 3, 7, 40):
+            for _ in range(200):
+                ra = rnd.sample(range(1, n + 1), n)
+                rb = rnd.sample(range(1, n + 1), n)
+                a, b = sorted(rnd.sample(range(n), 2))
+                self.assertEqual(ox_filho(ra, rb, a, b), ox_referencia(ra, rb, a, b))
+
+    def test_array(self):
+        """Rotas em np.ndarray produzem o mesmo filho das listas."""
+        rnd = random.Random(1)
+        n = 50
+        for _ in range(100):
+            ra = rnd.sample(range(1, n + 1), n)
+            rb = rnd.sample(range(1, n + 1), n)
+            a, b = sorted(rnd.sample(range(n), 2))
+            filho = ox_filho(np.array(ra), np.array(rb), a, b)
+            self.assertEqual(filho.tolist(), ox_referencia(ra, rb, a, b))
+
+    def test_crossover_mantem_base(self):
+        """Filhos começam e terminam na base e visitam todas as paradas."""
+        random.seed(2)
+        p1 = {"rota": [0] + random.sample(range(1, 30), 29) + [0], "velocidades": [36] * 30}
+        p2 = {"rota": [0] + random.sample(range(1, 30), 29) + [0], "velocidades": [96] * 30}
+
+        c1, c2 = crossover_ox(p1, p2, 0)
+
+        for c in (c1, c2):
+            self.assertEqual(c["rota"][0], 0)
+            self.assertEqual(c["rota"][-1], 0)
+            self.assertEqual(sorted(c["rota"][1:-1]), list(range(1, 30)))
+            self.assertEqual(len(c["velocidades"]), 30)
+
+
+
+# ====================================================================
+# TESTE 11: genetic_algorithm.py - Sorteios em lote
+# ====================================================================
+class TestOperadoresEmLote(unittest.TestCase):
+
+    def test_velocidades_validas(self):
+        """Mutação em lote mantém velocidades na faixa e múltiplas de 4."""
+        rng = np.random.default_rng(0)
+        velocidades = rng.choice(Config.VELOCIDADES_VALIDAS, size=(50, 200))
+        original = velocidades.copy()
+
+        mutacao_velocidades_lote(velocidades, 0.5, rng)
+
+        self.assertTrue(np.isin(velocidades, Config.VELOCIDADES_VALIDAS).all())
+        alteradas = (velocidades != original).mean()
+        self.assertGreater(alteradas, 0.3)
+        self.assertLess(alteradas, 0.5)
+
+    def test_taxa_zero_nao_altera(self):
+        """Com taxa zero nada muda."""
+        rng = np.random.default_rng(1)
+        velocidades = np.full((10, 30), 60)
+
+        mutacao_velocidades_lote(velocidades, 0.0, rng)
+
+        self.assertTrue((velocidades == 60).all())
+
+    def test_crossover_velocidades(self):
+        """Filhos herdam gene a gene de um dos pais; sem crossover, copiam."""
+        rng = np.random.default_rng(2)
+        vel = np.vstack([np.full((4, 100), 36), np.full((4, 100), 96)])
+        cruza = np.array([True, False, True, False])
+
+        filhos = crossover_velocidades_lote(vel, np.arange(4), np.arange(4, 8), cruza, rng)
+
+        self.assertEqual(filhos.shape, (8, 100))
+        self.assertTrue(((filhos[0::2] + filhos[1::2]) == 132).all())
+        self.assertTrue((filhos[2] == 36).all() and (filhos[3] == 96).all())
+        self.assertTrue((filhos[0] == 36).any() and (filhos[0] == 96).any())
+
+    def test_rotas_mantem_permutacao(self):
+        """Mutação de rotas em lote preserva base e paradas."""
+        rng = np.random.default_rng(3)
+        rotas = [[0] + random.Random(i).sample(range(1, 25), 24) + [0] for i in range(40)]
+
+        for _ in range(20):
+            mutacao_rotas_lote(rotas, 0.5, rng)
+
+        for rota in rotas:
+            self.assertEqual(rota[0], 0)
+            self.assertEqual(rota[-1], 0)
+            self.assertEqual(sorted(rota[1:-1]), list(range(1, 25)))
+
+
+
+# ====================================================================
+# TESTE 12: genetic_algorithm.py - Seleção vetorizada
+# ====================================================================
+class TestSelecaoVetorizada(unittest.TestCase):
+
+    def test_elite_ordenada(self):
+        """Elite por argpartition coincide com a ordenação completa."""
+        rng = np.random.default_rng(0)
+        fitness = rng.random(500)
+        fitness[[3, 7]] = np.inf
+
+        elite = indices_elite(fitness, 10)
+
+        np.testing.assert_array_equal(elite, np.argsort(fitness)[:10])
+        self.assertEqual(len(indices_elite(fitness, 1000)), 500)
+
+    def test_torneio_favorece_melhores(self):
+        """Vencedores são índices válidos e melhores que a média."""
+        rng = np.random.default_rng(1)
+        fitness = np.arange(1000, dtype=float)
+
+        pais = selecao_torneio_lote(fitness, 5000, 3, rng)
+
+        self.assertEqual(pais.shape, (5000,))
+        self.assertTrue(((pais >= 0) & (pais < 1000)).all())
+        # E[min de 3 uniformes] = 1/4 da faixa
+        self.assertAlmostEqual(pais.mean() / 1000, 0.25, delta=0.02)
+
+    def test_torneio_evita_inviaveis(self):
+        """Indivíduos com fitness infinito só vencem torneios só de inviáveis."""
+        rng = np.random.default_rng(2)
+        fitness = np.full(100, np.inf)
+        fitness[:50] = 1.0
+
+        pais = selecao_torneio_lote(fitness, 2000, 3, rng)
+
+        self.assertLess((pais >= 50).mean(), 0.2)
+
+
+
+# ====================================================================
+# TESTE 13: genetic_algorithm.py - Reprodução com buffer duplo
+# ====================================================================
+class TestReproducao(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.pop_size, self.n = 21, 15
+        pop = [criar_cromossomo(self.n, 0) for _ in range(self.pop_size)]
+        self.rotas = [c["rota"] for c in pop]
+        self.buffers = [np.zeros((self.pop_size + 1, self.n), dtype=np.int64) for _ in range(2)]
+        self.buffers[0][:self.pop_size] = [c["velocidades"] for c in pop]
+        self.fitness = np.random.default_rng(0).random(self.pop_size)
+
+    def test_pais_nao_sao_alterados(self):
+        """Rotas da geração anterior nunca são modificadas in-place."""
+        rng = np.random.default_rng(1)
+        originais = [r[:] for r in self.rotas]
+
+        for _ in range(10):
+            reproduzir(self.rotas, self.buffers[0], self.fitness, self.buffers[1], rng, 0)
+
+        self.assertEqual(self.rotas, originais)
+
+    def test_elites_compartilhadas(self):
+        """Elites entram por referência, com as velocidades copiadas no buffer."""
+        rng = np.random.default_rng(2)
+        novas = reproduzir(self.rotas, self.buffers[0], self.fitness, self.buffers[1], rng, 0)
+        elite = indices_elite(self.fitness, Config.ELITISM_COUNT)
+
+        self.assertEqual(len(novas), self.pop_size)
+        for pos, i in enumerate(elite):
+            self.assertIs(novas[pos], self.rotas[i])
+            np.testing.assert_array_equal(self.buffers[1][pos], self.buffers[0][i])
+
+        for rota, vel in zip(novas, self.buffers[1][:self.pop_size]):
+            self.assertEqual(sorted(rota[1:-1]), list(range(1, self.n)))
+            self.assertTrue(np.isin(vel, Config.VELOCIDADES_VALIDAS).all())
+
+
+
+# ====================================================================
+# TESTE 23: genetic_algorithm.py - Avaliação em duas camadas
+# ====================================================================
+class TestAvaliacaoDupla(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(3)
+        rnd = random.Random(4)
+        self.coords = [(-25.45 + rnd.uniform(-0.1, 0.1), -49.27 + rnd.uniform(-0.1, 0.1))
+                       for _ in range(25)]
+        self.dist = generate_distance_matrix(self.coords)
+        pop = [criar_cromossomo(25, 0) for _ in range(30)]
+        self.rotas = [c["rota"] for c in pop]
+        self.vel = [c["velocidades"] for c in pop]
+
+    def test_elite_avaliada_com_fisica(self):
+        """Os melhores pelo modelo rápido recebem o fitness da física; o cache é reusado."""
+        detalhado = avaliador_fisica(self.coords, self.dist, {})
+        rapido = avaliar_populacao(self.rotas, self.vel, self.coords, self.dist, {})
+        duplo = avaliar_populacao(self.rotas, self.vel, self.coords, self.dist, {},
+                                  detalhado=detalhado)
+
+        for i in np.argsort(rapido)[:Config.AVALIACAO_DUPLA_ELITE]:
+            fisica = calcular_fitness({"rota": self.rotas[i], "velocidades": self.vel[i]},
+                                      self.coords, self.dist, {}, fisica=True)
+            self.assertEqual(duplo[i], fisica)
+        i = int(np.argmin(duplo))
+        self.assertEqual(duplo[i], detalhado(self.rotas[i], self.vel[i]))
+
+        simulacoes = detalhado.cache_info().misses
+        self.assertLess(simulacoes, len(self.rotas))
+        avaliar_populacao(self.rotas, self.vel, self.coords, self.dist, {}, detalhado=detalhado)
+        self.assertEqual(detalhado.cache_info().misses, simulacoes)
+
+    def test_etapa_final_com_fisica(self):
+        """Com duas camadas, o polimento por DP e o fitness devolvido usam a física."""
+        ceps = [str(i) for i in range(25)]
+        melhor, fit, historico = evolve_optimized(
+            ceps, self.coords, self.dist, 0, {}, 12, 3, verbose=False, exato=False,
+            tempo_busca_profunda=0.0, velocidades_dp="final", recargas_otimas="off",
+            avaliacao_dupla=True)
+
+        self.assertEqual(fit, calcular_fitness(melhor, self.coords, self.dist, {}, fisica=True))
+        self.assertLessEqual(fit, historico['minimo'][-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
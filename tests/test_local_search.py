@@ -0,0 +1,218 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from data_loader import generate_distance_matrix
+from local_search import (
+    preparar_vizinhos,
+    two_opt_vizinhanca,
+    or_opt_vizinhanca,
+    mutacao_or_opt,
+    busca_profunda,
+    ruina_recriacao,
+    mutacao_ruina_recriacao,
+    lns,
+    distancia_rota
+)
+
+
+def instancia_aleatoria(n: int, seed: int = 0):
+    """Gera coordenadas aleatórias em Curitiba, matriz e rota embaralhada."""
+    rnd = random.Random(seed)
+    coords = [(-25.45 + rnd.uniform(-0.1, 0.1), -49.27 + rnd.uniform(-0.1, 0.1))
+              for _ in range(n)]
+    dist_matrix = generate_distance_matrix(coords)
+    intermediarios = list(range(1, n))
+    rnd.shuffle(intermediarios)
+    return dist_matrix, [0] + intermediarios + [0]
+
+
+def rota_valida(rota, n):
+    return rota[0] == 0 and rota[-1] == 0 and sorted(rota[1:-1]) == list(range(1, n))
+
+
+# ====================================================================
+# TESTE 5: local_search.py - 2-opt com listas de vizinhos
+# ====================================================================
+class TestTwoOptVizinhanca(unittest.TestCase):
+
+    def test_rota_valida_e_melhor(self):
+        """Resultado deve ser uma permutação válida e não pior que a entrada."""
+        dist_matrix, rota = instancia_aleatoria(60)
+        vizinhos = preparar_vizinhos(dist_matrix, k=8)
+
+        nova = two_opt_vizinhanca(rota, dist_matrix, vizinhos)
+
+        self.assertTrue(rota_valida(nova, 60))
+        self.assertLess(distancia_rota(nova, dist_matrix), distancia_rota(rota, dist_matrix))
+
+    def test_otimo_local_2opt(self):
+        """Com vizinhança completa, nenhum movimento 2-opt deve melhorar a rota."""
+        n = 30
+        dist_matrix, rota = instancia_aleatoria(n, seed=1)
+        vizinhos = preparar_vizinhos(dist_matrix, k=n - 1)
+
+        for primeira in (True, False):
+            nova = two_opt_vizinhanca(rota, dist_matrix, vizinhos, primeira_melhoria=primeira)
+            d = dist_matrix
+            for i in range(1, n - 1):
+                for j in range(i + 1, n):
+                    ganho = (d[nova[i - 1]][nova[i]] + d[nova[j]][nova[j + 1]] -
+                             d[nova[i - 1]][nova[j]] - d[nova[i]][nova[j + 1]])
+                    self.assertLessEqual(ganho, 1e-9)
+
+    def test_rota_pequena(self):
+        """Rotas com menos de 4 cidades são devolvidas sem alteração."""
+        dist_matrix, rota = instancia_aleatoria(3)
+        nova = two_opt_vizinhanca(rota, dist_matrix, preparar_vizinhos(dist_matrix))
+        self.assertEqual(nova, rota)
+
+
+# ====================================================================
+# TESTE 6: local_search.py - Or-opt (busca local e mutação)
+# ====================================================================
+class TestOrOpt(unittest.TestCase):
+
+    def test_corrige_desvio(self):
+        """Parada fora de lugar deve voltar para entre seus vizinhos."""
+        # Pontos em linha reta; a parada 1 foi visitada no lugar errado
+        coords = [(-25.40 - 0.01 * i, -49.27) for i in range(8)]
+        dist_matrix = generate_distance_matrix(coords)
+        rota = [0, 2, 3, 4, 1, 5, 6, 7, 0]
+
+        nova = or_opt_vizinhanca(rota, dist_matrix, preparar_vizinhos(dist_matrix, k=7))
+
+        self.assertTrue(rota_valida(nova, 8))
+        self.assertAlmostEqual(distancia_rota(nova, dist_matrix),
+                               2 * dist_matrix[0][7], delta=1e-9)
+
+    def test_nao_piora_apos_2opt(self):
+        """Or-opt após 2-opt mantém a rota válida e não piora."""
+        dist_matrix, rota = instancia_aleatoria(80, seed=2)
+        vizinhos = preparar_vizinhos(dist_matrix)
+
+        rota_2opt = two_opt_vizinhanca(rota, dist_matrix, vizinhos)
+        nova = or_opt_vizinhanca(rota_2opt, dist_matrix, vizinhos)
+
+        self.assertTrue(rota_valida(nova, 80))
+        self.assertLessEqual(distancia_rota(nova, dist_matrix),
+                             distancia_rota(rota_2opt, dist_matrix) + 1e-9)
+
+    def test_mutacao_mantem_permutacao(self):
+        """Mutação Or-opt altera a rota in-place sem perder paradas."""
+        random.seed(3)
+        dist_matrix, rota = instancia_aleatoria(20, seed=3)
+        vizinhos = preparar_vizinhos(dist_matrix)
+
+        for _ in range(50):
+            mutacao_or_opt(rota, dist_matrix, vizinhos)
+            self.assertTrue(rota_valida(rota, 20))
+
+
+# ====================================================================
+# TESTE 7: local_search.py - Busca profunda (LK + Or-opt iterados)
+# ====================================================================
+class TestBuscaProfunda(unittest.TestCase):
+
+    def test_nao_piora_apos_2opt_oropt(self):
+        """Busca profunda parte de um ótimo 2-opt/Or-opt e não piora."""
+        random.seed(4)
+        dist_matrix, rota = instancia_aleatoria(120, seed=4)
+        vizinhos = preparar_vizinhos(dist_matrix)
+
+        local = or_opt_vizinhanca(two_opt_vizinhanca(rota, dist_matrix, vizinhos),
+                                  dist_matrix, vizinhos)
+        nova = busca_profunda(local, dist_matrix, vizinhos, 5.0, max_iteracoes=200)
+
+        self.assertTrue(rota_valida(nova, 120))
+        self.assertLessEqual(distancia_rota(nova, dist_matrix),
+                             distancia_rota(local, dist_matrix) + 1e-9)
+
+    def test_respeita_tempo_limite(self):
+        """Sem limite de iterações, a busca para no tempo de parede."""
+        import time
+        dist_matrix, rota = instancia_aleatoria(60, seed=5)
+        vizinhos = preparar_vizinhos(dist_matrix)
+
+        inicio = time.perf_counter()
+        nova = busca_profunda(rota, dist_matrix, vizinhos, 0.2)
+
+        self.assertLess(time.perf_counter() - inicio, 1.0)
+        self.assertTrue(rota_valida(nova, 60))
+
+    def test_contorno_otimo(self):
+        """Pontos em duas retas paralelas: encontra o contorno (ótimo)."""
+        coords = [(-25.40 - 0.01 * i, -49.27) for i in range(5)] + \
+                 [(-25.40 - 0.01 * i, -49.25) for i in range(5)]
+        dist_matrix = generate_distance_matrix(coords)
+        n = len(coords)
+        rota = [0, 5, 2, 8, 1, 9, 3, 6, 4, 7, 0]
+
+        nova = busca_profunda(rota, dist_matrix, preparar_vizinhos(dist_matrix, k=n - 1),
+                              1.0, max_iteracoes=50)
+        otimo = [0, 1, 2, 3, 4, 9, 8, 7, 6, 5, 0]
+
+        self.assertAlmostEqual(distancia_rota(nova, dist_matrix),
+                               distancia_rota(otimo, dist_matrix), delta=1e-6)
+
+
+
+# ====================================================================
+# TESTE 8: local_search.py - Ruína e recriação (LNS)
+# ====================================================================
+class TestRuinaRecriacao(unittest.TestCase):
+
+    def test_mantem_permutacao(self):
+        """Inserção mais barata e regret-2 devolvem permutações válidas."""
+        random.seed(6)
+        dist_matrix, rota = instancia_aleatoria(80, seed=6)
+        vizinhos = preparar_vizinhos(dist_matrix)
+
+        for regret in (False, True):
+            for n_remover in (1, 5, 50, 200):
+                nova = ruina_recriacao(rota, dist_matrix, vizinhos, n_remover, regret)
+                self.assertTrue(rota_valida(nova, 80))
+
+    def test_reinsere_no_lugar(self):
+        """Pontos em linha reta: qualquer ruína é refeita no ótimo."""
+        random.seed(7)
+        coords = [(-25.40 - 0.01 * i, -49.27) for i in range(12)]
+        dist_matrix = generate_distance_matrix(coords)
+        vizinhos = preparar_vizinhos(dist_matrix, k=4)
+        rota = list(range(12)) + [0]
+
+        for regret in (False, True):
+            nova = ruina_recriacao(rota, dist_matrix, vizinhos, 4, regret)
+            self.assertAlmostEqual(distancia_rota(nova, dist_matrix),
+                                   2 * dist_matrix[0][11], delta=1e-9)
+
+    def test_mutacao_in_place(self):
+        """Mutação altera a rota in-place sem perder paradas."""
+        random.seed(8)
+        dist_matrix, rota = instancia_aleatoria(40, seed=8)
+        vizinhos = preparar_vizinhos(dist_matrix)
+
+        for _ in range(20):
+            mutacao_ruina_recriacao(rota, dist_matrix, vizinhos)
+            self.assertTrue(rota_valida(rota, 40))
+
+    def test_lns_nao_piora(self):
+        """Laço LNS só aceita rotas não piores."""
+        random.seed(9)
+        dist_matrix, rota = instancia_aleatoria(100, seed=9)
+        vizinhos = preparar_vizinhos(dist_matrix)
+        local = two_opt_vizinhanca(rota, dist_matrix, vizinhos)
+
+        nova = lns(local, dist_matrix, vizinhos, 5.0, max_iteracoes=30)
+
+        self.assertTrue(rota_valida(nova, 100))
+        self.assertLessEqual(distancia_rota(nova, dist_matrix),
+                             distancia_rota(local, dist_matrix) + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from local_search import distancia_rota
+from genetic_algorithm import evolve_optimized
+from exact_solver import held_karp
+from lower_bound import limite_held_karp, calcular_gap
+from instancias import instancia
+
+
+# ====================================================================
+# TESTE 22: lower_bound.py - Limite de Held-Karp e parada pelo gap
+# ====================================================================
+class TestLimiteInferior(unittest.TestCase):
+
+    def test_limite_abaixo_do_otimo(self):
+        """O subgradiente aperta a 1-árvore sem passar da rota ótima."""
+        for n, seed in [(3, 0), (9, 1), (13, 2), (15, 3)]:
+            coords, dist = instancia(n, seed)
+            otimo = distancia_rota(held_karp(dist, 1), dist)
+
+            um_arvore, _ = limite_held_karp(dist, 1, iteracoes=0)
+            limite, pi = limite_held_karp(dist, 1)
+
+            self.assertEqual(len(pi), n - 1)
+            self.assertLessEqual(um_arvore, limite + 1e-9)
+            self.assertLessEqual(limite, otimo + 1e-9)
+            self.assertLess(calcular_gap(otimo, limite), 0.05)
+
+    def test_parada_pelo_gap(self):
+        """Com tolerância folgada o AG para na primeira geração; sem tolerância não há limite."""
+        random.seed(4)
+        coords, dist = instancia(40, seed=5)
+        ceps = [str(i) for i in range(40)]
+
+        melhor, _, historico = evolve_optimized(ceps, coords, dist, 0, {}, 12, 30,
+                                                verbose=False, tolerancia_gap=10.0)
+
+        self.assertEqual(historico['parada_gap'], 1)
+        self.assertEqual(len(historico['gap']), len(historico['media']))
+        self.assertLessEqual(historico['limite_inferior'],
+                             distancia_rota(melhor["rota"], dist) + 1e-9)
+
+        _, _, historico = evolve_optimized(ceps, coords, dist, 0, {}, 12, 3,
+                                           verbose=False, tolerancia_gap=0.0)
+        self.assertNotIn('parada_gap', historico)
+        self.assertNotIn('gap', historico)
+
+        _, _, historico_limite = evolve_optimized(ceps, coords, dist, 0, {}, 12, 3,
+                                                  verbose=False, tolerancia_gap=10.0,
+                                                  limite_inferior=False)
+        self.assertNotIn('limite_inferior', historico_limite)
+        self.assertEqual(len(historico_limite['media']), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
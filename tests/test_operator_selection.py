@@ -0,0 +1,93 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from config import Config
+from data_loader import generate_distance_matrix
+from genetic_algorithm import criar_cromossomo, reproduzir
+from local_search import preparar_vizinhos
+from operator_selection import SeletorOperadores, ganho_relativo
+
+
+# ====================================================================
+# TESTE 14: operator_selection.py - Seleção adaptativa de operadores
+# ====================================================================
+class TestSeletorOperadores(unittest.TestCase):
+
+    def test_ganho_relativo(self):
+        """Só melhorias contam; filho viável de pai inviável vale 1."""
+        ganho = ganho_relativo([100.0, 100.0, np.inf, np.inf], [90.0, 120.0, 50.0, np.inf])
+        np.testing.assert_allclose(ganho, [0.1, 0.0, 1.0, 0.0])
+
+    def test_favorece_ganho_por_segundo(self):
+        """Crossover com mais ganho por segundo ganha probabilidade, com piso."""
+        seletor = SeletorOperadores(crossovers=("ox", "eax"), prob_minima=0.1)
+        taxa_total = seletor.taxas_mutacao().sum()
+        cx = seletor.grupos["crossover"]
+
+        # Filhos 0-9: OX (ganho 0.01); filhos 10-19: EAX (ganho 0.1);
+        # o EAX gasta o dobro do tempo, mas rende 5x mais por segundo:
+        # p = 0.1 + 0.8 * q / Σq
+        aplicados = np.zeros((20, len(seletor.nomes)), dtype=bool)
+        aplicados[:10, cx[0]] = True
+        aplicados[10:, cx[1]] = True
+        tempos = np.zeros(len(seletor.nomes))
+        tempos[cx] = [1.0, 2.0]
+        ref = np.full(20, 100.0)
+        fitness = [0.0] * 3 + [99.0] * 10 + [90.0] * 10
+
+        for _ in range(20):
+            seletor.registrar_filhos(aplicados, tempos, ref, 3)
+            seletor.creditar(fitness)
+
+        ox, eax = seletor.probs_crossover()
+        self.assertAlmostEqual(ox + eax, 1.0)
+        self.assertAlmostEqual(eax, 0.1 + 0.8 * 5 / 6)
+        self.assertAlmostEqual(seletor.taxas_mutacao().sum(), taxa_total)
+
+        stats = seletor.estatisticas()
+        self.assertEqual(stats["cx_eax"]["aplicacoes"], 200)
+        self.assertEqual(stats["cx_eax"]["sucessos"], 200)
+        self.assertAlmostEqual(stats["cx_ox"]["ganho_por_seg"], 0.1)
+
+    def test_reproducao_adaptativa(self):
+        """reproduzir com seletor gera filhos válidos e credita os operadores."""
+        random.seed(0)
+        pop_size, n = 30, 20
+        pop = [criar_cromossomo(n, 0) for _ in range(pop_size)]
+        rotas = [c["rota"] for c in pop]
+        vel = np.zeros((pop_size + 1, n), dtype=np.int64)
+        vel[:pop_size] = [c["velocidades"] for c in pop]
+        destino = np.zeros_like(vel)
+        fitness = np.random.default_rng(0).random(pop_size) + 1.0
+
+        coords = [(-25.45 + random.uniform(-0.1, 0.1), -49.27 + random.uniform(-0.1, 0.1))
+                  for _ in range(n)]
+        d = generate_distance_matrix(coords)
+
+        seletor = SeletorOperadores()
+        rng = np.random.default_rng(1)
+        novas = reproduzir(rotas, vel, fitness, destino, rng, 0, None, d,
+                           preparar_vizinhos(d), seletor)
+        seletor.creditar(np.full(pop_size, 0.5))
+
+        for rota in novas:
+            self.assertEqual(sorted(rota[1:-1]), list(range(1, n)))
+        stats = seletor.estatisticas()
+        n_filhos = pop_size - Config.ELITISM_COUNT
+        aplicacoes_cx = sum(stats[f"cx_{c}"]["aplicacoes"] for c in seletor.crossovers)
+        self.assertGreater(aplicacoes_cx, 0)
+        self.assertLessEqual(aplicacoes_cx, n_filhos)
+        # Todo filho melhora (0.5 < fitness dos pais): sucessos == aplicações
+        for e in stats.values():
+            self.assertEqual(e["sucessos"], e["aplicacoes"])
+
+
+if __name__ == '__main__':
+    unittest.main()
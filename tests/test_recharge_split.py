@@ -0,0 +1,79 @@
+import unittest
+import itertools
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from config import Config
+from simulation import simular_rapido_simples, simulate_route_detailed
+from recharge_split import split_recargas, custo_detalhado, otimizar_recargas
+
+
+def instancia_longa(n: int, seed: int):
+    """Trechos de 8-25 km em velocidades baixas: vários pousos e mais de um dia."""
+    rnd = random.Random(seed)
+    d = [[0.0] * n for _ in range(n)]
+    for i, j in itertools.combinations(range(n), 2):
+        d[i][j] = d[j][i] = rnd.uniform(8, 25)
+    rota = [0] + rnd.sample(range(1, n), n - 1) + [0]
+    velocidades = [rnd.choice(Config.VELOCIDADES_VALIDAS[:6]) for _ in range(n)]
+    return d, rota, velocidades
+
+
+# ====================================================================
+# TESTE 16: recharge_split.py - Pontos de recarga ótimos (split)
+# ====================================================================
+class TestSplitRecargas(unittest.TestCase):
+
+    def test_simulador_respeita_plano(self):
+        """Recargas planejadas somam-se às forçadas pela bateria."""
+        d, rota, vel = instancia_longa(8, seed=0)
+        crom = {"rota": rota, "velocidades": vel}
+        pousos = simular_rapido_simples(crom, None, d, None)[2]
+
+        livres = [i for i in range(1, 8)
+                  if simular_rapido_simples(dict(crom, recargas=[i]), None, d, None)[2] > pousos]
+
+        self.assertTrue(livres)
+
+    def test_sem_relogio_igual_guloso(self):
+        """Sem efeitos de horário, o split empata com a regra gulosa (ótima em pousos)."""
+        for seed in range(5):
+            d, rota, vel = instancia_longa(12, seed)
+            crom = {"rota": rota, "velocidades": vel}
+            plano = split_recargas(rota, vel, d, fisica=False)
+
+            guloso = simular_rapido_simples(crom, None, d, None)
+            com_plano = simular_rapido_simples(dict(crom, recargas=plano), None, d, None)
+
+            self.assertEqual(com_plano[2], guloso[2])
+            self.assertEqual(len(plano), guloso[2])
+
+    def test_otimo_simulacao_detalhada(self):
+        """Com relógio, nenhum plano com até 3 recargas extras é melhor que o split."""
+        n = 10
+        ceps = [str(i) for i in range(n)]
+        coords = [(-25.45, -49.27)] * n
+        for seed in range(4):
+            d, rota, vel = instancia_longa(n, seed)
+
+            def custo(recargas):
+                crom = {"rota": rota, "velocidades": vel, "recargas": list(recargas)}
+                return custo_detalhado(simulate_route_detailed(crom, ceps, coords, d, {})[1])
+
+            otimo = min(custo(s) for r in range(4)
+                        for s in itertools.combinations(range(1, n), r))
+            plano = split_recargas(rota, vel, d, fisica=True)
+
+            self.assertLessEqual(custo(plano), otimo + 1e-6)
+
+            _, custo_final = otimizar_recargas({"rota": rota, "velocidades": vel},
+                                              ceps, coords, d, {})
+            self.assertLessEqual(custo_final, custo(()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -127,5 +127,90 @@ class TestSimulation(unittest.TestCase):
         
         self.assertAlmostEqual(fitness, 10069600.0, delta=0.01)
 
+# ====================================================================
+# TESTE 4: simulation.py - get_wind_slot / consultar_vento (tabela NumPy)
+# ====================================================================
+class TestTabelaVentos(unittest.TestCase):
+    
+    def setUp(self):
+        from data_loader import build_wind_cache, build_wind_tensor
+        self.schedule = {
+            "1": {
+                "6": {"velocidade_kmh": 10.0, "direcao_graus": 350.0},
+                "9": {"velocidade_kmh": 20.0, "direcao_graus": 10.0},
+                "18": {"velocidade_kmh": 5.0, "direcao_graus": 90.0}
+            }
+        }
+        self.cache = build_wind_cache(self.schedule)
+        self.tensor = build_wind_tensor(self.schedule)
+    
+    def test_tensor_igual_ao_dict(self):
+        """Consulta no array deve dar o mesmo resultado que no dict."""
+        from datetime import datetime
+        from simulation import get_wind_slot
+        
+        self.assertEqual(self.tensor.shape, (7, 5, 2))
+        for hora in range(24):
+            dt = datetime(2025, 1, 1, hora, 30)
+            self.assertEqual(get_wind_slot(dt, self.tensor), get_wind_slot(dt, self.cache))
+    
+    def test_consulta_vetorizada(self):
+        """Consulta de vários trechos de uma vez."""
+        from simulation import consultar_vento
+        
+        ventos = consultar_vento(self.tensor, [1, 1, 1], [6 * 3600, 10 * 3600, 20 * 3600])
+        self.assertEqual(ventos.tolist(), [[10.0, 350.0], [20.0, 10.0], [5.0, 90.0]])
+    
+    def test_interpolacao(self):
+        """Tabela interpolada: valor médio entre janelas, direção pelo menor arco."""
+        from datetime import datetime
+        from data_loader import build_wind_table_interpolada
+        from simulation import get_wind_slot
+        
+        tabela = build_wind_table_interpolada(self.tensor)
+        vel, direcao = get_wind_slot(datetime(2025, 1, 1, 7, 30), tabela)
+        
+        self.assertAlmostEqual(vel, 15.0, delta=0.01)
+        self.assertAlmostEqual(direcao, 0.0, delta=0.01)
+        self.assertEqual(get_wind_slot(datetime(2025, 1, 1, 6, 0), tabela), (10.0, 350.0))
+
+# ====================================================================
+# TESTE 5: simulation.py - matriz de direções pré-calculada
+# ====================================================================
+class TestMatrizDirecoes(unittest.TestCase):
+    
+    def setUp(self):
+        from data_loader import build_wind_tensor
+        self.coords = [(-25.45, -49.29), (-25.40, -49.20), (-25.50, -49.35), (-25.42, -49.31)]
+        self.dist_matrix = generate_distance_matrix(self.coords)
+        self.wind_cache = build_wind_tensor({"1": {h: {"velocidade_kmh": 30.0, "direcao_graus": 45.0}
+                                                   for h in ("6", "9", "12", "15", "18")}})
+        self.cromossomo = {"rota": [0, 2, 1, 3, 0], "velocidades": [60, 72, 48, 96]}
+    
+    def test_matriz_igual_ao_bearing(self):
+        """A matriz do pacote dá o mesmo resultado que bearing() trecho a trecho."""
+        from data_loader import generate_bearing_matrix
+        from simulation import simular_rapido, simulate_route_detailed
+        
+        direcoes = generate_bearing_matrix(self.coords).tolist()
+        args = (self.cromossomo, self.coords, self.dist_matrix, self.wind_cache)
+        for a, b in zip(simular_rapido(*args), simular_rapido(*args, direcoes)):
+            self.assertAlmostEqual(a, b, places=6)
+        
+        ceps = [str(i) for i in range(4)]
+        _, padrao = simulate_route_detailed(self.cromossomo, ceps, *args[1:])
+        _, matriz = simulate_route_detailed(self.cromossomo, ceps, *args[1:], direcoes)
+        self.assertAlmostEqual(padrao['tempo_total_seg'], matriz['tempo_total_seg'], places=3)
+    
+    def test_matriz_muda_o_vento(self):
+        """Os simuladores usam a matriz recebida, não as coordenadas."""
+        from simulation import simular_rapido
+        
+        contra = [[225.0] * 4 for _ in range(4)]
+        a_favor = [[45.0] * 4 for _ in range(4)]
+        args = (self.cromossomo, self.coords, self.dist_matrix, self.wind_cache)
+        
+        self.assertGreater(simular_rapido(*args, contra)[1], simular_rapido(*args, a_favor)[1])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import itertools
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from config import Config
+from data_loader import generate_distance_matrix
+from genetic_algorithm import criar_cromossomo
+from simulation import simular_rapido_simples, calcular_fitness
+from speed_optimizer import otimizar_velocidades, polir_velocidades, decodificador_velocidades
+from recharge_split import split_recargas
+
+
+def custo_secundario(cromossomo, dist_matrix):
+    """Pousos e tempo do fitness, pela simulação rápida."""
+    _, tempo, pousos, _, _ = simular_rapido_simples(cromossomo, None, dist_matrix, None)
+    return pousos * Config.MULT_POUSOS + tempo * Config.MULT_TEMPO
+
+
+# ====================================================================
+# TESTE 15: speed_optimizer.py - Velocidades ótimas por DP
+# ====================================================================
+class TestVelocidadesDP(unittest.TestCase):
+
+    def test_igual_forca_bruta(self):
+        """Com bateria discretizada fina, a DP acha o ótimo das 16^3 combinações."""
+        rnd = random.Random(0)
+        rota = [0, 1, 2, 0]
+        for _ in range(10):
+            # Trechos longos (5-45 km): a bateria força pousos
+            d = [[0.0] * 3 for _ in range(3)]
+            for i, j in itertools.combinations(range(3), 2):
+                d[i][j] = d[j][i] = rnd.uniform(5, 45)
+
+            otimo = min(custo_secundario({"rota": rota, "velocidades": list(v)}, d)
+                        for v in itertools.product(Config.VELOCIDADES_VALIDAS, repeat=3))
+            vel = otimizar_velocidades(rota, d, passo_seg=0.5)
+
+            self.assertAlmostEqual(custo_secundario({"rota": rota, "velocidades": vel}, d),
+                                   otimo, delta=1e-6)
+
+    def test_polimento_nao_piora(self):
+        """Polimento devolve velocidades válidas e fitness não pior."""
+        random.seed(1)
+        rnd = random.Random(1)
+        n = 60
+        coords = [(-25.45 + rnd.uniform(-0.1, 0.1), -49.27 + rnd.uniform(-0.1, 0.1))
+                  for _ in range(n)]
+        dist_matrix = generate_distance_matrix(coords)
+        cromossomo = criar_cromossomo(n, 0)
+
+        polido, fit = polir_velocidades(cromossomo, coords, dist_matrix, {})
+
+        self.assertEqual(polido["rota"], cromossomo["rota"])
+        self.assertEqual(len(polido["velocidades"]), n)
+        self.assertTrue(set(polido["velocidades"]) <= set(Config.VELOCIDADES_VALIDAS))
+        self.assertLessEqual(fit, calcular_fitness(cromossomo, coords, dist_matrix, {}))
+        self.assertEqual(fit, calcular_fitness(polido, coords, dist_matrix, {}))
+
+        # Com plano de recargas: cada candidato é avaliado com o seu plano
+        def planejar(rota, velocidades):
+            return split_recargas(rota, velocidades, dist_matrix)
+
+        cromossomo["recargas"] = planejar(cromossomo["rota"], cromossomo["velocidades"])
+        polido, fit = polir_velocidades(cromossomo, coords, dist_matrix, {}, recargas=planejar)
+
+        self.assertEqual(polido["recargas"], planejar(polido["rota"], polido["velocidades"]))
+        self.assertEqual(fit, calcular_fitness(polido, coords, dist_matrix, {}))
+
+    def test_decodificador_cache(self):
+        """Decodificador devolve a DP da rota e reaproveita rotas já vistas."""
+        d = [[0.0, 3.0, 4.0], [3.0, 0.0, 5.0], [4.0, 5.0, 0.0]]
+        decodificar = decodificador_velocidades(d)
+
+        vel = decodificar([0, 1, 2, 0])
+
+        self.assertEqual(vel, otimizar_velocidades([0, 1, 2, 0], d))
+        self.assertIsNot(vel, decodificar([0, 1, 2, 0]))
+        self.assertEqual(vel, decodificar([0, 1, 2, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Adiciona core ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'core'))
+
+from config import Config
+from genetic_algorithm import cruzar_rota
+from steady_state import HeapIndexado, arestas_comuns, evolve_steady_state
+from instancias import instancia
+
+
+# ====================================================================
+# TESTE 24: steady_state.py - Heap indexado e motor de estado estacionário
+# ====================================================================
+class TestEstadoEstacionario(unittest.TestCase):
+
+    def test_heap_indexado(self):
+        """pior() acompanha o máximo após atualizações para cima e para baixo."""
+        rnd = random.Random(0)
+        heap = HeapIndexado([rnd.random() for _ in range(37)])
+
+        for _ in range(500):
+            heap.atualizar(rnd.randrange(37), rnd.random() * rnd.choice([0.5, 2.0]))
+
+            self.assertEqual(heap.fitness[heap.pior()], max(heap.fitness))
+            self.assertEqual([heap.heap[p] for p in heap.posicao], list(range(37)))
+
+    def test_arestas_comuns(self):
+        """Arestas iguais em qualquer sentido contam uma vez."""
+        self.assertEqual(arestas_comuns([0, 1, 2, 3, 0], [0, 3, 2, 1, 0]), 4)
+        self.assertEqual(arestas_comuns([0, 1, 2, 3, 0], [0, 2, 1, 3, 0]), 2)
+
+    def test_cruzar_rota(self):
+        """Um único filho, válido, para cada tipo de crossover."""
+        coords, dist = instancia(12, seed=3)
+        rnd = random.Random(1)
+        pais = [[0] + rnd.sample(range(1, 12), 11) + [0] for _ in range(2)]
+        for tipo in ("ox", "erx", "eax", "gpx"):
+            filho = cruzar_rota(pais[0], pais[1], 0, tipo, dist)
+            self.assertEqual((filho[0], filho[-1]), (0, 0))
+            self.assertEqual(sorted(filho[:-1]), list(range(12)))
+
+    def test_evolve_nunca_piora(self):
+        """Substituição só por filhos melhores: o mínimo nunca sobe e a rota é completa."""
+        coords, dist = instancia(30, seed=1)
+        ceps = [str(i) for i in range(30)]
+        for substituicao, filhos in (("pior", 2), ("semelhante", 2), ("pior", 1)):
+            random.seed(2)
+            melhor, fit, historico = evolve_steady_state(
+                ceps, coords, dist, 0, {}, 16, 6, verbose=False,
+                velocidades_dp="off", recargas_otimas="off", substituicao=substituicao,
+                filhos_por_passo=filhos)
+
+            self.assertEqual(sorted(melhor["rota"][:-1]), list(range(30)))
+            self.assertTrue(set(melhor["velocidades"]) <= set(Config.VELOCIDADES_VALIDAS))
+            self.assertEqual(len(historico['minimo']), 7)
+            self.assertTrue(all(b <= a for a, b in zip(historico['minimo'],
+                                                       historico['minimo'][1:])))
+            self.assertEqual(len(historico['populacao']), 16)
+            self.assertLessEqual(fit, historico['minimo'][-1])
+            self.assertGreater(historico['avaliacoes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()